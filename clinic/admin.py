@@ -1,5 +1,12 @@
+from collections import Counter
+
+from django.conf import settings
 from django.contrib import admin
-from .models import Owner, Pet, Appointment, Order
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from .models import Owner, Pet, Veterinarian, Appointment, Order, OrderItem, SlowQuery
+from .slowqueries import slow_queries
 
 # Register your models here.
 @admin.register(Owner)
@@ -17,17 +24,85 @@ class PetAdmin(admin.ModelAdmin):
     list_filter = ('gender','created_at',)
     list_select_related = ('owner',)
 
+@admin.register(Veterinarian)
+class VeterinarianAdmin(admin.ModelAdmin):
+    list_display = ('name', 'created_at')
+    search_fields = ('name',)
+    readonly_fields = ('created_at', 'updated_at')
+
 @admin.register(Appointment)
 class AppointmentAdmin(admin.ModelAdmin):
-    list_display = ('pet', 'appointment_date', 'reason', 'notes', 'doctor', 'price')
+    list_display = ('pet', 'appointment_date', 'duration_minutes', 'reason', 'notes', 'veterinarian', 'price')
     search_fields = ('pet__name', 'appointment_date', 'doctor')
     list_filter = ('created_at',)
-    list_select_related = ('pet', 'pet__owner')
+    list_select_related = ('pet', 'pet__owner', 'veterinarian')
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
+    fields = ('position', 'name', 'quantity', 'unit_price', 'line_total')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
-    list_display = ('owner', 'date', 'items', 'total', 'notes')
+    list_display = ('owner', 'date', 'total', 'notes')
+    inlines = (OrderItemInline,)
     search_fields = ('owner__name', 'date')
     list_filter = ('created_at','date')
-    readonly_fields = ('created_at', 'updated_at')
-    list_select_related = ('owner',)
\ No newline at end of file
+    # Legacy `items` JSON, shown for reference; the lines are the OrderItem rows.
+    readonly_fields = ('items', 'created_at', 'updated_at')
+    list_select_related = ('owner',)
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Lists the in-memory slow-query log of the process serving the page."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def has_clear_permission(self, request):
+        return request.user.has_perm('clinic.clear_slowquery')
+
+    def changelist_view(self, request, extra_context=None):
+        # The log holds raw SQL parameters (CPFs, e-mails...).
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        if request.method == 'POST' and 'clear' in request.POST:
+            if not self.has_clear_permission(request):
+                raise PermissionDenied
+            slow_queries.clear()
+            return redirect(request.path)
+        entries = slow_queries.entries()
+        counts = Counter(entry['fingerprint'] for entry in entries)
+        fingerprints = {}
+        for entry in entries:
+            summary = fingerprints.setdefault(entry['fingerprint'], {
+                'fingerprint': entry['fingerprint'],
+                'normalized': entry['normalized'],
+                'count': counts[entry['fingerprint']],
+                'max_ms': 0,
+                'routes': set(),
+            })
+            summary['max_ms'] = max(summary['max_ms'], entry['duration_ms'])
+            summary['routes'].add(entry['route'] or '-')
+        context = {
+            **self.admin_site.each_context(request),
+            'title': "Slow queries",
+            'opts': self.model._meta,
+            'threshold_ms': settings.SLOW_QUERY_MS,
+            'capacity': settings.SLOW_QUERY_BUFFER,
+            'can_clear': self.has_clear_permission(request),
+            'fingerprints': sorted(fingerprints.values(), key=lambda row: -row['max_ms']),
+            'entries': entries,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, 'admin/clinic/slowquery/change_list.html', context)
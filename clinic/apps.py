@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ClinicConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "clinic"
+
+    def ready(self):
+        from django.db.models import CharField, TextField
+
+        from .lookups import TrigramIContains
+
+        CharField.register_lookup(TrigramIContains)
+        TextField.register_lookup(TrigramIContains)
+
+        from . import signals  # noqa: F401
@@ -0,0 +1,97 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from . import instrumentation
+from .views import OwnerViewSet, PetViewSet, AppointmentViewSet, OrderViewSet
+
+class AsyncReadView(View):
+    """
+    Async list and retrieve of the resource served by `viewset`, for ASGI
+    deployments. The queryset, filters, ordering, `?expand=`, serializer
+    and page size all come from the viewset, so the JSON is the same as on
+    its routes; the queries go through the async ORM (`acount`, `async
+    for`, `aget`) instead of holding a worker thread.
+
+    Page-number pagination only. The response cache, conditional GET and
+    exports stay on the sync routes. Like the viewsets, it is open to
+    anyone: only `AllowAny`-style permissions, which never load the user,
+    can be checked here.
+    """
+    viewset = None
+    http_method_names = ['get', 'head', 'options']
+    renderer = JSONRenderer()
+
+    async def get(self, request, pk=None):
+        view = self.viewset(
+            request=Request(request),
+            args=(),
+            kwargs={} if pk is None else {'pk': pk},
+            action='list' if pk is None else 'retrieve',
+            format_kwarg=None,
+        )
+        status = 200
+        try:
+            view.check_permissions(view.request)
+            data = await (self.list(view) if pk is None else self.retrieve(view, pk))
+        except Exception as exc:
+            response = view.get_exception_handler()(exc, view.get_exception_handler_context())
+            if response is None:
+                raise
+            data, status = response.data, response.status_code
+        with instrumentation.timed('render'):
+            body = self.renderer.render(data, self.renderer.media_type, {'view': view, 'request': view.request})
+        return HttpResponse(body, status=status, content_type=self.renderer.media_type)
+
+    async def filtered_queryset(self, view):
+        # Filters may query the database to check their values (`?owner=`
+        # on pets), so they run in the request's sync thread.
+        return await sync_to_async(view.filter_queryset)(view.get_queryset())
+
+    async def list(self, view):
+        queryset = await self.filtered_queryset(view)
+        pagination = view.pagination_class()
+        page_size = pagination.get_page_size(view.request)
+        if not page_size:
+            return view.get_serializer([row async for row in queryset], many=True).data
+
+        paginator = pagination.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = pagination.get_page_number(view.request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom:bottom + page_size]]
+
+        pagination.page = paginator._get_page(rows, number, paginator)
+        pagination.request = view.request
+        return pagination.get_paginated_response(view.get_serializer(rows, many=True).data).data
+
+    async def retrieve(self, view, pk):
+        queryset = await self.filtered_queryset(view)
+        try:
+            instance = await queryset.aget(**{view.lookup_field: pk})
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        return view.get_serializer(instance).data
+
+class AsyncOwnerView(AsyncReadView):
+    viewset = OwnerViewSet
+
+class AsyncPetView(AsyncReadView):
+    viewset = PetViewSet
+
+class AsyncAppointmentView(AsyncReadView):
+    viewset = AppointmentViewSet
+
+class AsyncOrderView(AsyncReadView):
+    viewset = OrderViewSet
@@ -0,0 +1,88 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+_LAST_WRITE_KEY = "clinic:last-write"
+
+def _generation_key(model):
+    return f"clinic:gen:{model._meta.label_lower}"
+
+def generations(models):
+    """
+    Return the current generation token of each model, creating the missing
+    ones. A token is random rather than a counter so that an evicted token
+    can never come back with a value an old entry was stored under.
+    """
+    cache = get_cache()
+    keys = [_generation_key(model) for model in models]
+    tokens = cache.get_many(keys)
+    for key in keys:
+        if key not in tokens:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            tokens[key] = cache.get(key)
+    return [tokens[key] for key in keys]
+
+def invalidate(*models):
+    """
+    Drop every cached response that depends on `models`.
+
+    The generation is bumped right away, so this process never serves its
+    own stale write, and again on commit, so a response cached by another
+    request from the pre-commit rows is not served afterwards either.
+    """
+    def bump():
+        get_cache().set_many({_generation_key(model): uuid.uuid4().hex for model in models}, timeout=None)
+        if settings.DATABASE_REPLICAS:
+            get_cache().set(_LAST_WRITE_KEY, True, timeout=settings.DB_REPLICA_STICKY_SECONDS)
+
+    bump()
+    transaction.on_commit(bump)
+
+def recent_write():
+    """
+    True if data changed in the last `DB_REPLICA_STICKY_SECONDS`, so a
+    replica may not have it yet.
+    """
+    return bool(settings.DATABASE_REPLICAS) and bool(get_cache().get(_LAST_WRITE_KEY))
+
+def response_key(scope, models, query_params, *parts):
+    """
+    Build the cache key for a response. `query_params` is normalized
+    (sorted keys and values) so equivalent query strings share an entry.
+    """
+    query = sorted((key, sorted(query_params.getlist(key))) for key in query_params)
+    digest = hashlib.sha256(repr((parts, query)).encode()).hexdigest()
+    return f"clinic:resp:{scope}:{':'.join(generations(models))}:{digest}"
+
+def _stats_key(scope, outcome):
+    return f"clinic:stats:{scope}:{outcome}"
+
+def record(scope, outcome):
+    cache = get_cache()
+    key = _stats_key(scope, outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); start counting again.
+        cache.set(key, 1, timeout=None)
+
+def stats(scopes):
+    """
+    Hit/miss counters for each scope, as `{scope: {hits, misses, hit_ratio}}`.
+    """
+    cache = get_cache()
+    counters = cache.get_many([_stats_key(scope, outcome) for scope in scopes for outcome in ('hits', 'misses')])
+    result = {}
+    for scope in scopes:
+        hits = counters.get(_stats_key(scope, 'hits'), 0)
+        misses = counters.get(_stats_key(scope, 'misses'), 0)
+        total = hits + misses
+        result[scope] = {'hits': hits, 'misses': misses, 'hit_ratio': round(hits / total, 4) if total else None}
+    return result
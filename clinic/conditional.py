@@ -0,0 +1,34 @@
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+def make_etag(*parts):
+    return quote_etag(hashlib.sha256(repr(parts).encode()).hexdigest()[:32])
+
+def validator_headers(etag, last_modified=None):
+    """
+    Response headers for an ETag and an optional `datetime` last modified.
+    """
+    headers = {'ETag': etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(timegm(last_modified.utctimetuple()))
+    return headers
+
+def conditional_response(request, headers):
+    """
+    Evaluate the request's `If-*` headers against `headers` (as built by
+    `validator_headers`). Return the 304/412 response to send instead of
+    the resource, or None when the full response is due.
+    """
+    last_modified = headers.get('Last-Modified')
+    response = get_conditional_response(
+        request,
+        etag=headers['ETag'],
+        last_modified=last_modified and parse_http_date_safe(last_modified),
+    )
+    if response is not None:
+        for name, value in headers.items():
+            response[name] = value
+    return response
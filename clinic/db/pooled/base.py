@@ -0,0 +1,131 @@
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base as postgresql
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+class DatabaseWrapper(postgresql.DatabaseWrapper):
+    """
+    PostgreSQL backend whose connections come from a psycopg 3
+    `ConnectionPool` (one per alias and process), sized by
+    `OPTIONS['pool']`: e.g. `{'min_size': 2, 'max_size': 10, 'timeout': 30}`.
+    Closing a connection, as Django does at the end of each request with
+    `CONN_MAX_AGE = 0`, hands it back to the pool. With
+    `CONN_HEALTH_CHECKS`, the pool checks a connection before lending it.
+    """
+    connection_pool = None
+
+    @property
+    def pool_options(self):
+        options = self.settings_dict['OPTIONS'].get('pool')
+        # The connection Django opens to create or drop the test database
+        # is not pooled.
+        if not options or self.alias.startswith('__'):
+            return None
+        return {} if options is True else options
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_pool(self, conn_params):
+        with _pools_lock:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                if ConnectionPool is None:
+                    raise ImproperlyConfigured("Connection pooling needs the psycopg-pool package.")
+                if self.settings_dict['CONN_MAX_AGE']:
+                    raise ImproperlyConfigured("A pooled database needs CONN_MAX_AGE = 0; the pool keeps the connections.")
+                pool = ConnectionPool(
+                    kwargs={**conn_params, 'autocommit': True},
+                    check=ConnectionPool.check_connection if self.settings_dict['CONN_HEALTH_CHECKS'] else None,
+                    name=self.alias,
+                    open=False,
+                    **self.pool_options,
+                )
+                pool.open()
+                _pools[self.alias] = pool
+        return pool
+
+    def get_new_connection(self, conn_params):
+        if self.pool_options is None:
+            return super().get_new_connection(conn_params)
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        try:
+            self.isolation_level = postgresql.IsolationLevel(
+                postgresql.IsolationLevel.READ_COMMITTED if isolation_level is None else isolation_level
+            )
+        except ValueError:
+            raise ImproperlyConfigured(f"Invalid transaction isolation level {isolation_level} specified.")
+        pool = self.get_pool(conn_params)
+        connection = pool.getconn()
+        # Hand it back to this pool, even if the alias gets a new one.
+        self.connection_pool = pool
+        if isolation_level is not None:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool_options is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool, self.connection_pool = self.connection_pool, None
+            pool.putconn(self.connection)
+            self.connection = None
+
+def close_pools():
+    """Closes every pool of this process, e.g. before the settings change."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+def pool_stats():
+    """`alias -> psycopg_pool stats` of the pools of this process."""
+    with _pools_lock:
+        return {alias: pool.get_stats() for alias, pool in _pools.items()}
+
+def render_pool_metrics():
+    """The pool stats as Prometheus gauges and counters."""
+    stats = pool_stats()
+    families = [
+        ('clinic_db_pool_connections', 'gauge', "Connections held by the pool, by state.", lambda s: [
+            ('state="checked_out"', s.get('pool_size', 0) - s.get('pool_available', 0)),
+            ('state="idle"', s.get('pool_available', 0)),
+        ]),
+        ('clinic_db_pool_max_connections', 'gauge', "Configured pool size limit.", lambda s: [
+            ('', s.get('pool_max', 0)),
+        ]),
+        ('clinic_db_pool_waiting', 'gauge', "Requests waiting for a connection.", lambda s: [
+            ('', s.get('requests_waiting', 0)),
+        ]),
+        ('clinic_db_pool_connections_created_total', 'counter', "Connections opened by the pool.", lambda s: [
+            ('', s.get('connections_num', 0)),
+        ]),
+        ('clinic_db_pool_requests_total', 'counter', "Connections lent by the pool.", lambda s: [
+            ('', s.get('requests_num', 0)),
+        ]),
+        ('clinic_db_pool_requests_queued_total', 'counter', "Requests that had to wait for a connection.", lambda s: [
+            ('', s.get('requests_queued', 0)),
+        ]),
+        ('clinic_db_pool_wait_seconds_total', 'counter', "Time spent waiting for a connection.", lambda s: [
+            ('', s.get('requests_wait_ms', 0) / 1000),
+        ]),
+    ]
+    lines = []
+    for name, kind, help_text, samples in families:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for alias, alias_stats in sorted(stats.items()):
+            for labels, value in samples(alias_stats):
+                labels = ",".join(filter(None, [f'database="{alias}"', labels]))
+                lines.append(f"{name}{{{labels}}} {value}")
+    return "\n".join(lines) + "\n"
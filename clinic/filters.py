@@ -0,0 +1,103 @@
+import sys
+
+from django.db import connections
+from django.db.models import F
+from django_filters import rest_framework as django_filters
+from rest_framework import filters
+
+from .models import Appointment, Order, OrderItem
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    `SearchFilter` whose default (unprefixed) lookup uses the `pg_trgm` GIN
+    indexes on PostgreSQL instead of an `UPPER(col) LIKE` scan.
+
+    Matching is unchanged: every term must appear, case-insensitively, in at
+    least one of the view's `search_fields`. On other databases this is the
+    stock `SearchFilter`.
+    """
+    # pg_trgm can only use the index for terms of at least one trigram.
+    min_indexed_term_length = 3
+
+    def construct_search(self, field_name, queryset):
+        lookup = super().construct_search(field_name, queryset)
+        if connections[queryset.db].vendor != 'postgresql':
+            return lookup
+        if lookup.endswith('__icontains'):
+            return lookup[:-len('icontains')] + 'trigram_icontains'
+        return lookup
+
+    def filter_queryset(self, request, queryset, view):
+        filtered = super().filter_queryset(request, queryset, view)
+        if filtered is queryset or connections[queryset.db].vendor != 'postgresql':
+            return filtered
+
+        terms = self.get_search_terms(request)
+        if min(len(term) for term in terms) < self.min_indexed_term_length:
+            return filtered
+
+        # With ORDER BY + LIMIT the planner tends to walk the ordering index
+        # and test every row against the ILIKE chain, which is linear in the
+        # table size. Matching inside a LIMIT-ed subquery keeps it from being
+        # flattened, so the trigram bitmap scans run first and only the
+        # matches get sorted.
+        matches = filtered.order_by().values('pk')[:sys.maxsize]
+        return queryset.filter(pk__in=matches)
+
+class NullsLastOrderingFilter(filters.OrderingFilter):
+    """
+    `OrderingFilter` that sorts NULLs after every value in both directions,
+    for annotated figures such as a last visit that is NULL for owners who
+    never had one. Databases disagree on the default placement otherwise.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*[
+            F(field[1:]).desc(nulls_last=True) if field.startswith('-') else F(field).asc(nulls_last=True)
+            for field in ordering
+        ])
+
+class ProductSalesFilter(django_filters.FilterSet):
+    """
+    `name`, `date__gte` and `date__lt` for product sales; the (name, date)
+    and date indexes on OrderItem serve these lookups.
+    """
+
+    class Meta:
+        model = OrderItem
+        fields = {
+            'name': ['exact'],
+            'date': ['gte', 'lt'],
+        }
+
+class AppointmentFilter(django_filters.FilterSet):
+    """
+    Appointment list filters. Date ranges walk the appointment_date indexes,
+    alone or after `pet`, `veterinarian` or `doctor`; `owner` goes through
+    the owner's pets and their (pet, appointment_date) index.
+    """
+    owner = django_filters.UUIDFilter(field_name='pet__owner')
+
+    class Meta:
+        model = Appointment
+        fields = {
+            'pet': ['exact'],
+            'veterinarian': ['exact'],
+            'doctor': ['exact'],
+            'appointment_date': ['exact', 'gte', 'lt'],
+            'price': ['gte', 'lte'],
+        }
+
+class OrderFilter(django_filters.FilterSet):
+    """Order list filters, served by the (owner, date), date and total indexes."""
+
+    class Meta:
+        model = Order
+        fields = {
+            'owner': ['exact'],
+            'date': ['exact', 'gte', 'lt'],
+            'total': ['gte', 'lte'],
+        }
@@ -0,0 +1,176 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .querybudget import ExecuteWrapperMiddleware, QueryRecorder
+
+logger = logging.getLogger('clinic.requests')
+
+# Upper bounds of the histogram buckets, in seconds and in queries.
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Phases timed apart from the SQL they run, so they add up with `db`.
+PHASES = ('serialize', 'render')
+
+_current = ContextVar('clinic_request_timings', default=None)
+
+class RequestTimings:
+    """Time spent per phase of one request; `db` comes from its recorder."""
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self._started = {}
+
+    def start(self, phase):
+        self._started[phase] = (time.perf_counter(), self.recorder.duration)
+
+    def stop(self, phase):
+        if phase in self._started:
+            started, db = self._started.pop(phase)
+            self.phases[phase] += (time.perf_counter() - started) - (self.recorder.duration - db)
+
+def start(phase):
+    timings = _current.get()
+    if timings is not None:
+        timings.start(phase)
+
+def stop(phase):
+    timings = _current.get()
+    if timings is not None:
+        timings.stop(phase)
+
+@contextmanager
+def timed(phase):
+    """Adds the block (or decorated call) to `phase` of the current request."""
+    start(phase)
+    try:
+        yield
+    finally:
+        stop(phase)
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """
+    Per-route histograms of the requests served by this process, in the
+    Prometheus text format. Each worker keeps its own; scrape them all.
+    """
+    families = {
+        'clinic_request_duration_seconds': ("Time to produce the response.", SECONDS_BUCKETS),
+        'clinic_request_db_seconds': ("Time spent running SQL.", SECONDS_BUCKETS),
+        'clinic_request_serialize_seconds': ("Time spent in serializers, SQL excluded.", SECONDS_BUCKETS),
+        'clinic_request_render_seconds': ("Time spent rendering the body, SQL excluded.", SECONDS_BUCKETS),
+        'clinic_request_queries': ("SQL queries run.", QUERY_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {name: {} for name in self.families}
+
+    def observe(self, labels, values):
+        labels = tuple(sorted(labels.items()))
+        with self._lock:
+            for name, value in values.items():
+                histograms = self._histograms[name]
+                if labels not in histograms:
+                    histograms[labels] = Histogram(self.families[name][1])
+                histograms[labels].observe(value)
+
+    def reset(self):
+        with self._lock:
+            for histograms in self._histograms.values():
+                histograms.clear()
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, (help_text, buckets) in self.families.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    pairs = ",".join(f'{key}="{value}"' for key, value in labels)
+                    cumulative = 0
+                    for bound, count in zip((*buckets, '+Inf'), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{pairs},le="{bound}"}} {cumulative}')
+                    lines.append(f"{name}_sum{{{pairs}}} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{{{pairs}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+def server_timing(durations, queries):
+    entries = []
+    for name, seconds in durations.items():
+        entry = f"{name};dur={seconds * 1000:.2f}"
+        if name == 'db':
+            entry += f';desc="{queries} queries"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+class PerformanceMiddleware(ExecuteWrapperMiddleware):
+    """
+    Times each request: SQL (time and query count, via `execute_wrapper`),
+    serialization and rendering, as reported by the views, and the rest as
+    `app`. The numbers go out as a `Server-Timing` header (unless
+    `SERVER_TIMING` is off), a JSON line on the `clinic.requests` logger
+    and the per-route histograms of `metrics`.
+    """
+
+    def begin(self, request):
+        timings = RequestTimings(QueryRecorder())
+        return time.perf_counter(), timings, _current.set(timings)
+
+    def wrappers(self, request, state):
+        return state[1].recorder
+
+    def end(self, request, response, state):
+        started, timings, token = state
+        _current.reset(token)
+        total = time.perf_counter() - started
+        recorder = timings.recorder
+
+        durations = {'db': recorder.duration, **timings.phases}
+        durations['app'] = max(total - sum(durations.values()), 0.0)
+        durations['total'] = total
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = server_timing(durations, len(recorder))
+
+        match = request.resolver_match
+        route = match.url_name if match is not None and match.url_name else 'unmatched'
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'status': response.status_code,
+            'queries': len(recorder),
+            **{f"{name}_ms": round(seconds * 1000, 2) for name, seconds in durations.items()},
+        }))
+        metrics.observe(
+            {'route': route, 'method': request.method, 'status': str(response.status_code)},
+            {
+                'clinic_request_duration_seconds': total,
+                'clinic_request_db_seconds': recorder.duration,
+                'clinic_request_serialize_seconds': timings.phases['serialize'],
+                'clinic_request_render_seconds': timings.phases['render'],
+                'clinic_request_queries': len(recorder),
+            },
+        )
+        return response
@@ -0,0 +1,20 @@
+from django.db.models.lookups import IContains
+
+class TrigramIContains(IContains):
+    """
+    Same matches as ``icontains``, but rendered as ``col ILIKE '%term%'`` on
+    PostgreSQL so a ``gin_trgm_ops`` index on the bare column can serve it.
+    Django's own ``icontains`` wraps the column in ``UPPER(col::text)``,
+    which no plain column index matches. Other backends get ``icontains``.
+    """
+    lookup_name = 'trigram_icontains'
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        if not self.rhs_is_direct_value() or self.bilateral_transforms:
+            return self.as_sql(compiler, connection)
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", params + rhs_params
@@ -0,0 +1,268 @@
+import io
+import json
+import logging
+import math
+import random
+import statistics
+import subprocess
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from clinic.models import Owner, Pet, Veterinarian, Appointment, Order
+
+class Scenario:
+    """One endpoint call; `request(rng)` returns `(method, url, data)`."""
+
+    def __init__(self, resource, action, request):
+        self.resource = resource
+        self.action = action
+        self.request = request
+
+    @property
+    def name(self):
+        return f"{self.resource}.{self.action}"
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the list, retrieve, create and search endpoints of the owner, "
+        "pet, appointment and order APIs with concurrent clients. Reports p50/p95/p99 "
+        "latency, requests/sec and queries per request, and can save them as JSON "
+        "to compare runs. Created rows are deleted afterwards; still, run it "
+        "against a scratch database (with SQLite, a file database, not :memory:)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--owners", type=int, help="Flush and seed this many owners through seed_clinic first.")
+        parser.add_argument("--seed", type=int, default=123, help="Seed for seed_clinic and the request mix.")
+        parser.add_argument("--clients", type=int, default=4, help="Concurrent clients.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario.")
+        parser.add_argument("--only", help="Comma separated scenarios or resources, e.g. owners,pets.list.")
+        parser.add_argument("--cache", action="store_true", help="Keep the API response cache enabled.")
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="JSON file of an earlier run to print deltas against.")
+
+    def handle(self, *args, **options):
+        for name in ("clients", "requests"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1.")
+        if connection.vendor == "sqlite" and connection.settings_dict["NAME"] in ("", ":memory:"):
+            raise CommandError("Concurrent clients need a file-backed SQLite database.")
+
+        if options["owners"]:
+            call_command(
+                "seed_clinic", flush=True, owners=options["owners"], seed=options["seed"], summary_limit=0,
+                stdout=self.stdout if options["verbosity"] > 1 else io.StringIO(),
+            )
+        if not Owner.objects.exists():
+            raise CommandError("The database is empty; pass --owners or run seed_clinic first.")
+
+        baseline = None
+        if options["compare"]:
+            baseline = {row["name"]: row for row in json.loads(Path(options["compare"]).read_text())["scenarios"]}
+
+        scenarios = self.scenarios()
+        if options["only"]:
+            wanted = {name.strip() for name in options["only"].split(",")}
+            scenarios = [s for s in scenarios if s.name in wanted or s.resource in wanted]
+
+        self.created = {}
+        results = []
+        settings = {"ALLOWED_HOSTS": ["*"]}
+        if not options["cache"]:
+            settings["API_CACHE_TIMEOUT"] = 0
+        # One log line per request would bury the report.
+        request_log = logging.getLogger("clinic.requests")
+        level = request_log.level
+        request_log.setLevel(logging.WARNING)
+        try:
+            with override_settings(**settings):
+                self.stdout.write(
+                    f"{'scenario':<22} {'req':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                    f"{'req/s':>8} {'queries':>8}"
+                )
+                for scenario in scenarios:
+                    result = self.run(scenario, options)
+                    results.append(result)
+                    self.report(result, baseline.get(result["name"]) if baseline else None)
+        finally:
+            request_log.setLevel(level)
+            self.cleanup()
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps({
+                "commit": self.commit(),
+                "timestamp": timezone.now().isoformat(),
+                "backend": connection.vendor,
+                "dataset": {model.__name__.lower(): model.objects.count() for model in (Owner, Pet, Appointment, Order)},
+                "config": {name: options[name] for name in ("clients", "requests", "warmup", "seed", "cache")},
+                "scenarios": results,
+            }, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def scenarios(self):
+        owners = [str(pk) for pk in Owner.objects.values_list("pk", flat=True)[:500]]
+        pets = list(Pet.objects.values_list("pk", "owner_id", "name")[:500])
+        appointments = [str(pk) for pk in Appointment.objects.values_list("pk", flat=True)[:500]]
+        orders = [str(pk) for pk in Order.objects.values_list("pk", flat=True)[:500]]
+        vets = [str(pk) for pk in Veterinarian.objects.values_list("pk", flat=True)]
+        owner_terms = sorted({name.split()[0][:5] for name in Owner.objects.values_list("name", flat=True)[:500]})
+        pet_terms = sorted({name[:4] for _, _, name in pets})
+        if not (pets and appointments and orders):
+            raise CommandError("Every resource needs at least one row; seed more data.")
+
+        def owner_payload(rng):
+            n = rng.getrandbits(36)
+            return {
+                "name": "Bench Owner", "cpf": f"{n % 10**11:011d}", "phone": "11900000000",
+                "email": f"bench.{uuid.uuid4().hex}@bench.example.com", "address": "-",
+            }
+
+        def appointment_payload(rng):
+            payload = {
+                "pet": str(rng.choice(pets)[0]),
+                # Far in the future, so veterinarian conflicts are rare.
+                "appointment_date": (timezone.now() + timedelta(days=3650, minutes=rng.randrange(0, 10**7))).isoformat(),
+                "reason": "Benchmark",
+                "price": "100.00",
+            }
+            if vets:
+                payload["veterinarian"] = rng.choice(vets)
+            return payload
+
+        resources = {
+            "owners": (owners, owner_terms, owner_payload),
+            "pets": ([str(pk) for pk, _, _ in pets], pet_terms, lambda rng: {
+                "name": "Bench", "gender": "M", "species": "d", "breed": "Beagle", "owner": str(rng.choice(pets)[1]),
+            }),
+            "appointments": (appointments, pet_terms, appointment_payload),
+            "orders": (orders, owner_terms, lambda rng: {
+                "owner": rng.choice(owners),
+                "items": [{"name": "Vacina", "quantity": rng.randint(1, 3), "unit_price": "45.90"}],
+            }),
+        }
+
+        # List one of the first five pages, of those that exist, so small
+        # datasets do not time 404s.
+        models = {"owners": Owner, "pets": Pet, "appointments": Appointment, "orders": Order}
+        scenarios = []
+        for resource, (ids, terms, payload) in resources.items():
+            basename = resource[:-1]
+            list_url = reverse(f"{basename}-list")
+            pages = min(5, max(1, math.ceil(models[resource].objects.count() / api_settings.PAGE_SIZE)))
+            scenarios += [
+                Scenario(resource, "list", lambda rng, url=list_url, pages=pages: (
+                    "get", url, {"page": rng.randint(1, pages)},
+                )),
+                Scenario(resource, "retrieve", lambda rng, b=basename, ids=ids: (
+                    "get", reverse(f"{b}-detail", args=[rng.choice(ids)]), None,
+                )),
+                Scenario(resource, "create", lambda rng, url=list_url, payload=payload: ("post", url, payload(rng))),
+                Scenario(resource, "search", lambda rng, url=list_url, terms=terms: (
+                    "get", url, {"search": rng.choice(terms)},
+                )),
+            ]
+        return scenarios
+
+    def run(self, scenario, options):
+        lock = threading.Lock()
+        remaining = {"warmup": options["warmup"], "measured": options["requests"]}
+        timings, queries, statuses = [], [], Counter()
+
+        def take():
+            with lock:
+                for phase in ("warmup", "measured"):
+                    if remaining[phase]:
+                        remaining[phase] -= 1
+                        return phase
+            return None
+
+        def client(worker):
+            rng = random.Random(f"{options['seed']}:{scenario.name}:{worker}")
+            # Server errors (e.g. a locked SQLite database) count as 500s.
+            api = APIClient(raise_request_exception=False)
+            try:
+                while (phase := take()) is not None:
+                    method, url, data = scenario.request(rng)
+                    with CaptureQueriesContext(connections["default"]) as ctx:
+                        start = time.perf_counter()
+                        if method == "post":
+                            response = api.post(url, data, format="json")
+                        else:
+                            response = api.get(url, data)
+                        elapsed = time.perf_counter() - start
+                    if method == "post" and response.status_code == 201:
+                        with lock:
+                            self.created.setdefault(scenario.resource, []).append(response.data["id"])
+                    if phase == "measured":
+                        with lock:
+                            timings.append(elapsed * 1000)
+                            queries.append(len(ctx))
+                            statuses[response.status_code] += 1
+            finally:
+                connections.close_all()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options["clients"]) as pool:
+            list(pool.map(client, range(options["clients"])))
+        wall = time.perf_counter() - start
+
+        timings.sort()
+        return {
+            "name": scenario.name,
+            "requests": len(timings),
+            "errors": sum(count for code, count in statuses.items() if code >= 400),
+            "statuses": {str(code): count for code, count in sorted(statuses.items())},
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+            # Wall time includes the warmup requests.
+            "rps": round((options["warmup"] + len(timings)) / wall, 1),
+            "queries_per_request": round(statistics.fmean(queries), 2),
+        }
+
+    def report(self, result, baseline):
+        line = (
+            f"{result['name']:<22} {result['requests']:>5} {result['errors']:>4} {result['p50_ms']:>8.2f} "
+            f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['rps']:>8.1f} {result['queries_per_request']:>8.2f}"
+        )
+        if baseline:
+            p95 = (result["p95_ms"] - baseline["p95_ms"]) / baseline["p95_ms"] * 100 if baseline["p95_ms"] else 0
+            rps = (result["rps"] - baseline["rps"]) / baseline["rps"] * 100 if baseline["rps"] else 0
+            line += f"   p95 {p95:+.0f}% req/s {rps:+.0f}%"
+        self.stdout.write(line)
+
+    def cleanup(self):
+        # Children first, so no cascade deletes a row listed later.
+        for resource, model in (("appointments", Appointment), ("orders", Order), ("pets", Pet), ("owners", Owner)):
+            ids = self.created.get(resource)
+            if ids:
+                model.objects.filter(pk__in=ids).delete()
+
+    def commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                cwd=Path(__file__).resolve().parent,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
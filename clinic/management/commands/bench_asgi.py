@@ -0,0 +1,223 @@
+import asyncio
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from clinic.models import Owner, Pet, Appointment, Order
+
+from .bench_api import percentile
+
+def wsgi_get(application, path, query):
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'wsgi.input': BytesIO()}
+    setup_testing_defaults(environ)
+    environ['HTTP_HOST'] = 'testserver'
+    result = {}
+
+    def start_response(status, headers, exc_info=None):
+        result['status'] = int(status.split()[0])
+
+    body = application(environ, start_response)
+    try:
+        b"".join(body)
+    finally:
+        # Fires request_finished, as a server would.
+        body.close()
+    return result['status']
+
+async def asgi_get(application, path, query):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'testserver')], 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+    }
+    requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    result = {}
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client stays connected until the handler is done with it.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            result['status'] = message['status']
+
+    await application(scope, receive, send)
+    return result['status']
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/sec of one process serving the list and retrieve "
+        "endpoints of owners, pets, appointments and orders: the sync viewsets "
+        "through the WSGI handler, with one thread per concurrent client, against "
+        "the async routes (/api/async/...) through the ASGI handler, with every "
+        "client on one event loop. Requests go straight to the handlers, without "
+        "an HTTP server. Run it against a scratch, seeded database (with SQLite, "
+        "a file database)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=16, help="Concurrent clients.")
+        parser.add_argument("--requests", type=int, default=300, help="Measured requests per scenario and mode.")
+        parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario and mode.")
+        parser.add_argument("--only", help="Comma separated scenarios or resources, e.g. owners,pets.list.")
+        parser.add_argument("--seed", type=int, default=123, help="Seed for the request mix.")
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        for name in ("clients", "requests"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1.")
+        if connection.vendor == "sqlite" and connection.settings_dict["NAME"] in ("", ":memory:"):
+            raise CommandError("Concurrent clients need a file-backed SQLite database.")
+
+        scenarios = self.scenarios()
+        if options["only"]:
+            wanted = {name.strip() for name in options["only"].split(",")}
+            scenarios = {name: s for name, s in scenarios.items() if name in wanted or name.split(".")[0] in wanted}
+
+        wsgi, asgi = get_wsgi_application(), get_asgi_application()
+        # The sync routes' response cache has no async counterpart.
+        settings = {"ALLOWED_HOSTS": ["*"], "API_CACHE_TIMEOUT": 0}
+        # One log line per request would bury the report.
+        request_log = logging.getLogger("clinic.requests")
+        level = request_log.level
+        request_log.setLevel(logging.WARNING)
+        results = []
+        try:
+            with override_settings(**settings):
+                self.stdout.write(
+                    f"{'scenario':<22} {'mode':<5} {'req':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'req/s':>8}"
+                )
+                for name, (path, query) in scenarios.items():
+                    pair = [
+                        self.run_wsgi(wsgi, name, lambda rng: path("", rng), query, options),
+                        self.run_asgi(asgi, name, lambda rng: path("async-", rng), query, options),
+                    ]
+                    for result in pair:
+                        results.append(result)
+                        self.stdout.write(
+                            f"{name:<22} {result['mode']:<5} {result['requests']:>5} {result['errors']:>4} "
+                            f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['rps']:>8.1f}"
+                        )
+                    ratio = pair[1]["rps"] / pair[0]["rps"] if pair[0]["rps"] else 0
+                    self.stdout.write(f"{name:<22} asgi/wsgi req/s: {ratio:.2f}x")
+        finally:
+            request_log.setLevel(level)
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps({
+                "timestamp": timezone.now().isoformat(),
+                "backend": connection.vendor,
+                "dataset": {model.__name__.lower(): model.objects.count() for model in (Owner, Pet, Appointment, Order)},
+                "config": {name: options[name] for name in ("clients", "requests", "warmup", "seed")},
+                "scenarios": results,
+            }, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def scenarios(self):
+        """`name -> (path(route prefix, rng), query string(rng))`."""
+        scenarios = {}
+        for resource, model in (("owners", Owner), ("pets", Pet), ("appointments", Appointment), ("orders", Order)):
+            basename = resource[:-1]
+            ids = [str(pk) for pk in model.objects.values_list("pk", flat=True)[:500]]
+            if not ids:
+                raise CommandError("Every resource needs at least one row; run seed_clinic first.")
+            scenarios[f"{resource}.list"] = (
+                lambda prefix, rng, b=basename: reverse(f"{prefix}{b}-list"),
+                lambda rng: urlencode({"page": rng.randint(1, 5)}),
+            )
+            scenarios[f"{resource}.retrieve"] = (
+                lambda prefix, rng, b=basename, ids=ids: reverse(f"{prefix}{b}-detail", args=[rng.choice(ids)]),
+                lambda rng: "",
+            )
+        return scenarios
+
+    def result(self, mode, name, timings, errors, wall):
+        timings.sort()
+        return {
+            "name": name,
+            "mode": mode,
+            "requests": len(timings),
+            "errors": errors,
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+            "rps": round(len(timings) / wall, 1),
+        }
+
+    def run_wsgi(self, application, name, path, query, options):
+        lock = threading.Lock()
+        timings, errors = [], [0]
+
+        def phase(count, measured):
+            remaining = [count]
+
+            def client(worker):
+                rng = random.Random(f"{options['seed']}:{name}:{worker}")
+                while True:
+                    with lock:
+                        if not remaining[0]:
+                            return
+                        remaining[0] -= 1
+                    start = time.perf_counter()
+                    status = wsgi_get(application, path(rng), query(rng))
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if measured:
+                        with lock:
+                            timings.append(elapsed)
+                            errors[0] += status >= 400
+
+            with ThreadPoolExecutor(options["clients"]) as pool:
+                list(pool.map(client, range(options["clients"])))
+
+        phase(options["warmup"], False)
+        start = time.perf_counter()
+        phase(options["requests"], True)
+        return self.result("wsgi", name, timings, errors[0], time.perf_counter() - start)
+
+    def run_asgi(self, application, name, path, query, options):
+        timings, errors = [], [0]
+
+        async def phase(count, measured):
+            remaining = [count]
+
+            async def client(worker):
+                rng = random.Random(f"{options['seed']}:{name}:{worker}")
+                while remaining[0]:
+                    remaining[0] -= 1
+                    start = time.perf_counter()
+                    status = await asgi_get(application, path(rng), query(rng))
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if measured:
+                        timings.append(elapsed)
+                        errors[0] += status >= 400
+
+            await asyncio.gather(*(client(worker) for worker in range(options["clients"])))
+
+        async def main():
+            await phase(options["warmup"], False)
+            start = time.perf_counter()
+            await phase(options["requests"], True)
+            return time.perf_counter() - start
+
+        wall = asyncio.run(main())
+        return self.result("asgi", name, timings, errors[0], wall)
@@ -0,0 +1,176 @@
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from clinic.db.pooled.base import close_pools, pool_stats
+from clinic.models import Owner, Pet, Appointment, Order
+
+from .bench_api import percentile
+from .bench_asgi import wsgi_get
+
+class Command(BaseCommand):
+    help = (
+        "Compare retrieve latency with a new database connection per request "
+        "(CONN_MAX_AGE = 0), persistent connections with health checks, and, on "
+        "PostgreSQL, the psycopg 3 pool. Requests go through the WSGI handler, so "
+        "connections are closed or returned at the end of each request as in "
+        "production. Run it against a scratch, seeded database (with SQLite, a "
+        "file database)."
+    )
+    modes = ("fresh", "persistent", "pool")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=4, help="Concurrent clients.")
+        parser.add_argument("--requests", type=int, default=300, help="Measured requests per scenario and mode.")
+        parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario and mode.")
+        parser.add_argument("--only", help="Comma separated resources, e.g. owners,pets.")
+        parser.add_argument("--seed", type=int, default=123, help="Seed for the request mix.")
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        for name in ("clients", "requests"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1.")
+        if connection.vendor == "sqlite" and connection.settings_dict["NAME"] in ("", ":memory:"):
+            raise CommandError("Concurrent clients need a file-backed SQLite database.")
+
+        resources = {"owners": Owner, "pets": Pet, "appointments": Appointment, "orders": Order}
+        if options["only"]:
+            wanted = {name.strip() for name in options["only"].split(",")}
+            resources = {name: model for name, model in resources.items() if name in wanted}
+        ids = {name: [str(pk) for pk in model.objects.values_list("pk", flat=True)[:500]] for name, model in resources.items()}
+        if not all(ids.values()):
+            raise CommandError("Every resource needs at least one row; run seed_clinic first.")
+
+        modes = {
+            "fresh": {"CONN_MAX_AGE": 0},
+            "persistent": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+            "pool": {
+                "ENGINE": "clinic.db.pooled",
+                "CONN_MAX_AGE": 0,
+                "CONN_HEALTH_CHECKS": True,
+                "OPTIONS": {"pool": {"min_size": options["clients"], "max_size": options["clients"]}},
+            },
+        }
+        if connection.vendor != "postgresql":
+            del modes["pool"]
+
+        application = get_wsgi_application()
+        request_log = logging.getLogger("clinic.requests")
+        level = request_log.level
+        request_log.setLevel(logging.WARNING)
+        results = []
+        try:
+            with override_settings(ALLOWED_HOSTS=["*"], API_CACHE_TIMEOUT=0):
+                self.stdout.write(
+                    f"{'scenario':<22} {'mode':<10} {'req':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} "
+                    f"{'mean ms':>8} {'req/s':>8}"
+                )
+                for resource, resource_ids in ids.items():
+                    name = f"{resource}.retrieve"
+                    for mode, overrides in modes.items():
+                        with self.database(overrides):
+                            result = self.run(application, name, resource[:-1], resource_ids, options)
+                            if mode == "pool":
+                                result["pool"] = pool_stats().get(DEFAULT_DB_ALIAS)
+                        result["mode"] = mode
+                        results.append(result)
+                        self.stdout.write(
+                            f"{name:<22} {mode:<10} {result['requests']:>5} {result['errors']:>4} "
+                            f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['mean_ms']:>8.2f} "
+                            f"{result['rps']:>8.1f}"
+                        )
+        finally:
+            request_log.setLevel(level)
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps({
+                "timestamp": timezone.now().isoformat(),
+                "backend": connection.vendor,
+                "config": {name: options[name] for name in ("clients", "requests", "warmup", "seed")},
+                "scenarios": results,
+            }, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+    @contextmanager
+    def database(self, overrides):
+        """Serves the default alias with `overrides` applied to its settings."""
+        settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+        original = dict(settings_dict)
+        connections.close_all()
+        settings_dict.update(overrides)
+        self.reset_connection()
+        try:
+            yield
+        finally:
+            connections.close_all()
+            close_pools()
+            settings_dict.clear()
+            settings_dict.update(original)
+            self.reset_connection()
+
+    def reset_connection(self):
+        # Worker threads get new wrappers; this one must drop its own.
+        try:
+            del connections[DEFAULT_DB_ALIAS]
+        except AttributeError:
+            pass
+
+    def run(self, application, name, basename, ids, options):
+        lock = threading.Lock()
+        timings, errors = [], [0]
+
+        def phase(count, measured):
+            remaining = [count]
+
+            def client(worker):
+                rng = random.Random(f"{options['seed']}:{name}:{worker}")
+                try:
+                    while True:
+                        with lock:
+                            if not remaining[0]:
+                                return
+                            remaining[0] -= 1
+                        path = reverse(f"{basename}-detail", args=[rng.choice(ids)])
+                        start = time.perf_counter()
+                        status = wsgi_get(application, path, "")
+                        elapsed = (time.perf_counter() - start) * 1000
+                        if measured:
+                            with lock:
+                                timings.append(elapsed)
+                                errors[0] += status >= 400
+                finally:
+                    connections.close_all()
+
+            with ThreadPoolExecutor(options["clients"]) as pool:
+                list(pool.map(client, range(options["clients"])))
+
+        phase(options["warmup"], False)
+        start = time.perf_counter()
+        phase(options["requests"], True)
+        wall = time.perf_counter() - start
+
+        timings.sort()
+        return {
+            "name": name,
+            "requests": len(timings),
+            "errors": errors[0],
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+            "rps": round(len(timings) / wall, 1),
+        }
@@ -0,0 +1,88 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from clinic.models import Appointment, Order
+
+# Indexes added for the range filters; --compare measures without them too.
+FILTER_INDEXES = ["clinic_appt_doctor_date_idx", "clinic_appt_price_idx", "clinic_order_total_idx"]
+
+class _Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the appointment and order list filters against the data "
+        "already in the database (seed it with seed_clinic first). With "
+        "--compare the filter indexes are dropped inside a transaction that is "
+        "rolled back, and every case is measured again without them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Requests per case.")
+        parser.add_argument("--days", type=int, default=7, help="Width of the date range filters.")
+        parser.add_argument("--compare", action="store_true", help="Also measure without the filter indexes.")
+
+    def handle(self, *args, **options):
+        latest = Appointment.objects.order_by("-appointment_date").first()
+        order = Order.objects.order_by("-date").first()
+        if latest is None or order is None:
+            raise CommandError("No appointments or orders; run seed_clinic first.")
+        doctor = latest.doctor or ""
+        since = (latest.appointment_date - timedelta(days=options["days"])).isoformat()
+        order_since = (order.date - timedelta(days=options["days"])).isoformat()
+
+        appointments = reverse("appointment-list")
+        orders = reverse("order-list")
+        cases = [
+            ("appointments date range", appointments, {"appointment_date__gte": since}),
+            ("appointments doctor", appointments, {"doctor": doctor}),
+            ("appointments doctor + range", appointments, {"doctor": doctor, "appointment_date__gte": since}),
+            ("appointments owner + range", appointments, {"owner": latest.pet.owner_id, "appointment_date__gte": since}),
+            ("appointments price band", appointments, {"price__gte": "100.00", "price__lte": "100.50"}),
+            ("orders date range", orders, {"date__gte": order_since}),
+            ("orders owner + range", orders, {"owner": order.owner_id, "date__gte": order_since}),
+            ("orders total band", orders, {"total__gte": "100.00", "total__lte": "100.50"}),
+        ]
+
+        self.stdout.write(f"backend={connection.vendor} appointments~{self.estimate(Appointment)} orders~{self.estimate(Order)}")
+        self.stdout.write(f"{'case':<30} {'indexes':>8} {'rows':>8} {'p50 ms':>9} {'p95 ms':>9}")
+        # Cached responses would hide the query cost.
+        with override_settings(ALLOWED_HOSTS=["*"], API_CACHE_TIMEOUT=0):
+            self.run(cases, "yes", options["repeat"])
+            if options["compare"]:
+                try:
+                    with transaction.atomic():
+                        with connection.cursor() as cursor:
+                            for name in FILTER_INDEXES:
+                                cursor.execute(f"DROP INDEX IF EXISTS {connection.ops.quote_name(name)}")
+                        self.run(cases, "no", options["repeat"])
+                        raise _Rollback
+                except _Rollback:
+                    pass
+
+    def estimate(self, model):
+        if connection.vendor != "postgresql":
+            return model.objects.count()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+            return cursor.fetchone()[0]
+
+    def run(self, cases, label, repeat):
+        client = APIClient()
+        for name, url, params in cases:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                resp = client.get(url, params)
+                timings.append((time.perf_counter() - start) * 1000)
+                assert resp.status_code == 200, resp.content
+            p50 = statistics.median(timings)
+            p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else p50
+            self.stdout.write(f"{name:<30} {label:>8} {resp.json()['count']:>8} {p50:>9.2f} {p95:>9.2f}")
@@ -0,0 +1,103 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from faker import Faker
+
+from clinic.models import Owner
+
+NEEDLE = {
+    "name": "Zebulon Needleman",
+    "cpf": "98765432100",
+    "email": "zebulon.needleman@bench.example.com",
+}
+
+# One search per indexed field; each matches only the needle row, so the
+# result size stays constant and only the lookup cost can grow.
+TERMS = ["needleman", "9876543210", "zebulon.need"]
+
+class _Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark /api/owners/?search= latency while the Owner table grows. "
+        "Rows are inserted in a transaction that is rolled back at the end; "
+        "run it against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10000,100000,1000000",
+            help="Comma separated Owner table sizes to measure at.",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="Requests per term and size.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        try:
+            with transaction.atomic(), override_settings(ALLOWED_HOSTS=["*"]):
+                self.run(sizes, options["repeat"], options["batch_size"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def run(self, sizes, repeat, batch_size):
+        fake = Faker("pt_BR")
+        Faker.seed(123)
+        rng = random.Random(123)
+        first_names = [fake.first_name() for _ in range(500)]
+        last_names = [fake.last_name() for _ in range(500)]
+
+        Owner.objects.create(phone="11900000000", address="-", **NEEDLE)
+        client = APIClient()
+        url = reverse("owner-list")
+
+        self.stdout.write(f"backend={connection.vendor}")
+        self.stdout.write(f"{'rows':>10} {'term':>14} {'p50 ms':>8} {'p95 ms':>8}")
+
+        count = 1
+        for size in sizes:
+            while count < size:
+                n = min(batch_size, size - count)
+                Owner.objects.bulk_create([
+                    Owner(
+                        name=f"{rng.choice(first_names)} {rng.choice(last_names)}",
+                        cpf=f"1{i:010d}",
+                        phone="11900000000",
+                        email=f"owner{i}@bench.example.com",
+                        address="-",
+                    )
+                    for i in range(count, count + n)
+                ])
+                count += n
+
+            if connection.vendor == "postgresql":
+                # Autovacuum would normally merge the GIN pending lists and
+                # refresh statistics after a bulk load; do it explicitly.
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT gin_clean_pending_list(i.indexrelid::regclass) FROM pg_index i "
+                        "JOIN pg_class c ON c.oid = i.indexrelid JOIN pg_am a ON a.oid = c.relam "
+                        "WHERE i.indrelid = 'clinic_owner'::regclass AND a.amname = 'gin'"
+                    )
+                    cursor.execute("ANALYZE clinic_owner")
+
+            for term in TERMS:
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    resp = client.get(url, {"search": term})
+                    timings.append((time.perf_counter() - start) * 1000)
+                    assert resp.status_code == 200 and resp.json()["count"] == 1, resp.content
+                p50 = statistics.median(timings)
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                self.stdout.write(f"{size:>10} {term:>14} {p50:>8.2f} {p95:>8.2f}")
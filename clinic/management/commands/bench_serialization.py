@@ -0,0 +1,142 @@
+import json
+import logging
+import random
+import statistics
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from clinic.models import Owner, Pet, Appointment, Order
+
+from .bench_api import percentile
+
+def server_timing(response, *names):
+    """Milliseconds spent in the `names` phases of the response's Server-Timing header."""
+    total = 0.0
+    for entry in response.get("Server-Timing", "").split(","):
+        name, _, params = entry.strip().partition(";")
+        if name in names:
+            total += float(params.split("dur=")[1].split(";")[0])
+    return total
+
+class Command(BaseCommand):
+    help = (
+        "Compare the list endpoints of owners, pets, appointments and orders "
+        "with the serializers (API_FAST_LIST off) and with the fast list path, "
+        "for each page size. Reports requests/sec, rows/sec and the serialize + "
+        "render time from Server-Timing, and checks that both paths return the "
+        "same bytes. Requests run one at a time: the work measured is CPU bound."
+    )
+    modes = ("drf", "fast")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-sizes", default="10,100,500", help="Comma separated page sizes.")
+        parser.add_argument("--requests", type=int, default=50, help="Measured requests per scenario, size and mode.")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per scenario, size and mode.")
+        parser.add_argument("--only", help="Comma separated resources, e.g. owners,pets.")
+        parser.add_argument("--seed", type=int, default=123, help="Seed for the pages requested.")
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["page_sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--page-sizes must be comma separated integers.")
+        if options["requests"] < 1 or not sizes or min(sizes) < 1:
+            raise CommandError("--requests and every page size must be at least 1.")
+
+        resources = {"owners": Owner, "pets": Pet, "appointments": Appointment, "orders": Order}
+        if options["only"]:
+            wanted = {name.strip() for name in options["only"].split(",")}
+            resources = {name: model for name, model in resources.items() if name in wanted}
+        counts = {name: model.objects.count() for name, model in resources.items()}
+        if not all(counts.values()):
+            raise CommandError("Every resource needs at least one row; run seed_clinic first.")
+
+        client = APIClient()
+        request_log = logging.getLogger("clinic.requests")
+        level = request_log.level
+        request_log.setLevel(logging.WARNING)
+        results = []
+        try:
+            with override_settings(ALLOWED_HOSTS=["*"], API_CACHE_TIMEOUT=0, SERVER_TIMING=True):
+                self.stdout.write(
+                    f"{'scenario':<20} {'size':>5} {'mode':<5} {'p50 ms':>8} {'req/s':>8} {'rows/s':>9} "
+                    f"{'ser+render ms':>14} {'same':>5}"
+                )
+                for resource in resources:
+                    url = reverse(f"{resource[:-1]}-list")
+                    for size in sizes:
+                        pages = max(1, min(5, counts[resource] // size))
+                        with mock.patch.object(PageNumberPagination, "page_size", size):
+                            bodies = {}
+                            for mode in self.modes:
+                                with override_settings(API_FAST_LIST=mode == "fast"):
+                                    bodies[mode] = client.get(url).content
+                                    result = self.run(client, url, f"{resource}.list", size, pages, options)
+                                result["mode"] = mode
+                                results.append(result)
+                            same = bodies["drf"] == bodies["fast"]
+                        for result in results[-2:]:
+                            result["same_body"] = same
+                            self.stdout.write(
+                                f"{result['name']:<20} {size:>5} {result['mode']:<5} {result['p50_ms']:>8.2f} "
+                                f"{result['rps']:>8.1f} {result['rows_per_s']:>9.0f} "
+                                f"{result['serialize_render_p50_ms']:>14.2f} {'yes' if same else 'NO':>5}"
+                            )
+                        drf, fast = results[-2:]
+                        ratio = fast["rps"] / drf["rps"] if drf["rps"] else 0
+                        self.stdout.write(f"{drf['name']:<20} {size:>5} fast/drf req/s: {ratio:.2f}x")
+        finally:
+            request_log.setLevel(level)
+
+        if not all(result["same_body"] for result in results):
+            self.stderr.write("The fast path returned different bytes for some lists.")
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps({
+                "timestamp": timezone.now().isoformat(),
+                "backend": connection.vendor,
+                "dataset": counts,
+                "config": {name: options[name] for name in ("page_sizes", "requests", "warmup", "seed")},
+                "scenarios": results,
+            }, indent=2))
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def run(self, client, url, name, size, pages, options):
+        rng = random.Random(f"{options['seed']}:{name}:{size}")
+        timings, phases, rows = [], [], 0
+        for _ in range(options["warmup"]):
+            client.get(url, {"page": rng.randint(1, pages)})
+
+        start = time.perf_counter()
+        for _ in range(options["requests"]):
+            request_start = time.perf_counter()
+            response = client.get(url, {"page": rng.randint(1, pages)})
+            timings.append((time.perf_counter() - request_start) * 1000)
+            phases.append(server_timing(response, "serialize", "render"))
+            if response.status_code >= 400:
+                raise CommandError(f"{url} returned {response.status_code}.")
+            rows += len(response.data["results"])
+        wall = time.perf_counter() - start
+
+        timings.sort()
+        phases.sort()
+        return {
+            "name": name,
+            "page_size": size,
+            "requests": len(timings),
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+            "rps": round(len(timings) / wall, 1),
+            "rows_per_s": round(rows / wall),
+            "serialize_render_p50_ms": round(percentile(phases, 0.50), 2),
+        }
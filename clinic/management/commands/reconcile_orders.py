@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Round
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from clinic import rollups
+from clinic.cache import invalidate
+from clinic.models import Order, OrderItem
+from clinic.money import money
+
+AMOUNT = DecimalField(max_digits=14, decimal_places=2)
+
+def expected_line_total():
+    return Round(ExpressionWrapper(F('quantity') * F('unit_price'), output_field=AMOUNT), 2)
+
+class Command(BaseCommand):
+    help = (
+        "Verify OrderItem.line_total and Order.total against quantity * unit_price. "
+        "The comparison runs in SQL; only mismatching rows are streamed back, in chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Rewrite mismatching amounts.")
+        parser.add_argument("--since", help="Only check orders updated at or after this ISO datetime.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched and updated per batch.")
+
+    def handle(self, *args, **options):
+        orders = Order.objects.all()
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError(f"Invalid --since datetime: {options['since']}")
+            orders = orders.filter(updated_at__gte=since)
+
+        items = (
+            OrderItem.objects.filter(order__in=orders.values("pk"))
+            .annotate(expected=expected_line_total())
+            .exclude(line_total=F("expected"))
+            .only("id", "order_id", "quantity", "unit_price", "line_total")
+        )
+        item_count = self.reconcile(items, "line_total", options)
+
+        items_total = (
+            OrderItem.objects.filter(order=OuterRef("pk"))
+            .order_by().values("order").annotate(total=Sum(expected_line_total())).values("total")
+        )
+        totals = (
+            orders.annotate(expected=Round(Subquery(items_total, output_field=AMOUNT), 2))
+            .filter(expected__isnull=False)
+            .exclude(total=F("expected"))
+            .only("id", "date", "total")
+        )
+        order_count = self.reconcile(totals, "total", options)
+
+        if options["fix"] and (item_count or order_count):
+            # bulk_update sends no post_save signals.
+            invalidate(Order, OrderItem)
+
+        verb = "Fixed" if options["fix"] else "Found"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {item_count} mismatching line items and {order_count} mismatching order totals."
+        ))
+
+    def reconcile(self, queryset, field, options):
+        count = 0
+        batch = []
+        for row in queryset.iterator(chunk_size=options["chunk_size"]):
+            count += 1
+            expected = money(row.expected)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{type(row).__name__} {row.pk}: {field} {getattr(row, field)} != {expected}")
+            if options["fix"]:
+                setattr(row, field, expected)
+                row.updated_at = timezone.now()
+                batch.append(row)
+                if len(batch) >= options["chunk_size"]:
+                    self.save(batch, field)
+                    batch = []
+        if batch:
+            self.save(batch, field)
+        return count
+
+    def save(self, rows, field):
+        with transaction.atomic():
+            type(rows[0]).objects.bulk_update(rows, [field, "updated_at"])
+            rollups.mark_instances(rows)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from clinic import rollups
+
+class Command(BaseCommand):
+    help = (
+        "Bring the revenue rollups up to date. Only the days touched since the "
+        "last run are recomputed; run it periodically (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute every day instead.")
+        parser.add_argument("--max-days", type=int, help="Refresh at most this many days, oldest first.")
+
+    def handle(self, *args, **options):
+        if options["max_days"] is not None and options["max_days"] < 1:
+            raise CommandError("--max-days must be at least 1.")
+        if options["full"]:
+            days, rows = rollups.rebuild()
+        else:
+            days, rows = rollups.refresh(options["max_days"])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {days} days ({rows} rollup rows)."))
@@ -1,17 +1,26 @@
-from decimal import Decimal, ROUND_HALF_UP
+from datetime import timedelta
+from decimal import Decimal
+import multiprocessing
 import random
-import re
-
-from django.core.management.base import BaseCommand
+import uuid
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.text import slugify
 
 from faker import Faker
 
-from clinic.models import Owner, Pet, Appointment, Order, Species
-
-fake = Faker('pt_BR')
-Faker.seed(123)
-random.seed(123)
+from clinic import rollups
+from clinic.cache import invalidate
+from clinic.money import money
+from clinic.models import (
+    Owner, Pet, Veterinarian, Appointment, Order, OrderItem, RevenueDirtyDay, RevenueRollup, Species,
+)
 
 DOG_BREEDS = [
     "Labrador", "Golden Retriever", "Bulldog", "Poodle", "Beagle",
@@ -23,18 +32,240 @@ CAT_BREEDS = [
     "Sphynx", "British Shorthair", "Scottish Fold", "Not defined"
 ]
 
-def only_digits(s: str) -> str:
-    """Remove everything that is not digit (returns empty string if None)."""
-    return re.sub(r'\D', '', s or '')
+ORDER_ITEMS = [
+    "Ração", "Vacina", "Consulta",
+    "Antipulgas", "Medicamento", "Brinquedo",
+    "Coleira"
+]
 
-def random_species_and_breed():
-    if random.random() < 0.6:
-        return Species.DOG, random.choice(DOG_BREEDS)
+# Size of the Faker-generated pools rows are drawn from. Calling Faker per
+# row dominates the run time at millions of rows.
+POOL_SIZE = 1000
+DOCTORS = 30
+APPOINTMENT_MINUTES = [15, 30, 30, 45, 60]
+# Appointments are spread over this many days before the run.
+HISTORY_DAYS = 365
+
+# Multiplier coprime with 10**9, so `index -> CPF base` is a bijection and
+# generated CPFs are unique without asking the database.
+CPF_MULTIPLIER = 387420489
+
+def random_species_and_breed(rng=random):
+    if rng.random() < 0.6:
+        return Species.DOG, rng.choice(DOG_BREEDS)
     else:
-        return Species.CAT, random.choice(CAT_BREEDS)
+        return Species.CAT, rng.choice(CAT_BREEDS)
+
+def cpf_for_index(index: int) -> str:
+    """Deterministic, valid CPF for `index` (unique for index < 10**9 - 1)."""
+    digits = [int(d) for d in f"{((index + 1) * CPF_MULTIPLIER) % 10**9:09d}"]
+    for length in (9, 10):
+        total = sum(d * (length + 1 - i) for i, d in enumerate(digits))
+        check = total * 10 % 11
+        digits.append(0 if check == 10 else check)
+    return ''.join(map(str, digits))
+
+def doctor_names(seed):
+    fake = Faker('pt_BR')
+    fake.seed_instance(seed)
+    return [fake.name() for _ in range(DOCTORS)]
+
+def split(total, parts):
+    """Split `total` into `parts` integers that differ by at most one."""
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+class Seeder:
+    """
+    Generates and inserts one contiguous range of owners together with their
+    pets, appointments and orders. Each worker process runs one Seeder with
+    its own deterministic seed.
+    """
+
+    def __init__(self, seed, options, taken_cpfs=frozenset(), taken_emails=frozenset()):
+        self.rng = random.Random(seed)
+        self.options = options
+        self.taken_cpfs = taken_cpfs
+        self.taken_emails = taken_emails
+        self.use_copy = options['copy']
+        self.now = timezone.now()
+
+        fake = Faker('pt_BR')
+        fake.seed_instance(seed)
+        self.first_names = [(name, slugify(name)) for name in (fake.first_name() for _ in range(POOL_SIZE))]
+        self.last_names = [(name, slugify(name)) for name in (fake.last_name() for _ in range(POOL_SIZE))]
+        self.addresses = [fake.address() for _ in range(POOL_SIZE)]
+        self.reasons = [fake.sentence(nb_words=6) for _ in range(POOL_SIZE)]
+        self.notes = [fake.paragraph(nb_sentences=2) for _ in range(POOL_SIZE)]
+        self.order_notes = [fake.sentence(nb_words=8) for _ in range(POOL_SIZE)]
+
+        # Same (name, veterinarian id) pairs in every worker.
+        self.doctors = options['doctors']
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def run(self, start, stop, orders):
+        counts = {'owners': 0, 'pets': 0, 'appointments': 0, 'orders': 0, 'order_items': 0}
+        batch_size = self.options['batch_size']
+        chunks = range(start, stop, batch_size)
+        order_shares = split(orders, len(chunks)) if len(chunks) else []
+
+        for chunk_start, chunk_orders in zip(chunks, order_shares):
+            chunk_stop = min(chunk_start + batch_size, stop)
+            with transaction.atomic():
+                owners = [self.owner_row(index) for index in range(chunk_start, chunk_stop)]
+                self.insert(Owner, owners)
+
+                pets = [pet for owner in owners for pet in self.pet_rows(owner)]
+                self.insert(Pet, pets)
+
+                appointments = [appt for pet in pets for appt in self.appointment_rows(pet)]
+                for offset in range(0, len(appointments), batch_size):
+                    self.insert(Appointment, appointments[offset:offset + batch_size])
+
+                orders_with_items = [self.order_rows(self.rng.choice(owners)) for _ in range(chunk_orders)]
+                order_rows = [order for order, _ in orders_with_items]
+                self.insert(Order, order_rows)
+
+                item_rows = [item for _, items in orders_with_items for item in items]
+                for offset in range(0, len(item_rows), batch_size):
+                    self.insert(OrderItem, item_rows[offset:offset + batch_size])
+
+            counts['owners'] += len(owners)
+            counts['pets'] += len(pets)
+            counts['appointments'] += len(appointments)
+            counts['orders'] += len(order_rows)
+            counts['order_items'] += len(item_rows)
+        return counts
+
+    def owner_row(self, index):
+        (first, first_slug), (last, last_slug) = self.rng.choice(self.first_names), self.rng.choice(self.last_names)
+
+        # Candidates index, index + N, index + 2N, ... never overlap between
+        # workers, so only rows already in the database can collide.
+        candidate = index
+        while True:
+            cpf = cpf_for_index(candidate)
+            email = f"{first_slug}.{last_slug}{candidate}@example.com"
+            if cpf not in self.taken_cpfs and email not in self.taken_emails:
+                break
+            candidate += self.options['owners']
+
+        return {
+            'id': self.uuid(),
+            'name': f"{first} {last}",
+            'cpf': cpf,
+            'phone': f"{self.rng.randint(11, 99)}9{self.rng.randint(0, 99999999):08d}",
+            'email': email,
+            'address': self.rng.choice(self.addresses),
+            'created_at': self.now,
+            'updated_at': self.now,
+        }
+
+    def pet_rows(self, owner):
+        for _ in range(self.rng.randint(1, self.options['pets_per_owner'])):
+            species, breed = random_species_and_breed(self.rng)
+            yield {
+                'id': self.uuid(),
+                'name': self.rng.choice(self.first_names)[0],
+                'gender': self.rng.choice(['M', 'F']),
+                'species': species,
+                'breed': breed,
+                'birth_date': (self.now - timedelta(days=self.rng.randint(0, 15 * 365))).date(),
+                'owner_id': owner['id'],
+                'created_at': self.now,
+                'updated_at': self.now,
+            }
+
+    def appointment_rows(self, pet):
+        for _ in range(self.rng.randint(1, self.options['appointments_per_pet'])):
+            start = self.now - timedelta(seconds=self.rng.randint(0, HISTORY_DAYS * 24 * 3600))
+            duration = self.rng.choice(APPOINTMENT_MINUTES)
+            doctor, veterinarian_id = self.rng.choice(self.doctors)
+            yield {
+                'id': self.uuid(),
+                'pet_id': pet['id'],
+                'appointment_date': start,
+                'duration_minutes': duration,
+                'ends_at': start + timedelta(minutes=duration),
+                'reason': self.rng.choice(self.reasons),
+                'notes': self.rng.choice(self.notes),
+                'doctor': doctor,
+                'veterinarian_id': veterinarian_id,
+                'price': money(self.rng.uniform(50, 500)),
+                'created_at': self.now,
+                'updated_at': self.now,
+            }
+
+    def order_rows(self, owner):
+        """Return an order row and its OrderItem rows."""
+        order_id = self.uuid()
+        items = []
+        total = Decimal('0.00')
+
+        for position in range(self.rng.randint(1, 4)):
+            qty = self.rng.randint(1, 3)
+            unit_price = money(self.rng.uniform(10, 200))
+            item_total = money(unit_price * qty)
+            total += item_total
+
+            items.append({
+                'id': self.uuid(),
+                'order_id': order_id,
+                'position': position,
+                'name': self.rng.choice(ORDER_ITEMS),
+                'quantity': qty,
+                'unit_price': unit_price,
+                'line_total': item_total,
+                'date': self.now,
+                'created_at': self.now,
+                'updated_at': self.now,
+            })
+
+        return {
+            'id': order_id,
+            'owner_id': owner['id'],
+            'date': self.now,
+            'items': [],
+            'total': money(total),
+            'notes': self.rng.choice(self.order_notes),
+            'created_at': self.now,
+            'updated_at': self.now,
+        }, items
+
+    def insert(self, model, rows):
+        if not rows:
+            return
+        if self.use_copy:
+            self.copy(model, rows)
+        else:
+            model.objects.bulk_create([model(**row) for row in rows])
+
+    def copy(self, model, rows):
+        from psycopg.types.json import Jsonb
+
+        fields = [field for field in model._meta.concrete_fields]
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        json_columns = {field.attname for field in fields if field.get_internal_type() == 'JSONField'}
+        sql = f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN"
+
+        with connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row([
+                        Jsonb(row[field.attname]) if field.attname in json_columns else row[field.attname]
+                        for field in fields
+                    ])
 
-def money(v):
-    return Decimal(v).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+SEED_OPTIONS = ('owners', 'pets_per_owner', 'appointments_per_pet', 'batch_size', 'copy', 'seed', 'doctors')
+
+def seed_worker(args):
+    worker, start, stop, orders, options, taken_cpfs, taken_emails = args
+    try:
+        seeder = Seeder(options['seed'] + worker, options, taken_cpfs, taken_emails)
+        return seeder.run(start, stop, orders)
+    finally:
+        connections.close_all()
 
 class Command(BaseCommand):
     help = 'Seed the database with sample data'
@@ -45,130 +276,120 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing data from clinic app models before seeding.",
         )
+        parser.add_argument("--owners", type=int, default=5, help="Number of owners to create.")
+        parser.add_argument(
+            "--pets-per-owner", type=int, default=2,
+            help="Each owner gets between 1 and this many pets.",
+        )
+        parser.add_argument(
+            "--appointments-per-pet", type=int, default=2,
+            help="Each pet gets between 1 and this many appointments.",
+        )
+        parser.add_argument(
+            "--orders", type=int, default=None,
+            help="Total number of orders, spread over random owners (default: one per owner).",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per INSERT/COPY.")
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Processes generating and loading owner ranges in parallel.",
+        )
+        parser.add_argument(
+            "--copy", action="store_true",
+            help="Load rows with PostgreSQL COPY instead of bulk_create.",
+        )
+        parser.add_argument("--seed", type=int, default=123, help="Base random seed; worker N uses seed + N.")
+        parser.add_argument(
+            "--summary-limit", type=int, default=20,
+            help="Owners listed in the final summary.",
+        )
 
     def handle(self, *args, **options):
+        for name in ('owners', 'pets_per_owner', 'appointments_per_pet', 'batch_size', 'workers'):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1.")
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError("--copy requires PostgreSQL.")
+        if options['orders'] is None:
+            options['orders'] = options['owners']
+
         if options['flush']:
             self.stdout.write("Deleting existing data...")
-            Owner.objects.all().delete()
-            Pet.objects.all().delete()
-            Appointment.objects.all().delete()
-            Order.objects.all().delete()
-            self.stdout.write("Deletied existing data.")
-
-        pet_counts = [1, 1, 1, 2, 2]
-        random.shuffle(pet_counts)
-
-        owners = []
-        for i in range(5):
-            cpf = only_digits(fake.cpf())
-            while Owner.objects.filter(cpf=cpf).exists():
-                cpf = only_digits(fake.cpf())
-
-            phone = only_digits(fake.numerify("##9########"))
-            if len(phone) < 11:
-                phone = only_digits(fake.numerify("###########"))
-            phone = phone[:11].rjust(11, "0")
-
-            email = fake.unique.ascii_free_email() if hasattr(fake, "ascii_free_email") else fake.unique.email()
-            while Owner.objects.filter(email=email).exists():
-                email = fake.unique.email()
-
-            owner = Owner.objects.create(
-                name=fake.name(),
-                cpf=cpf,
-                phone=phone,
-                email=email,
-                address=fake.address(),
-            )
-            owners.append((owner, pet_counts[i]))
-
-        pets_created = []
-        appointments_created = []
-        orders_created = []
-
-        order_counts = [0, 0, 1, 1, 2]
-        random.shuffle(order_counts)
-
-        for idx, (owner, pet_count) in enumerate(owners):
-            for pidx in range(pet_count):
-                pet_name = fake.first_name()
-                species, breed = random_species_and_breed()
-
-                gender = random.choice(['M', 'F'])
-
-                pet = Pet.objects.create(
-                    name=pet_name,
-                    gender=gender,
-                    species=species,
-                    breed=breed,
-                    birth_date=fake.date_of_birth(minimum_age=0, maximum_age=15),
-                    owner=owner,
-                )
-                pets_created.append(pet)
-
-                appt_count = random.choice([1, 2])
-                for _ in range(appt_count):
-                    appt_dt = fake.date_time_between(start_date='-1y', end_date='now', tzinfo=timezone.get_current_timezone())
-                    reason = fake.sentence(nb_words=6)
-                    notes = fake.paragraph(nb_sentences=2)
-                    doctor = fake.name()
-                    price = money(random.uniform(50, 500))
-
-                    appt = Appointment.objects.create(
-                        pet=pet,
-                        appointment_date=appt_dt,
-                        reason=reason,
-                        notes=notes,
-                        doctor=doctor,
-                        price=price,
-                    )
-                    appointments_created.append(appt)
-
-            orders_for_owner = order_counts[idx]
-            for _ in range(orders_for_owner):
-                items = []
-                n_items = random.randint(1, 4)
-                total = Decimal('0.00')
-
-                for i_item in range(n_items):
-                    item_name = random.choice([
-                        "Ração", "Vacina", "Consulta", 
-                        "Antipulgas", "Medicamento", "Brinquedo", 
-                        "Coleira"
-                    ])
-
-                    qty = random.randint(1, 3)
-                    unit_price = money(random.uniform(10, 200))
-                    item_total = unit_price * qty
-                    total += item_total
-
-                    items.append({
-                        "name": item_name,
-                        "quantity": qty,
-                        "unit_price": float(unit_price),
-                        "line_total": float(item_total)
-                    })
-
-                total = total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                order = Order.objects.create(
-                    owner=owner,
-                    items=items,
-                    total=total,
-                    notes=fake.sentence(nb_words=8),
-                )
-                orders_created.append(order)
+            self.flush()
+            self.stdout.write("Deleted existing data.")
+
+        # One query per unique column instead of one per candidate value.
+        taken_cpfs = set(Owner.objects.values_list('cpf', flat=True))
+        taken_emails = set(Owner.objects.values_list('email', flat=True))
+        options['doctors'] = self.veterinarians(doctor_names(options['seed']))
+
+        workers = min(options['workers'], options['owners'])
+        bounds = [0]
+        for size in split(options['owners'], workers):
+            bounds.append(bounds[-1] + size)
+        seed_options = {name: options[name] for name in SEED_OPTIONS}
+        tasks = [
+            (worker, bounds[worker], bounds[worker + 1], orders, seed_options, taken_cpfs, taken_emails)
+            for worker, orders in enumerate(split(options['orders'], workers))
+        ]
+
+        if workers == 1:
+            results = [seed_worker(tasks[0])]
+        else:
+            # Children must open their own database connections.
+            connections.close_all()
+            with multiprocessing.Pool(workers, initializer=django.setup) as pool:
+                results = pool.map(seed_worker, tasks)
+
+        totals = {key: sum(result[key] for result in results) for key in results[0]}
+        # bulk_create and COPY send no post_save signals.
+        invalidate(Owner, Pet, Veterinarian, Appointment, Order, OrderItem)
+        today = timezone.localdate()
+        rollups.mark_days(today - timedelta(days=offset) for offset in range(HISTORY_DAYS + 2))
 
         self.stdout.write(self.style.SUCCESS("Seeding completed. Summary:"))
-        self.stdout.write(f"Owners created: {len(owners)}")
-        self.stdout.write(f"Pets created: {len(pets_created)}")
-        self.stdout.write(f"Appointments created: {len(appointments_created)}")
-        self.stdout.write(f"Orders created: {len(orders_created)}")
+        self.stdout.write(f"Owners created: {totals['owners']}")
+        self.stdout.write(f"Pets created: {totals['pets']}")
+        self.stdout.write(f"Appointments created: {totals['appointments']}")
+        self.stdout.write(f"Orders created: {totals['orders']}")
+        self.stdout.write(f"Order items created: {totals['order_items']}")
         self.stdout.write(" ")
         self.stdout.write("Owners and their pets/orders:")
 
-        for idx, (owner, pet_count) in enumerate(owners):
-            oc = Order.objects.filter(owner=owner).count()
-            pc = Pet.objects.filter(owner=owner).count()
-            self.stdout.write(f"- {owner.name} (cpf={owner.cpf}) -> pets={pc}, orders={oc}")
+        def count_of(model):
+            return Coalesce(
+                Subquery(
+                    model.objects.filter(owner=OuterRef('pk'))
+                    .order_by().values('owner').annotate(n=Count('pk')).values('n'),
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+
+        owners = (
+            Owner.objects.annotate(pc=count_of(Pet), oc=count_of(Order))
+            .values_list('name', 'cpf', 'pc', 'oc')[:options['summary_limit']]
+        )
+        for name, cpf, pc, oc in owners:
+            self.stdout.write(f"- {name} (cpf={cpf}) -> pets={pc}, orders={oc}")
 
         self.stdout.write(self.style.SUCCESS("Done."))
+
+    def veterinarians(self, names):
+        """Return `(name, id)` pairs, creating the veterinarians not seen before."""
+        ids = dict(Veterinarian.objects.filter(name__in=names).values_list('name', 'pk'))
+        missing = [Veterinarian(name=name) for name in dict.fromkeys(names) if name not in ids]
+        Veterinarian.objects.bulk_create(missing)
+        ids.update((vet.name, vet.pk) for vet in missing)
+        return [(name, ids[name]) for name in names]
+
+    def flush(self):
+        models = [Appointment, Veterinarian, OrderItem, Order, Pet, Owner, RevenueRollup, RevenueDirtyDay]
+        if connection.vendor == 'postgresql':
+            tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model in models)
+            with connection.cursor() as cursor:
+                cursor.execute(f"TRUNCATE {tables}")
+            return
+        # QuerySet.delete() would fetch every row to send post_delete.
+        tables = [model._meta.db_table for model in models]
+        connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), tables))
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.24 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["-appointment_date"], name="clinic_appt_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["pet", "-appointment_date"], name="clinic_appt_pet_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["-created_at"], name="clinic_appt_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["-date"], name="clinic_order_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["owner", "-date"], name="clinic_order_owner_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["-created_at"], name="clinic_order_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="owner",
+            index=models.Index(fields=["name"], name="clinic_owner_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="owner",
+            index=models.Index(fields=["-created_at"], name="clinic_owner_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(fields=["name"], name="clinic_pet_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(
+                fields=["owner", "name"], name="clinic_pet_owner_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(
+                fields=["species", "name"], name="clinic_pet_species_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(
+                fields=["gender", "name"], name="clinic_pet_gender_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(fields=["birth_date"], name="clinic_pet_birth_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(fields=["-created_at"], name="clinic_pet_created_idx"),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.24 on 2026-10-18 09:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0002_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="appointment",
+            name="clinic_appt_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="appointment",
+            name="clinic_appt_pet_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="appointment",
+            name="clinic_appt_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="order",
+            name="clinic_order_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="order",
+            name="clinic_order_owner_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="order",
+            name="clinic_order_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["-appointment_date", "-id"], name="clinic_appt_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["pet", "-appointment_date", "-id"],
+                name="clinic_appt_pet_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="clinic_appt_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["-date", "-id"], name="clinic_order_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["owner", "-date", "-id"], name="clinic_order_owner_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="clinic_order_created_idx"
+            ),
+        ),
+    ]
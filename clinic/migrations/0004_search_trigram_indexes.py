@@ -0,0 +1,45 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Trigram indexes backing clinic.filters.TrigramSearchFilter. They only exist
+# on PostgreSQL, so they live here instead of in Meta.indexes.
+TRIGRAM_INDEXES = [
+    ("owner", "name", "clinic_owner_name_trgm"),
+    ("owner", "cpf", "clinic_owner_cpf_trgm"),
+    ("owner", "email", "clinic_owner_email_trgm"),
+    ("pet", "name", "clinic_pet_name_trgm"),
+    ("pet", "breed", "clinic_pet_breed_trgm"),
+]
+
+
+def trigram_indexes(apps):
+    for model_name, field, name in TRIGRAM_INDEXES:
+        model = apps.get_model("clinic", model_name)
+        yield model, GinIndex(fields=[field], opclasses=["gin_trgm_ops"], name=name)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model, index in trigram_indexes(apps):
+        schema_editor.add_index(model, index)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model, index in trigram_indexes(apps):
+        schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0003_keyset_indexes"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,140 @@
+# Generated by Django 4.2.24 on 2026-10-18 10:09
+
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+# Backfill OrderItem from the legacy Order.items JSON. Elements that are not
+# objects with a string "name" are skipped; a non-numeric quantity becomes 1,
+# a non-numeric unit_price 0 and a missing line_total quantity * unit_price.
+# Both paths below apply the same rules.
+BACKFILL_SQL = """
+INSERT INTO clinic_orderitem
+    (id, order_id, position, name, quantity, unit_price, line_total, date, created_at, updated_at)
+SELECT
+    gen_random_uuid(), o.id, e.position - 1, LEFT(e.item->>'name', 255), q.quantity, p.unit_price,
+    ROUND(CASE WHEN jsonb_typeof(e.item->'line_total') = 'number'
+               THEN (e.item->>'line_total')::numeric ELSE q.quantity * p.unit_price END, 2),
+    o.date, NOW(), NOW()
+FROM clinic_order o
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(o.items) = 'array' THEN o.items ELSE '[]'::jsonb END
+) WITH ORDINALITY AS e(item, position)
+CROSS JOIN LATERAL (
+    SELECT CASE WHEN jsonb_typeof(e.item->'quantity') = 'number' AND (e.item->>'quantity')::numeric >= 0
+                THEN ROUND((e.item->>'quantity')::numeric)::integer ELSE 1 END AS quantity
+) q
+CROSS JOIN LATERAL (
+    SELECT ROUND(CASE WHEN jsonb_typeof(e.item->'unit_price') = 'number'
+                      THEN (e.item->>'unit_price')::numeric ELSE 0 END, 2) AS unit_price
+) p
+WHERE jsonb_typeof(e.item) = 'object' AND jsonb_typeof(e.item->'name') = 'string'
+"""
+
+
+def _number(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return Decimal(str(value))
+
+
+def item_rows(order):
+    items = order.items if isinstance(order.items, list) else []
+    for position, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("name"), str):
+            continue
+        quantity = _number(item.get("quantity"))
+        quantity = (
+            int(quantity.quantize(Decimal(1), ROUND_HALF_UP))
+            if quantity is not None and quantity >= 0
+            else 1
+        )
+        unit_price = (_number(item.get("unit_price")) or Decimal(0)).quantize(
+            Decimal("0.01"), ROUND_HALF_UP
+        )
+        line_total = _number(item.get("line_total"))
+        if line_total is None:
+            line_total = quantity * unit_price
+        yield {
+            "order_id": order.pk,
+            "position": position,
+            "name": item["name"][:255],
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "line_total": line_total.quantize(Decimal("0.01"), ROUND_HALF_UP),
+            "date": order.date,
+        }
+
+
+def backfill_order_items(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(BACKFILL_SQL)
+        return
+
+    Order = apps.get_model("clinic", "Order")
+    OrderItem = apps.get_model("clinic", "OrderItem")
+    batch = []
+    for order in Order.objects.only("id", "date", "items").iterator(chunk_size=2000):
+        batch.extend(OrderItem(**row) for row in item_rows(order))
+        if len(batch) >= 5000:
+            OrderItem.objects.bulk_create(batch)
+            batch = []
+    OrderItem.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0004_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderItem",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("position", models.PositiveSmallIntegerField(default=0)),
+                ("name", models.CharField(max_length=255)),
+                ("quantity", models.PositiveIntegerField(default=1)),
+                ("unit_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("line_total", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("date", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="order_items",
+                        to="clinic.order",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["order", "position"],
+                "indexes": [
+                    models.Index(
+                        fields=["name", "date"], name="clinic_orderitem_name_date_idx"
+                    ),
+                    models.Index(fields=["date"], name="clinic_orderitem_date_idx"),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="orderitem",
+            constraint=models.UniqueConstraint(
+                fields=("order", "position"), name="clinic_orderitem_position_uniq"
+            ),
+        ),
+        migrations.RunPython(backfill_order_items, migrations.RunPython.noop),
+    ]
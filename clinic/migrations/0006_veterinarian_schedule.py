@@ -0,0 +1,107 @@
+# Generated by Django 4.2.24 on 2026-10-18 10:24
+
+from datetime import timedelta
+
+import django.core.validators
+import clinic.models
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+import django.db.models.deletion
+import uuid
+
+
+def backfill_schedule(apps, schema_editor):
+    """
+    Create a Veterinarian for every distinct free-text doctor name, link the
+    existing appointments to it and give them the default 30 minute length.
+    """
+    Appointment = apps.get_model("clinic", "Appointment")
+    Veterinarian = apps.get_model("clinic", "Veterinarian")
+    names = (
+        Appointment.objects.exclude(doctor__isnull=True)
+        .exclude(doctor="")
+        .order_by()
+        .values_list("doctor", flat=True)
+        .distinct()
+    )
+    Veterinarian.objects.bulk_create(Veterinarian(name=name) for name in names)
+    vet = Veterinarian.objects.filter(name=OuterRef("doctor")).values("pk")[:1]
+    Appointment.objects.update(
+        ends_at=F("appointment_date") + timedelta(minutes=30),
+        veterinarian=Subquery(vet),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0005_orderitem"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Veterinarian",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AddField(
+            model_name="appointment",
+            name="duration_minutes",
+            field=models.PositiveSmallIntegerField(
+                default=30,
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(720),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="appointment",
+            name="ends_at",
+            field=clinic.models.AppointmentEndField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="appointment",
+            name="veterinarian",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="appointments",
+                to="clinic.veterinarian",
+            ),
+        ),
+        migrations.RunPython(backfill_schedule, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="appointment",
+            name="ends_at",
+            field=clinic.models.AppointmentEndField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["veterinarian", "appointment_date"],
+                include=("ends_at",),
+                name="clinic_appt_vet_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="veterinarian",
+            index=models.Index(fields=["name"], name="clinic_vet_name_idx"),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.24 on 2026-10-18 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0006_veterinarian_schedule"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["doctor", "-appointment_date", "-id"],
+                name="clinic_appt_doctor_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(fields=["price"], name="clinic_appt_price_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["total"], name="clinic_order_total_idx"),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.24 on 2026-10-18 10:36
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+import uuid
+
+
+def mark_existing_days(apps, schema_editor):
+    """Mark every day with revenue, so the first refresh_revenue run builds them."""
+    RevenueDirtyDay = apps.get_model("clinic", "RevenueDirtyDay")
+    days = set()
+    for model_name, field in (("Appointment", "appointment_date"), ("Order", "date")):
+        model = apps.get_model("clinic", model_name)
+        days.update(
+            model.objects.annotate(day=TruncDate(field))
+            .order_by()
+            .values_list("day", flat=True)
+            .distinct()
+        )
+    RevenueDirtyDay.objects.bulk_create(
+        RevenueDirtyDay(day=day, token=uuid.uuid4()) for day in days
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0007_range_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RevenueDirtyDay",
+            fields=[
+                ("day", models.DateField(primary_key=True, serialize=False)),
+                ("token", models.UUIDField(default=uuid.uuid4)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="RevenueRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("doctor", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "species",
+                    models.CharField(
+                        blank=True,
+                        choices=[("d", "Dog"), ("c", "Cat")],
+                        default="",
+                        max_length=1,
+                    ),
+                ),
+                (
+                    "appointment_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("appointments", models.PositiveIntegerField(default=0)),
+                (
+                    "order_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("orders", models.PositiveIntegerField(default=0)),
+                ("refreshed_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["day", "doctor", "species"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="revenuerollup",
+            constraint=models.UniqueConstraint(
+                fields=("day", "doctor", "species"), name="clinic_revenue_rollup_uniq"
+            ),
+        ),
+        migrations.RunPython(mark_existing_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.24 on 2026-10-18 11:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0009_slowquery"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="orderitem",
+            options={"ordering": ["order_id", "position"]},
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.24 on 2026-10-18 11:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0010_orderitem_ordering"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="slowquery",
+            options={
+                "default_permissions": ("view",),
+                "managed": False,
+                "permissions": [("clear_slowquery", "Can clear the slow query log")],
+                "verbose_name_plural": "slow queries",
+            },
+        ),
+    ]
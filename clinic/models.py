@@ -1,6 +1,11 @@
 import uuid
+from datetime import timedelta
+from decimal import Decimal
 
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Count, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.core.validators import RegexValidator
 
 cpf_validator = RegexValidator(r'^\d{11}$', 'CPF should contain exactly 11 digits.')
@@ -14,6 +19,34 @@ class Species(models.TextChoices):
     DOG = 'd', 'Dog'
     CAT = 'c', 'Cat'
 
+def _per_owner(queryset, owner_lookup, aggregate, output_field):
+    """
+    Correlated subquery computing `aggregate` over the rows of `queryset`
+    that belong to the outer owner.
+    """
+    return Subquery(
+        queryset.filter(**{owner_lookup: OuterRef('pk')})
+        .order_by().values(owner_lookup).annotate(value=aggregate).values('value'),
+        output_field=output_field,
+    )
+
+class OwnerQuerySet(models.QuerySet):
+    def with_summary(self):
+        """
+        Annotate dashboard figures (pet and appointment counts, last visit,
+        appointment/order spend) so a page of owners is one SQL statement.
+        """
+        money = models.DecimalField(max_digits=14, decimal_places=2)
+        zero = Value(Decimal('0.00'), output_field=money)
+        appointments = Appointment.objects.all()
+        return self.annotate(
+            pet_count=Coalesce(_per_owner(Pet.objects.all(), 'owner', Count('pk'), models.IntegerField()), 0),
+            appointment_count=Coalesce(_per_owner(appointments, 'pet__owner', Count('pk'), models.IntegerField()), 0),
+            last_visit=_per_owner(appointments, 'pet__owner', Max('appointment_date'), models.DateTimeField()),
+            appointment_spend=Coalesce(_per_owner(appointments, 'pet__owner', Sum('price'), money), zero),
+            order_spend=Coalesce(_per_owner(Order.objects.all(), 'owner', Sum('total'), money), zero),
+        ).annotate(total_spend=models.F('appointment_spend') + models.F('order_spend'))
+
 # Create your models here.
 class Owner(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -25,10 +58,16 @@ class Owner(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OwnerQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Owner'
         verbose_name_plural = 'Owners'
+        indexes = [
+            models.Index(fields=['name'], name='clinic_owner_name_idx'),
+            models.Index(fields=['-created_at'], name='clinic_owner_created_idx'),
+        ]
 
     @property
     def formatted_cpf(self):
@@ -56,23 +95,91 @@ class Pet(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name'], name='clinic_pet_name_idx'),
+            models.Index(fields=['owner', 'name'], name='clinic_pet_owner_name_idx'),
+            models.Index(fields=['species', 'name'], name='clinic_pet_species_name_idx'),
+            models.Index(fields=['gender', 'name'], name='clinic_pet_gender_name_idx'),
+            models.Index(fields=['birth_date'], name='clinic_pet_birth_date_idx'),
+            models.Index(fields=['-created_at'], name='clinic_pet_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.breed})"
 
+class Veterinarian(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['name'], name='clinic_vet_name_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+# Upper bound on an appointment's length. It lets an overlap query bound
+# the start time from both sides and stay a range scan on
+# (veterinarian, appointment_date).
+MAX_APPOINTMENT_MINUTES = 12 * 60
+
+class AppointmentQuerySet(models.QuerySet):
+    def overlapping(self, start, end):
+        """Appointments whose [appointment_date, ends_at) overlaps [start, end)."""
+        return self.filter(
+            appointment_date__lt=end,
+            appointment_date__gt=start - timedelta(minutes=MAX_APPOINTMENT_MINUTES),
+            ends_at__gt=start,
+        )
+
+class AppointmentEndField(models.DateTimeField):
+    """
+    `appointment_date + duration_minutes`. Computed in `pre_save()`, which
+    `bulk_create()` calls too, so it can never be missing or stale.
+    """
+
+    def pre_save(self, model_instance, add):
+        start = model_instance._meta.get_field('appointment_date').to_python(model_instance.appointment_date)
+        value = start + timedelta(minutes=model_instance.duration_minutes)
+        setattr(model_instance, self.attname, value)
+        return value
+
 class Appointment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     pet = models.ForeignKey(Pet, related_name='appointments', on_delete=models.CASCADE)
     appointment_date = models.DateTimeField()
+    duration_minutes = models.PositiveSmallIntegerField(
+        default=30, validators=[MinValueValidator(1), MaxValueValidator(MAX_APPOINTMENT_MINUTES)]
+    )
+    ends_at = AppointmentEndField(editable=False)
     reason = models.TextField()
     notes = models.TextField(blank=True, null=True)
-    doctor = models.CharField(max_length=255, blank=True, null=True)
+    doctor = models.CharField(max_length=255, blank=True, null=True)  # Free-text name, kept for older clients
+    veterinarian = models.ForeignKey(
+        Veterinarian, related_name='appointments', on_delete=models.PROTECT, blank=True, null=True
+    )
     price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AppointmentQuerySet.as_manager()
+
     class Meta:
         ordering = ['-appointment_date']
+        indexes = [
+            models.Index(fields=['-appointment_date', '-id'], name='clinic_appt_date_idx'),
+            models.Index(fields=['pet', '-appointment_date', '-id'], name='clinic_appt_pet_date_idx'),
+            models.Index(fields=['-created_at', '-id'], name='clinic_appt_created_idx'),
+            models.Index(
+                fields=['veterinarian', 'appointment_date'], include=['ends_at'], name='clinic_appt_vet_date_idx'
+            ),
+            models.Index(fields=['doctor', '-appointment_date', '-id'], name='clinic_appt_doctor_date_idx'),
+            models.Index(fields=['price'], name='clinic_appt_price_idx'),
+        ]
 
     def __str__(self):
         return f"Appointment {self.id} - {self.pet.name} @ {self.appointment_date}"
@@ -81,7 +188,9 @@ class Order(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     owner = models.ForeignKey(Owner, related_name='orders', on_delete=models.CASCADE)
     date = models.DateTimeField(auto_now_add=True)
-    items = models.JSONField(default=list, blank=True)  # List of items in the order
+    # Legacy free-form items. Orders created through the API store their
+    # items as OrderItem rows; 0005_orderitem backfilled those from here.
+    items = models.JSONField(default=list, blank=True)
     total = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -89,6 +198,81 @@ class Order(models.Model):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['-date', '-id'], name='clinic_order_date_idx'),
+            models.Index(fields=['owner', '-date', '-id'], name='clinic_order_owner_date_idx'),
+            models.Index(fields=['-created_at', '-id'], name='clinic_order_created_idx'),
+            models.Index(fields=['total'], name='clinic_order_total_idx'),
+        ]
 
     def __str__(self):
-        return f"Order {self.id} - {self.owner.name} - R$ {self.total}"
\ No newline at end of file
+        return f"Order {self.id} - {self.owner.name} - R$ {self.total}"
+
+class OrderItem(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, related_name='order_items', on_delete=models.CASCADE)
+    position = models.PositiveSmallIntegerField(default=0)
+    name = models.CharField(max_length=255)
+    quantity = models.PositiveIntegerField(default=1)
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    line_total = models.DecimalField(max_digits=10, decimal_places=2)
+    date = models.DateTimeField()  # Copy of Order.date, so sales can be indexed by (name, date)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['order_id', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['order', 'position'], name='clinic_orderitem_position_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['name', 'date'], name='clinic_orderitem_name_date_idx'),
+            models.Index(fields=['date'], name='clinic_orderitem_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.name} (order {self.order_id})"
+
+class RevenueRollup(models.Model):
+    """
+    Revenue per local day, doctor and pet species, maintained by
+    `clinic.rollups`. Orders are not tied to a doctor or pet, so their
+    revenue is kept in the row with an empty doctor and species.
+    """
+    day = models.DateField()
+    doctor = models.CharField(max_length=255, blank=True, default='')
+    species = models.CharField(max_length=1, choices=Species.choices, blank=True, default='')
+    appointment_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    appointments = models.PositiveIntegerField(default=0)
+    order_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    orders = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['day', 'doctor', 'species']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'doctor', 'species'], name='clinic_revenue_rollup_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Revenue {self.day} {self.doctor or '-'} {self.species or '-'}"
+
+class RevenueDirtyDay(models.Model):
+    """
+    A day whose `RevenueRollup` rows are out of date. `token` changes on
+    every mark, so a refresh only clears the marks it has read.
+    """
+    day = models.DateField(primary_key=True)
+    token = models.UUIDField(default=uuid.uuid4)
+
+class SlowQuery(models.Model):
+    """
+    Admin entry for the in-memory slow-query log of `clinic.slowqueries`.
+    There is no table behind it.
+    """
+
+    class Meta:
+        managed = False
+        verbose_name_plural = "slow queries"
+        default_permissions = ('view',)
+        permissions = [('clear_slowquery', "Can clear the slow query log")]
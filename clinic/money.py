@@ -0,0 +1,7 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+CENT = Decimal('0.01')
+
+def money(value):
+    """Round to cents, half up. Every stored amount follows this rule."""
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
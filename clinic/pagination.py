@@ -0,0 +1,154 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination keyed on ``(ordering field, pk)``.
+
+    DRF's ``CursorPagination`` positions on the first ordering field only and
+    falls back to OFFSET for ties. Adding the primary key to the position
+    makes every cursor unique, so a page is always a single index range scan
+    (``WHERE (date, id) < (%s, %s) ORDER BY date, id LIMIT n``) with no
+    ``COUNT(*)`` and no ``OFFSET``, however deep the client pages.
+
+    The ordering still comes from ``OrderingFilter`` when the view has one,
+    so ``?ordering=created_at`` keeps working.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    # Opt-in switch, e.g. ``?pagination=cursor``. Sending a ``cursor``
+    # parameter also selects this paginator.
+    mode_query_param = 'pagination'
+    mode_query_value = 'cursor'
+
+    position_separator = '|'
+
+    @classmethod
+    def is_requested(cls, request):
+        params = getattr(request, 'query_params', None)
+        if params is None:
+            return False
+        return cls.cursor_query_param in params or params.get(cls.mode_query_param) == cls.mode_query_value
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        field = ordering[0]
+        pk_name = queryset.model._meta.pk.name
+        if field.lstrip('-') == pk_name:
+            return (field,)
+        return (field, f"-{pk_name}" if field.startswith('-') else pk_name)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (reverse, current_position) = (False, None)
+        else:
+            (_, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*[self._flip(order) for order in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self._position_filter(queryset.model, current_position, reverse))
+
+        # Fetch one extra row to know whether there is a following page.
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip('-')
+            if isinstance(instance, dict):
+                attr = instance[field_name]
+            else:
+                attr = getattr(instance, field_name)
+            values.append(str(attr))
+        return self.position_separator.join(values)
+
+    def _position_filter(self, model, position, reverse):
+        """
+        Build ``(field, pk) > (value, pk_value)`` in the ordering direction.
+
+        The leading ``field >= value`` term bounds the index range scan; the
+        second term skips the rows already returned for ``value``.
+        """
+        values = position.rsplit(self.position_separator, len(self.ordering) - 1)
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            values = [
+                model._meta.get_field(order.lstrip('-')).to_python(value)
+                for order, value in zip(self.ordering, values)
+            ]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+        lookups = []
+        for order in self.ordering:
+            descending = order.startswith('-') != reverse
+            lookups.append((order.lstrip('-'), 'lt' if descending else 'gt'))
+
+        if len(lookups) == 1:
+            (field, op), = lookups
+            return Q(**{f"{field}__{op}": values[0]})
+
+        (field, op), (pk_name, pk_op) = lookups
+        value, pk_value = values
+        bound = 'lte' if op == 'lt' else 'gte'
+        return (
+            Q(**{f"{field}__{bound}": value})
+            & (Q(**{f"{field}__{op}": value}) | Q(**{f"{pk_name}__{pk_op}": pk_value}))
+        )
+
+    @staticmethod
+    def _flip(order):
+        return order[1:] if order.startswith('-') else f"-{order}"
+
+class AppointmentKeysetPagination(KeysetPagination):
+    ordering = '-appointment_date'
+
+class OrderKeysetPagination(KeysetPagination):
+    ordering = '-date'
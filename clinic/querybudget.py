@@ -0,0 +1,127 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+class QueryRecorder:
+    """
+    Records the SQL run on every database connection while active, and the
+    seconds spent in it. Unlike `CaptureQueriesContext` it hooks
+    `execute_wrapper`, so it works with `DEBUG = False` and costs next to
+    nothing.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.duration = 0.0
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+
+    def __len__(self):
+        return len(self.queries)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+class ExecuteWrapperMiddleware:
+    """
+    Base for middleware that hooks `execute_wrapper` on the connections for
+    the length of a request, under WSGI or ASGI. `begin()` runs first and
+    returns the request's state, `wrappers(request, state)` the context
+    manager installing the hooks (or None), and `end()` sees the response.
+
+    Connections belong to the thread running the queries. For async views
+    that is the request's sync thread, where the async ORM runs them, so
+    the hooks are installed and removed there.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.begin(request)
+        wrappers = self.wrappers(request, state)
+        if wrappers is None:
+            response = self.get_response(request)
+        else:
+            with wrappers:
+                response = self.get_response(request)
+        return self.end(request, response, state)
+
+    async def __acall__(self, request):
+        state = self.begin(request)
+        wrappers = self.wrappers(request, state)
+        if wrappers is None:
+            response = await self.get_response(request)
+        else:
+            await sync_to_async(wrappers.__enter__)()
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(wrappers.__exit__)(None, None, None)
+        return self.end(request, response, state)
+
+    def begin(self, request):
+        return None
+
+    def wrappers(self, request, state):
+        raise NotImplementedError
+
+    def end(self, request, response, state):
+        return response
+
+def query_budget(request):
+    """The budget `clinic.urls.QUERY_BUDGETS` declares for a GET request, if any."""
+    from .urls import QUERY_BUDGETS
+
+    match = request.resolver_match
+    if request.method != 'GET' or match is None:
+        return None
+    return QUERY_BUDGETS.get(match.url_name)
+
+class QueryBudgetMiddleware(ExecuteWrapperMiddleware):
+    """
+    Counts the queries of each request and logs a warning when a GET goes
+    over its budget. With `DEBUG` on, the count is sent as `X-Query-Count`.
+    """
+
+    def begin(self, request):
+        return QueryRecorder()
+
+    def wrappers(self, request, recorder):
+        return recorder
+
+    def end(self, request, response, recorder):
+        budget = query_budget(request)
+        if budget is not None and len(recorder) > budget:
+            logger.warning(
+                "%s %s ran %d queries, over its budget of %d",
+                request.method, request.get_full_path(), len(recorder), budget,
+            )
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(len(recorder))
+        return response
@@ -0,0 +1,72 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+class RelatedObjectCache:
+    """
+    Related rows resolved while handling one request, keyed by queryset and
+    pk. Missing pks are cached as `None` so a bad reference is reported
+    without another query.
+    """
+
+    def __init__(self):
+        self._rows = {}
+
+    def resolve(self, queryset, key, pks):
+        rows = self._rows.setdefault(key, {})
+        missing = {pk for pk in pks if pk not in rows}
+        if missing:
+            found = queryset.in_bulk(missing)
+            for pk in missing:
+                rows[pk] = found.get(pk)
+        return rows
+
+def related_object_cache(serializer):
+    """
+    Return the cache shared by every serializer of the current request, or
+    by the serializer tree when there is no request in the context.
+    """
+    holder = serializer.context.get('request') or serializer.root
+    cache = getattr(holder, '_related_object_cache', None)
+    if cache is None:
+        cache = RelatedObjectCache()
+        holder._related_object_cache = cache
+    return cache
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    `PrimaryKeyRelatedField` backed by the request's `RelatedObjectCache`.
+
+    List serializers call `prime()` with every pk of the batch first, so the
+    related rows come from a single `IN` query instead of one
+    `SELECT ... WHERE id = %s` per row, and a pk already seen during the
+    request is never fetched twice.
+    """
+
+    def prime(self, values):
+        model = self.get_queryset().model
+        pks = {pk for pk in (self._to_pk(model, value) for value in values) if pk is not None}
+        if pks:
+            self._resolve(pks)
+
+    def to_internal_value(self, data):
+        pk = self._to_pk(self.get_queryset().model, data)
+        if pk is None:
+            return super().to_internal_value(data)
+        obj = self._resolve({pk})[pk]
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+    def _resolve(self, pks):
+        queryset = self.get_queryset()
+        if not hasattr(self, '_cache_key'):
+            self._cache_key = (queryset.model._meta.label, str(queryset.query))
+        return related_object_cache(self).resolve(queryset, self._cache_key, pks)
+
+    def _to_pk(self, model, value):
+        if self.pk_field is not None or value is None or isinstance(value, bool):
+            return None
+        try:
+            return model._meta.pk.to_python(value)
+        except (DjangoValidationError, TypeError, ValueError):
+            return None
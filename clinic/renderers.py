@@ -0,0 +1,94 @@
+import csv
+import json
+
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class PlainJSON(list):
+    """
+    A list holding JSON types only: str, int, bool, None, and lists and
+    dicts (with str keys) of those. No float, so no formatting differences
+    between encoders.
+    """
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    `JSONRenderer` that encodes `PlainJSON` bodies (or paginated bodies
+    whose `results` are `PlainJSON`) with orjson, when installed. For such
+    data the bytes are the same as DRF's encoder gives; anything else,
+    indented or ASCII-only output, and data orjson rejects go through DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data.get('results') if isinstance(data, dict) else data
+        if (
+            orjson is None or not isinstance(rows, PlainJSON) or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # The same JavaScript-safe escapes as JSONRenderer.
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+class _Line:
+    """File-like object whose write() hands back the written line."""
+
+    def write(self, value):
+        return value
+
+class ExportRenderer(renderers.BaseRenderer):
+    """
+    Negotiates the format of an export. The body is produced row by row by
+    `stream()`; `render()` only serves error responses, as JSON.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=JSONEncoder).encode()
+
+    def stream(self, fields, rows):
+        raise NotImplementedError
+
+class CSVRenderer(ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def stream(self, fields, rows):
+        writer = csv.writer(_Line())
+        yield writer.writerow(fields).encode()
+        for row in rows:
+            yield writer.writerow([self.cell(row[name]) for name in fields]).encode()
+
+    def cell(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+        return value
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def stream(self, fields, rows):
+        for row in rows:
+            yield (json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + '\n').encode()
+
+class PrometheusRenderer(renderers.BaseRenderer):
+    """Passes through a body already in the Prometheus text format."""
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode()
+        return json.dumps(data, cls=JSONEncoder).encode()
@@ -0,0 +1,123 @@
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .cache import invalidate
+from .models import Appointment, Order, RevenueDirtyDay, RevenueRollup
+
+# Revenue is bucketed by the local day of these fields.
+REVENUE_DATES = {Appointment: 'appointment_date', Order: 'date'}
+
+def revenue_day(instance):
+    field = instance._meta.get_field(REVENUE_DATES[type(instance)])
+    return timezone.localdate(field.to_python(getattr(instance, field.attname)))
+
+def day_bounds(first, last):
+    """Aware datetimes bounding the local days `first` through `last`."""
+    start = timezone.make_aware(datetime.combine(first, time.min))
+    end = timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min))
+    return start, end
+
+def mark_days(days):
+    """
+    Flag local `days` for `refresh()`. Single saves and deletes are marked
+    by signals; bulk writes call this (or `mark_instances()`) themselves.
+    """
+    days = set(days)
+    if days:
+        RevenueDirtyDay.objects.bulk_create(
+            [RevenueDirtyDay(day=day, token=uuid.uuid4()) for day in days],
+            update_conflicts=True,
+            unique_fields=['day'],
+            update_fields=['token'],
+        )
+
+def mark_instances(instances):
+    """Mark the days of bulk-created or bulk-updated appointments and orders."""
+    mark_days(revenue_day(instance) for instance in instances if type(instance) in REVENUE_DATES)
+
+def consecutive_ranges(days):
+    ranges = []
+    for day in sorted(days):
+        if ranges and ranges[-1][1] + timedelta(days=1) == day:
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return ranges
+
+def compute(first, last):
+    """`RevenueRollup` rows for the local days `first` through `last`."""
+    start, end = day_bounds(first, last)
+    rows = {}
+
+    def row(day, doctor, species):
+        key = (day, doctor or '', species or '')
+        if key not in rows:
+            rows[key] = RevenueRollup(day=key[0], doctor=key[1], species=key[2])
+        return rows[key]
+
+    appointments = (
+        Appointment.objects.filter(appointment_date__gte=start, appointment_date__lt=end)
+        .annotate(day=TruncDate('appointment_date'))
+        .order_by()
+        .values('day', 'doctor', 'pet__species')
+        .annotate(revenue=Sum('price'), count=Count('pk'))
+    )
+    for values in appointments:
+        rollup = row(values['day'], values['doctor'], values['pet__species'])
+        rollup.appointment_revenue = values['revenue']
+        rollup.appointments = values['count']
+
+    orders = (
+        Order.objects.filter(date__gte=start, date__lt=end)
+        .annotate(day=TruncDate('date'))
+        .order_by()
+        .values('day')
+        .annotate(revenue=Sum('total'), count=Count('pk'))
+    )
+    for values in orders:
+        rollup = row(values['day'], '', '')
+        rollup.order_revenue = values['revenue']
+        rollup.orders = values['count']
+
+    return list(rows.values())
+
+def refresh_range(first, last):
+    rows = compute(first, last)
+    with transaction.atomic():
+        RevenueRollup.objects.filter(day__gte=first, day__lte=last).delete()
+        RevenueRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+def refresh(max_days=None):
+    """
+    Recompute the marked days (at most `max_days` of them, oldest first),
+    one range query per run of consecutive days, and return `(days, rows)`
+    refreshed. A day marked again meanwhile keeps its mark and is picked
+    up by the next run.
+    """
+    marks = RevenueDirtyDay.objects.order_by('day').values_list('day', 'token')
+    if max_days is not None:
+        marks = marks[:max_days]
+    marks = list(marks)
+
+    rows = 0
+    for first, last in consecutive_ranges(day for day, _ in marks):
+        rows += refresh_range(first, last)
+    for day, token in marks:
+        RevenueDirtyDay.objects.filter(day=day, token=token).delete()
+    if marks:
+        invalidate(RevenueRollup)
+    return len(marks), rows
+
+def rebuild():
+    """Recompute every day that has appointments, orders or rollup rows."""
+    days = set(RevenueRollup.objects.values_list('day', flat=True).distinct())
+    for model, field in REVENUE_DATES.items():
+        days.update(model.objects.annotate(day=TruncDate(field)).order_by().values_list('day', flat=True).distinct())
+    mark_days(days)
+    return refresh()
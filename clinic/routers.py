@@ -0,0 +1,93 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import Resolver404, resolve
+
+from .cache import recent_write
+
+# Set by a client's writes; while it lives, that client reads the primary.
+STICKY_COOKIE = 'clinic_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('clinic_read_alias', default=None)
+
+def read_alias():
+    """The replica serving the reads of the current request, if any."""
+    return _read_alias.get()
+
+def replica_may_lag():
+    """True when the current request reads a replica that may miss a recent write."""
+    return read_alias() is not None and recent_write()
+
+def choose_replica(request):
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas or request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES:
+        return None
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return None
+    view = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    if view is None or not view.__module__.startswith('clinic.'):
+        return None
+    return random.choice(replicas)
+
+class ReplicaRouter:
+    """
+    Sends the reads of safe requests to the clinic API to the replica
+    picked for the request by `ReplicaMiddleware`; everything else, and
+    all writes, go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+class ReplicaMiddleware:
+    """
+    Picks a replica in `DATABASE_REPLICAS` for each GET, HEAD or OPTIONS
+    request to a clinic view. A successful write sets a cookie that keeps
+    the client on the primary for `DB_REPLICA_STICKY_SECONDS`, so it reads
+    its own writes despite replication lag.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_alias.set(choose_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.stick(request, response)
+
+    async def __acall__(self, request):
+        token = _read_alias.set(choose_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.stick(request, response)
+
+    def stick(self, request, response):
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                STICKY_COOKIE, '1', max_age=settings.DB_REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,73 @@
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Appointment
+
+class BusyIntervals:
+    """
+    Sorted, merged `[start, end)` intervals. `overlaps()` is a bisect plus
+    at most two comparisons, so checking a batch of new appointments
+    against each other and against the booked ones stays O(n log n).
+    """
+
+    def __init__(self, intervals=()):
+        self._starts = []
+        self._ends = []
+        for start, end in sorted(intervals):
+            self.add(start, end)
+
+    def overlaps(self, start, end):
+        index = bisect_right(self._starts, start)
+        if index and self._ends[index - 1] > start:
+            return True
+        return index < len(self._starts) and self._starts[index] < end
+
+    def add(self, start, end):
+        index = bisect_right(self._starts, start)
+        if index and self._ends[index - 1] >= start:
+            index -= 1
+            start = self._starts[index]
+            end = max(end, self._ends[index])
+        stop = index
+        while stop < len(self._starts) and self._starts[stop] <= end:
+            end = max(end, self._ends[stop])
+            stop += 1
+        self._starts[index:stop] = [start]
+        self._ends[index:stop] = [end]
+
+def booked(veterinarian, start, end):
+    """The veterinarian's appointments overlapping `[start, end)`."""
+    rows = (
+        Appointment.objects.filter(veterinarian=veterinarian)
+        .overlapping(start, end)
+        .order_by()
+        .values_list('appointment_date', 'ends_at')
+    )
+    return BusyIntervals(rows)
+
+def free_slots(veterinarian, start, end, slot_minutes):
+    """
+    Free `slot_minutes` slots of `veterinarian` within `[start, end)`. Slots
+    are laid out from opening time on each day, in the current time zone,
+    between `CLINIC_OPENING_HOUR` and `CLINIC_CLOSING_HOUR`.
+    """
+    busy = booked(veterinarian, start, end)
+    length = timedelta(minutes=slot_minutes)
+    tz = timezone.get_current_timezone()
+    day = timezone.localtime(start, tz).date()
+    slots = []
+    while True:
+        opening = timezone.make_aware(datetime.combine(day, time(settings.CLINIC_OPENING_HOUR)), tz)
+        if opening >= end:
+            break
+        closing = timezone.make_aware(datetime.combine(day, time(settings.CLINIC_CLOSING_HOUR)), tz)
+        slot = opening
+        while slot + length <= min(closing, end):
+            if slot >= start and not busy.overlaps(slot, slot + length):
+                slots.append((slot, slot + length))
+            slot += length
+        day += timedelta(days=1)
+    return slots
@@ -1,31 +1,498 @@
+from datetime import timedelta
+from decimal import InvalidOperation
+
+from django.db import IntegrityError, transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
-from .models import Owner, Pet, Appointment, Order, Species, Gender
+from rest_framework.validators import UniqueValidator
+from .models import (
+    MAX_APPOINTMENT_MINUTES, Owner, Pet, Veterinarian, Appointment, Order, OrderItem, Species, Gender,
+)
+from .money import money
+from .relations import BatchedPrimaryKeyRelatedField
+from .schedule import BusyIntervals
+
+class _Rejected:
+    def __init__(self, detail):
+        self.detail = detail
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """
+    `many=True` serializer behind the `bulk` create actions.
+
+    Related pks and unique fields are checked for the whole batch with one
+    `IN` query per field, and rows are written with `bulk_create` in
+    `batch_size` chunks. Invalid rows do not fail validation; they are
+    listed in `rejected` as `{"index": ..., "errors": ...}` and left out of
+    `validated_data`, so the caller decides whether to create the rest.
+    A child may define `validate_batch(validated, errors)` for checks that
+    span rows; it fills `errors[index]` for the rows it rejects. It may also
+    define `lock_batch(instances)`, run in each chunk's transaction before
+    the insert, which locks what the rows depend on, checks them again and
+    returns `{position in chunk: errors}` for the rows to reject.
+    """
+    batch_size = 500
+
+    def to_internal_value(self, data):
+        self.rejected = []
+        self._unique_checks = self._pop_unique_validators()
+
+        if isinstance(data, list):
+            for name, field in self.child.fields.items():
+                if isinstance(field, BatchedPrimaryKeyRelatedField) and not field.read_only:
+                    field.prime(item.get(name) for item in data if isinstance(item, dict))
+
+        validated = super().to_internal_value(data)
+        errors = [item.detail if isinstance(item, _Rejected) else {} for item in validated]
+        self._check_unique(validated, errors)
+        if hasattr(self.child, 'validate_batch'):
+            self.child.validate_batch(validated, errors)
+
+        self.rejected = [{'index': index, 'errors': error} for index, error in enumerate(errors) if error]
+        self.accepted_indexes = [index for index, error in enumerate(errors) if not error]
+        return [validated[index] for index in self.accepted_indexes]
+
+    def run_child_validation(self, data):
+        try:
+            return super().run_child_validation(data)
+        except serializers.ValidationError as exc:
+            return _Rejected(exc.detail)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        pop_nested = getattr(self.child, 'pop_nested', lambda attrs: None)
+        create_nested = getattr(self.child, 'create_nested', lambda pairs: None)
+        nested = [pop_nested(attrs) for attrs in validated_data]
+        instances = [model(**attrs) for attrs in validated_data]
+        created = []
+
+        for start in range(0, len(instances), self.batch_size):
+            positions = range(start, min(start + self.batch_size, len(instances)))
+            try:
+                with transaction.atomic():
+                    kept, conflicts = self._lock(positions, instances)
+                    chunk = [instances[position] for position in kept]
+                    model.objects.bulk_create(chunk)
+                    create_nested(zip(chunk, [nested[position] for position in kept]))
+                created.extend(chunk)
+                self._reject(conflicts)
+                continue
+            except IntegrityError:
+                pass
+
+            # A row raced with another writer; retry the chunk row by row
+            # so only the conflicting rows are rejected.
+            for position in positions:
+                instance = instances[position]
+                try:
+                    with transaction.atomic():
+                        kept, conflicts = self._lock([position], instances)
+                        if kept:
+                            instance.save(force_insert=True)
+                            create_nested([(instance, nested[position])])
+                    if kept:
+                        created.append(instance)
+                    self._reject(conflicts)
+                except IntegrityError:
+                    self._reject({position: {'non_field_errors': ['This row conflicts with existing data.']}})
+
+        self.rejected.sort(key=lambda row: row['index'])
+        return created
+
+    def _lock(self, positions, instances):
+        """The positions still valid under the child's `lock_batch()`, and the errors of the others."""
+        if not hasattr(self.child, 'lock_batch'):
+            return list(positions), {}
+        errors = self.child.lock_batch([instances[position] for position in positions])
+        conflicts = {position: errors[offset] for offset, position in enumerate(positions) if offset in errors}
+        return [position for position in positions if position not in conflicts], conflicts
+
+    def _reject(self, conflicts):
+        for position, errors in conflicts.items():
+            self.rejected.append({'index': self.accepted_indexes[position], 'errors': errors})
 
-class OwnerSerializer(serializers.ModelSerializer):
+    def _pop_unique_validators(self):
+        """
+        Replace per-row `UniqueValidator` queries with one batch check.
+        """
+        checks = {}
+        for name, field in self.child.fields.items():
+            unique = [v for v in field.validators if isinstance(v, UniqueValidator)]
+            if unique:
+                field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+                checks[name] = (field.source, unique[0].queryset, unique[0].message)
+        return checks
+
+    def _check_unique(self, validated, errors):
+        for name, (source, queryset, message) in self._unique_checks.items():
+            rows = [
+                (index, attrs[source]) for index, attrs in enumerate(validated)
+                if not errors[index] and source in attrs
+            ]
+            values = {value for _, value in rows}
+            taken = set(queryset.filter(**{f"{source}__in": values}).values_list(source, flat=True)) if values else set()
+
+            seen = set()
+            for index, value in rows:
+                if value in taken or value in seen:
+                    errors[index] = {name: [message]}
+                seen.add(value)
+
+class ExpandableSerializerMixin:
+    """
+    Embeds related objects instead of their pk for the requested paths, e.g.
+    `expand={'pet', 'pet.owner'}`. `Meta.expandable_fields` maps each
+    field name to the serializer used when it is expanded. The paths come
+    from the `expand` keyword or, for the root serializer, from
+    `context['expand']`.
+    """
+
+    def __init__(self, *args, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if expand is None:
+            expand = self._context.get('expand', ())
+        self._expand = set(expand)
+
+    @classmethod
+    def expandable_paths(cls):
+        paths = set()
+        for name, serializer_class in getattr(cls.Meta, 'expandable_fields', {}).items():
+            paths.add(name)
+            if issubclass(serializer_class, ExpandableSerializerMixin):
+                paths.update(f"{name}.{path}" for path in serializer_class.expandable_paths())
+        return paths
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name, serializer_class in getattr(self.Meta, 'expandable_fields', {}).items():
+            if name not in self._expand:
+                continue
+            prefix = f"{name}."
+            nested = {path[len(prefix):] for path in self._expand if path.startswith(prefix)}
+            if issubclass(serializer_class, ExpandableSerializerMixin):
+                fields[name] = serializer_class(read_only=True, expand=nested)
+            else:
+                fields[name] = serializer_class(read_only=True)
+        return fields
+
+class SparseFieldsetMixin:
+    """
+    Leaves fields out of the representation: only the names in `fields`
+    are kept (all when it is None), and the names in `omit` are dropped.
+    Both come from the keywords or, for the root serializer, from
+    `context['fields']` and `context['omit']`.
+    """
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            fields = self._context.get('fields')
+        if omit is None:
+            omit = self._context.get('omit', ())
+        self._sparse_fields = None if fields is None else set(fields)
+        self._omit = set(omit)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        return {
+            name: field for name, field in fields.items()
+            if (self._sparse_fields is None or name in self._sparse_fields) and name not in self._omit
+        }
+
+class OwnerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Owner
         fields = ('id', 'name', 'cpf', 'phone', 'email', 'address', 'created_at', 'updated_at')
+        list_serializer_class = BulkCreateListSerializer
 
-class PetSerializer(serializers.ModelSerializer):
+class OwnerSummarySerializer(serializers.ModelSerializer):
+    """
+    Dashboard figures annotated by `Owner.objects.with_summary()`.
+    """
+    pet_count = serializers.IntegerField(read_only=True)
+    appointment_count = serializers.IntegerField(read_only=True)
+    last_visit = serializers.DateTimeField(read_only=True)
+    appointment_spend = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    order_spend = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    total_spend = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Owner
+        fields = (
+            'id', 'name', 'cpf', 'pet_count', 'appointment_count', 'last_visit',
+            'appointment_spend', 'order_spend', 'total_spend',
+        )
+
+class PetSerializer(SparseFieldsetMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
     gender = serializers.ChoiceField(choices=Pet._meta.get_field('gender').choices)
     species = serializers.ChoiceField(choices=Pet._meta.get_field('species').choices)
-    owner = serializers.PrimaryKeyRelatedField(queryset=Owner.objects.all())
+    owner = BatchedPrimaryKeyRelatedField(queryset=Owner.objects.all())
 
     class Meta:
         model = Pet
         fields = ('id', 'name', 'gender', 'species', 'breed', 'birth_date', 'owner', 'created_at', 'updated_at')
+        list_serializer_class = BulkCreateListSerializer
+        expandable_fields = {'owner': OwnerSerializer}
+
+class VeterinarianSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Veterinarian
+        fields = ('id', 'name', 'created_at', 'updated_at')
 
-class AppointmentSerializer(serializers.ModelSerializer):
-    pet = serializers.PrimaryKeyRelatedField(queryset=Pet.objects.all())
+class AppointmentSerializer(SparseFieldsetMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    """
+    `ends_at` is derived from `appointment_date` and `duration_minutes`. An
+    appointment with a `veterinarian` may not overlap another one of theirs;
+    `doctor` defaults to the veterinarian's name.
+    """
+    pet = BatchedPrimaryKeyRelatedField(queryset=Pet.objects.all())
+    veterinarian = BatchedPrimaryKeyRelatedField(
+        queryset=Veterinarian.objects.all(), required=False, allow_null=True
+    )
 
     class Meta:
         model = Appointment
-        fields = ('id', 'pet', 'appointment_date', 'reason', 'notes', 'doctor', 'price', 'created_at', 'updated_at')
+        fields = (
+            'id', 'pet', 'appointment_date', 'duration_minutes', 'ends_at', 'reason', 'notes', 'doctor',
+            'veterinarian', 'price', 'created_at', 'updated_at',
+        )
+        list_serializer_class = BulkCreateListSerializer
+        expandable_fields = {'pet': PetSerializer, 'veterinarian': VeterinarianSerializer}
+
+    def validate(self, attrs):
+        duration = attrs.get('duration_minutes', Appointment._meta.get_field('duration_minutes').default)
+        attrs['ends_at'] = attrs['appointment_date'] + timedelta(minutes=duration)
+        veterinarian = attrs.get('veterinarian')
+        if veterinarian is not None:
+            if not attrs.get('doctor'):
+                attrs['doctor'] = veterinarian.name
+            # Bulk rows are checked together in validate_batch().
+            if not isinstance(self.parent, serializers.ListSerializer):
+                self.check_available(attrs)
+        return attrs
+
+    def create(self, validated_data):
+        veterinarian = validated_data.get('veterinarian')
+        if veterinarian is None:
+            return super().create(validated_data)
+        with transaction.atomic():
+            # Lock the veterinarian so concurrent bookings are checked one
+            # at a time; historical rows overlap, so there is no exclusion
+            # constraint to fall back on.
+            Veterinarian.objects.select_for_update().filter(pk=veterinarian.pk).exists()
+            self.check_available(validated_data)
+            return super().create(validated_data)
+
+    def validate_batch(self, validated, errors):
+        rows = [
+            (index, attrs) for index, attrs in enumerate(validated)
+            if not errors[index] and attrs.get('veterinarian') is not None
+        ]
+        if not rows:
+            return
+        busy = self.booked(
+            {attrs['veterinarian'].pk for _, attrs in rows},
+            min(attrs['appointment_date'] for _, attrs in rows),
+            max(attrs['ends_at'] for _, attrs in rows),
+        )
+        for index, attrs in rows:
+            veterinarian = attrs['veterinarian']
+            intervals = busy.setdefault(veterinarian.pk, BusyIntervals())
+            if intervals.overlaps(attrs['appointment_date'], attrs['ends_at']):
+                errors[index] = {'appointment_date': [self.conflict_message(veterinarian)]}
+            else:
+                intervals.add(attrs['appointment_date'], attrs['ends_at'])
+
+    def booked(self, veterinarians, start, end):
+        """`BusyIntervals` of the stored appointments of `veterinarians` overlapping `[start, end)`, by pk."""
+        booked = (
+            Appointment.objects.filter(veterinarian__in=veterinarians)
+            .overlapping(start, end)
+            .order_by()
+            .values_list('veterinarian', 'appointment_date', 'ends_at')
+        )
+        busy = {}
+        for veterinarian, booked_start, booked_end in booked:
+            busy.setdefault(veterinarian, []).append((booked_start, booked_end))
+        return {veterinarian: BusyIntervals(intervals) for veterinarian, intervals in busy.items()}
+
+    def lock_batch(self, instances):
+        # Same lock as create(), taken in pk order so concurrent batches
+        # cannot deadlock; rows validated before a competing write
+        # committed are checked again against the stored appointments.
+        vets = {instance.veterinarian_id for instance in instances if instance.veterinarian_id is not None}
+        if not vets:
+            return {}
+        list(Veterinarian.objects.select_for_update().filter(pk__in=vets).order_by('pk').values_list('pk', flat=True))
+        busy = self.booked(
+            vets,
+            min(instance.appointment_date for instance in instances),
+            max(instance.ends_at for instance in instances),
+        )
+        errors = {}
+        for offset, instance in enumerate(instances):
+            intervals = busy.get(instance.veterinarian_id)
+            if intervals is not None and intervals.overlaps(instance.appointment_date, instance.ends_at):
+                errors[offset] = {'appointment_date': [self.conflict_message(instance.veterinarian)]}
+        return errors
+
+    def check_available(self, attrs):
+        veterinarian = attrs['veterinarian']
+        conflicts = Appointment.objects.filter(veterinarian=veterinarian).overlapping(
+            attrs['appointment_date'], attrs['ends_at']
+        )
+        if conflicts.exists():
+            raise serializers.ValidationError({'appointment_date': [self.conflict_message(veterinarian)]})
+
+    def conflict_message(self, veterinarian):
+        return f"{veterinarian.name} already has an appointment at this time."
+
+class FromToQueryMixin:
+    """
+    `from`/`to` query parameters with `to` exclusive. `from` is a keyword,
+    so serializers declare it as a `start` field. `max_range` optionally
+    caps the span.
+    """
+    max_range = None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = fields.pop('start')
+        fields['from'].source = 'start'
+        return fields
+
+    def validate(self, attrs):
+        if attrs['to'] <= attrs['start']:
+            raise serializers.ValidationError({'to': ["Must be after `from`."]})
+        if self.max_range is not None and attrs['to'] - attrs['start'] > self.max_range:
+            raise serializers.ValidationError({'to': [f"The range may span at most {self.max_range.days} days."]})
+        return attrs
+
+class AvailabilityQuerySerializer(FromToQueryMixin, serializers.Serializer):
+    """Query parameters of `GET /api/appointments/availability/`."""
+    doctor = serializers.PrimaryKeyRelatedField(queryset=Veterinarian.objects.all())
+    start = serializers.DateTimeField()
+    to = serializers.DateTimeField()
+    slot = serializers.IntegerField(min_value=5, max_value=MAX_APPOINTMENT_MINUTES, default=30)
+
+    max_range = timedelta(days=31)
+
+class RevenueQuerySerializer(FromToQueryMixin, serializers.Serializer):
+    """Query parameters of `GET /api/reports/revenue/`."""
+    start = serializers.DateField()
+    to = serializers.DateField()
+    bucket = serializers.ChoiceField(choices=['day', 'week', 'month'], default='day')
+    group_by = serializers.ChoiceField(choices=['doctor', 'species'], required=False)
+
+class RevenueSerializer(serializers.Serializer):
+    bucket = serializers.DateField()
+    doctor = serializers.CharField(required=False)
+    species = serializers.CharField(required=False)
+    appointments = serializers.IntegerField()
+    appointment_revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    orders = serializers.IntegerField()
+    order_revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
 
-class OrderSerializer(serializers.ModelSerializer):
-    owner = serializers.PrimaryKeyRelatedField(queryset=Owner.objects.all())
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Rollups store "no doctor" / "no species" (e.g. orders) as ''.
+        for name in ('doctor', 'species'):
+            if data.get(name) == '':
+                data[name] = None
+        return data
+
+class MoneyField(serializers.DecimalField):
+    """
+    Two-place `DecimalField` that rounds extra decimals half up, like
+    `money()`, instead of rejecting them (e.g. a float `19.999999`).
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('max_digits', 10)
+        kwargs.setdefault('decimal_places', 2)
+        super().__init__(**kwargs)
+
+    def validate_precision(self, value):
+        try:
+            value = money(value)
+        except InvalidOperation:
+            # Too many digits to round at the context's precision.
+            self.fail('max_digits', max_digits=self.max_digits)
+        return super().validate_precision(value)
+
+def derive_money(serializer, attrs, name, value, rule):
+    """
+    Store the server-computed `value` in `attrs[name]`. A client-supplied
+    amount that disagrees is rejected instead of silently replaced.
+    """
+    try:
+        value = serializer.fields[name].to_internal_value(value)
+    except serializers.ValidationError as exc:
+        raise serializers.ValidationError({name: exc.detail})
+    if name in attrs and attrs[name] != value:
+        raise serializers.ValidationError({name: [f"Expected {value} ({rule})."]})
+    attrs[name] = value
+
+class OrderItemSerializer(serializers.ModelSerializer):
+    unit_price = MoneyField()
+    line_total = MoneyField(required=False)
+
+    class Meta:
+        model = OrderItem
+        fields = ('name', 'quantity', 'unit_price', 'line_total')
+
+    def validate(self, attrs):
+        derive_money(self, attrs, 'line_total', attrs['quantity'] * attrs['unit_price'], 'quantity * unit_price')
+        return attrs
+
+class ProductSalesSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    orders = serializers.IntegerField()
+
+class OrderSerializer(SparseFieldsetMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
+    """
+    `items` is read from and written to `OrderItem` rows; the rows of one
+    order, or of a whole bulk batch, are inserted with one `bulk_create`.
+
+    `line_total` and, for orders with items, `total` are derived on the
+    server; they may be omitted, and a supplied value must match.
+    """
+    owner = BatchedPrimaryKeyRelatedField(queryset=Owner.objects.all())
+    items = OrderItemSerializer(many=True, source='order_items', required=False)
+    total = MoneyField(required=False)
 
     class Meta:
         model = Order
         fields = ('id', 'owner', 'date', 'items', 'total', 'notes', 'created_at', 'updated_at')
-        read_only_fields = ('date',)
\ No newline at end of file
+        read_only_fields = ('date',)
+        list_serializer_class = BulkCreateListSerializer
+        expandable_fields = {'owner': OwnerSerializer}
+
+    def validate(self, attrs):
+        items = attrs.get('order_items')
+        if items:
+            derive_money(self, attrs, 'total', sum(item['line_total'] for item in items), 'sum of line_total')
+        return attrs
+
+    def create(self, validated_data):
+        items = self.pop_nested(validated_data)
+        with transaction.atomic():
+            order = super().create(validated_data)
+            self.create_nested([(order, items)])
+        return order
+
+    def pop_nested(self, attrs):
+        return attrs.pop('order_items', [])
+
+    def create_nested(self, pairs):
+        pairs = list(pairs)
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, position=position, date=order.date, **item)
+            for order, items in pairs
+            for position, item in enumerate(items)
+        ])
+        # Load them back in one query for the response.
+        prefetch_related_objects([order for order, _ in pairs], 'order_items')
@@ -0,0 +1,60 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.functions import TruncDate
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate
+from .models import Owner, Pet, Veterinarian, Appointment, Order
+from .rollups import REVENUE_DATES, mark_days, revenue_day
+
+@receiver(post_save, sender=Owner)
+@receiver(post_save, sender=Pet)
+@receiver(post_save, sender=Veterinarian)
+@receiver(post_save, sender=Appointment)
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Owner)
+@receiver(post_delete, sender=Pet)
+@receiver(post_delete, sender=Veterinarian)
+@receiver(post_delete, sender=Appointment)
+@receiver(post_delete, sender=Order)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate(sender)
+
+@receiver(pre_save, sender=Appointment)
+@receiver(pre_save, sender=Order)
+def remember_revenue_day(sender, instance, update_fields=None, **kwargs):
+    # An update may move the row to another day; that day changes too.
+    instance._previous_revenue_day = None
+    field = REVENUE_DATES[sender]
+    if not instance._state.adding and (update_fields is None or field in update_fields):
+        previous = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+        if previous is not None:
+            instance._previous_revenue_day = timezone.localdate(previous)
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Appointment)
+@receiver(post_delete, sender=Order)
+def mark_revenue_days(sender, instance, using, **kwargs):
+    days = {revenue_day(instance)}
+    previous = getattr(instance, '_previous_revenue_day', None)
+    if previous is not None:
+        days.add(previous)
+    # Upsert the marks after the write commits, so concurrent writers do
+    # not queue on the day's RevenueDirtyDay row while holding their locks.
+    transaction.on_commit(partial(mark_days, days), using=using)
+
+@receiver(pre_save, sender=Pet)
+def mark_species_change(sender, instance, **kwargs):
+    # Species is a rollup dimension, so every day the pet was seen changes.
+    if instance._state.adding:
+        return
+    previous = Pet.objects.filter(pk=instance.pk).values_list('species', flat=True).first()
+    if previous is not None and previous != instance.species:
+        mark_days(
+            instance.appointments.annotate(day=TruncDate('appointment_date'))
+            .order_by().values_list('day', flat=True).distinct()
+        )
@@ -0,0 +1,143 @@
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .querybudget import ExecuteWrapperMiddleware
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+def fingerprint(sql):
+    """
+    `(normalized, digest)` of a statement: literals and placeholders become
+    `?` and `IN` lists collapse, so the same query with other values or
+    another page size shares a fingerprint.
+    """
+    normalized = _STRING.sub('?', sql).replace('%s', '?')
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    normalized = _SPACE.sub(' ', normalized).strip()
+    return normalized, hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+class SlowQueryLog:
+    """Ring buffer of the last `SLOW_QUERY_BUFFER` slow queries of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=settings.SLOW_QUERY_BUFFER)
+
+    def record(self, entry):
+        with self._lock:
+            if self._entries.maxlen != settings.SLOW_QUERY_BUFFER:
+                self._entries = deque(self._entries, maxlen=settings.SLOW_QUERY_BUFFER)
+            self._entries.append(entry)
+
+    def entries(self):
+        """Newest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+slow_queries = SlowQueryLog()
+
+def explain(connection, sql, params):
+    """
+    The `EXPLAIN (ANALYZE, BUFFERS)` plan of a SELECT on PostgreSQL, or
+    None. It runs on the raw driver cursor, so the execute wrappers of the
+    request (timings, budgets, this log) do not see it, and inside a
+    savepoint when a transaction is open, so a failure cannot break it.
+    """
+    if connection.vendor != 'postgresql' or not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    savepoint = connection.in_atomic_block
+    with connection.connection.cursor() as cursor:
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT clinic_explain")
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT clinic_explain")
+            return plan
+        except connection.Database.Error:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT clinic_explain")
+            return None
+
+class SlowQueryCapture:
+    """`execute_wrapper` that logs the queries of one request over `SLOW_QUERY_MS`."""
+
+    def __init__(self, request, connection):
+        self.request = request
+        self.connection = connection
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= settings.SLOW_QUERY_MS:
+            self.record(sql, None if many else params, duration_ms)
+        return result
+
+    def record(self, sql, params, duration_ms):
+        normalized, digest = fingerprint(sql)
+        plan = None
+        if params is not None and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE:
+            plan = explain(self.connection, sql, params)
+        match = self.request.resolver_match
+        slow_queries.record({
+            'time': timezone.now(),
+            'duration_ms': round(duration_ms, 2),
+            'database': self.connection.alias,
+            'method': self.request.method,
+            'path': self.request.path,
+            'route': match.url_name if match is not None else None,
+            'query_params': self.request.GET.urlencode(),
+            'sql': sql,
+            'params': None if params is None else [str(value) for value in params],
+            'fingerprint': digest,
+            'normalized': normalized,
+            'plan': plan,
+        })
+
+class SlowQueryCaptures:
+    """Installs a `SlowQueryCapture` on every connection while active."""
+
+    def __init__(self, request):
+        self.request = request
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(SlowQueryCapture(self.request, connection)))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+class SlowQueryMiddleware(ExecuteWrapperMiddleware):
+    """
+    Opt-in: with `SLOW_QUERY_MS` set, records the queries of each request
+    slower than that, with the route and parameters, in `slow_queries`.
+    Listed last in `MIDDLEWARE`, so the sampled EXPLAINs stay out of the
+    timings of the other middleware.
+    """
+
+    def wrappers(self, request, state):
+        if not settings.SLOW_QUERY_MS:
+            return None
+        return SlowQueryCaptures(request)
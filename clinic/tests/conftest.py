@@ -0,0 +1,9 @@
+import pytest
+from django.core.cache import caches
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Test transactions are rolled back without sending signals, so cached
+    # responses must not leak from one test into the next.
+    for cache in caches.all():
+        cache.clear()
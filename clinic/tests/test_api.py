@@ -1,8 +1,10 @@
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 from decimal import Decimal
 from clinic.models import Owner, Pet, Appointment, Order, Species
+from clinic.serializers import OwnerSerializer, PetSerializer, AppointmentSerializer, OrderSerializer
 
 class ClinicAPITestCase(APITestCase):
     def setUp(self):
@@ -151,5 +153,83 @@ class ClinicAPITestCase(APITestCase):
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         self.assertTrue(Order.objects.filter(notes="Compra de vacina").exists())
 
-    
+class SerializerQueryCountTestCase(APITestCase):
+    """
+    Validating a batch costs one query per related/unique field, whatever
+    the batch size.
+    """
+    sizes = (1, 10, 50)
 
+    def setUp(self):
+        self.owners = [
+            Owner.objects.create(
+                name=f"Owner {i}",
+                cpf=f"0001112223{i}",
+                phone="11999990000",
+                email=f"owner{i}@example.com",
+                address="Rua Teste 1"
+            )
+            for i in range(3)
+        ]
+        self.pets = [
+            Pet.objects.create(name=f"Pet {i}", gender="M", species=Species.DOG, breed="Labrador", owner=owner)
+            for i, owner in enumerate(self.owners)
+        ]
+
+    def assertValidationQueries(self, serializer_class, payload, num):
+        serializer = serializer_class(data=payload, many=True)
+        with self.assertNumQueries(num):
+            self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.rejected, [])
+
+    def test_appointment_validation_is_constant(self):
+        for n in self.sizes:
+            payload = [
+                {"pet": str(self.pets[i % 3].id), "appointment_date": "2025-02-01T09:00:00Z", "reason": "Vacina"}
+                for i in range(n)
+            ]
+            self.assertValidationQueries(AppointmentSerializer, payload, 1)
+
+    def test_pet_validation_is_constant(self):
+        for n in self.sizes:
+            payload = [
+                {"name": f"Pet {i}", "gender": "F", "species": "c", "breed": "Siamese", "owner": str(self.owners[i % 3].id)}
+                for i in range(n)
+            ]
+            self.assertValidationQueries(PetSerializer, payload, 1)
+
+    def test_order_validation_is_constant(self):
+        for n in self.sizes:
+            payload = [{"owner": str(self.owners[i % 3].id), "total": "10.00"} for i in range(n)]
+            self.assertValidationQueries(OrderSerializer, payload, 1)
+
+    def test_owner_validation_is_constant(self):
+        # One query each for the cpf and email uniqueness checks.
+        for n in self.sizes:
+            payload = [
+                {
+                    "name": f"New Owner {i}",
+                    "cpf": f"{n:03d}{i:08d}",
+                    "phone": "11988887777",
+                    "email": f"new{n}-{i}@example.com",
+                    "address": "Rua Nova 10"
+                }
+                for i in range(n)
+            ]
+            self.assertValidationQueries(OwnerSerializer, payload, 2)
+
+    def test_related_objects_are_cached_for_the_request(self):
+        request = Request(APIRequestFactory().post('/'))
+        owner_id = str(self.owners[0].id)
+
+        pets = PetSerializer(
+            data=[{"name": "A", "gender": "F", "species": "c", "breed": "Siamese", "owner": owner_id}],
+            many=True,
+            context={'request': request}
+        )
+        with self.assertNumQueries(1):
+            self.assertTrue(pets.is_valid())
+
+        order = OrderSerializer(data={"owner": owner_id, "total": "10.00"}, context={'request': request})
+        with self.assertNumQueries(0):
+            self.assertTrue(order.is_valid())
@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic.models import Owner, Pet, Veterinarian, Appointment, Order, OrderItem, Species
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class AsyncReadPathTestCase(APITestCase):
+    """The async routes return the same JSON as the viewsets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owners = Owner.objects.bulk_create([
+            Owner(name=f"Owner {i:02d}", cpf=f"{i:011d}", phone="11999990000", email=f"owner{i}@example.com", address="-")
+            for i in range(12)
+        ])
+        cls.pets = Pet.objects.bulk_create([
+            Pet(name=f"Pet {i:02d}", gender="F", species=Species.CAT, breed="Siamese", owner=owner)
+            for i, owner in enumerate(cls.owners)
+        ])
+        vet = Veterinarian.objects.create(name="Dra. Ana")
+        cls.appointment = Appointment.objects.create(
+            pet=cls.pets[0], appointment_date="2025-01-06T10:00:00Z", reason="Visit", doctor="Dra. Ana",
+            veterinarian=vet, price=Decimal("100.00"),
+        )
+        cls.order = Order.objects.create(owner=cls.owners[0], total=Decimal("20.00"))
+        OrderItem.objects.create(
+            order=cls.order, position=0, name="Vacina", unit_price=Decimal("20.00"), line_total=Decimal("20.00"),
+            date=cls.order.date,
+        )
+
+    def assertSameJSON(self, name, args=(), params=None):
+        sync = self.client.get(reverse(name, args=args), params or {})
+        async_ = self.client.get(reverse(f"async-{name}", args=args), params or {})
+        self.assertEqual(async_.status_code, sync.status_code, async_.content)
+        self.assertEqual(async_['Content-Type'], 'application/json')
+        sync_data, async_data = sync.json(), async_.json()
+        for link in ('next', 'previous'):
+            if isinstance(sync_data, dict) and sync_data.get(link):
+                sync_data[link] = sync_data[link].replace('/api/', '/api/async/')
+        self.assertEqual(async_data, sync_data)
+        return async_data
+
+    def test_lists(self):
+        data = self.assertSameJSON('owner-list')
+        self.assertEqual(data['count'], 12)
+        self.assertTrue(data['next'].endswith('/api/async/owners/?page=2'))
+        data = self.assertSameJSON('owner-list', params={'page': 2})
+        self.assertTrue(data['previous'].endswith('/api/async/owners/'))
+        self.assertSameJSON('owner-list', params={'page': 'last', 'ordering': '-name'})
+        self.assertSameJSON('pet-list', params={'owner': self.owners[3].pk, 'expand': 'owner'})
+        self.assertSameJSON('appointment-list', params={'expand': 'pet,pet.owner,veterinarian'})
+        self.assertSameJSON('order-list', params={'expand': 'owner'})
+        with mock.patch.object(PageNumberPagination, 'page_size', None):
+            self.assertSameJSON('pet-list')
+
+    def test_details(self):
+        self.assertSameJSON('owner-detail', [self.owners[0].pk])
+        self.assertSameJSON('pet-detail', [self.pets[0].pk], {'expand': 'owner'})
+        self.assertSameJSON('appointment-detail', [self.appointment.pk], {'expand': 'pet.owner,veterinarian'})
+        data = self.assertSameJSON('order-detail', [self.order.pk])
+        self.assertEqual(len(data['items']), 1)
+
+    def test_errors(self):
+        self.assertSameJSON('owner-detail', [self.pets[0].pk])
+        self.assertSameJSON('owner-detail', ['not-a-uuid'])
+        data = self.assertSameJSON('owner-list', params={'page': 9})
+        self.assertEqual(data, {'detail': 'Invalid page.'})
+        self.assertSameJSON('pet-list', params={'expand': 'nope'})
+        self.assertSameJSON('pet-list', params={'owner': 'not-a-uuid'})
+
+    @override_settings(SERVER_TIMING=True)
+    async def test_served_under_asgi(self):
+        resp = await self.async_client.get(reverse('async-appointment-list'), {'expand': 'pet'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()['count'], 1)
+        # The middleware counted the queries run by the async ORM.
+        self.assertIn('desc="2 queries"', resp['Server-Timing'])
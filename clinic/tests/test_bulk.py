@@ -0,0 +1,133 @@
+import uuid
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic.models import Owner, Pet, Appointment, Order, Species
+
+class BulkCreateTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy",
+            gender="M",
+            species=Species.DOG,
+            breed="Labrador",
+            owner=self.owner
+        )
+        self.other_pet = Pet.objects.create(
+            name="Mittens",
+            gender="F",
+            species=Species.CAT,
+            breed="Siamese",
+            owner=self.owner
+        )
+
+    def appointment_payload(self, n):
+        pets = [self.pet, self.other_pet]
+        return [
+            {
+                "pet": str(pets[i % 2].id),
+                "appointment_date": f"2025-02-{i % 28 + 1:02d}T09:00:00Z",
+                "reason": f"Visit {i}",
+                "price": "80.00"
+            }
+            for i in range(n)
+        ]
+
+    def owner_payload(self, i):
+        return {
+            "name": f"Owner {i}",
+            "cpf": f"{i:011d}",
+            "phone": "11988887777",
+            "email": f"owner{i}@example.com",
+            "address": "Rua Nova 10"
+        }
+
+    def test_bulk_create_appointments(self):
+        url = reverse('appointment-bulk')
+
+        resp = self.client.post(url, self.appointment_payload(3), format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(resp.json()['created']), 3)
+        self.assertEqual(resp.json()['errors'], [])
+        self.assertEqual(Appointment.objects.count(), 3)
+
+    def test_bulk_create_query_count_does_not_grow_with_batch(self):
+        url = reverse('appointment-bulk')
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(url, self.appointment_payload(2), format='json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(url, self.appointment_payload(40), format='json')
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(Appointment.objects.count(), 42)
+
+    def test_bulk_create_reports_invalid_rows(self):
+        url = reverse('appointment-bulk')
+        payload = self.appointment_payload(3)
+        payload[1]["pet"] = str(uuid.uuid4())
+        del payload[2]["reason"]
+
+        resp = self.client.post(url, payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(resp.json()['created']), 1)
+        self.assertEqual([e['index'] for e in resp.json()['errors']], [1, 2])
+        self.assertIn('pet', resp.json()['errors'][0]['errors'])
+        self.assertIn('reason', resp.json()['errors'][1]['errors'])
+        self.assertEqual(Appointment.objects.count(), 1)
+
+    def test_bulk_create_atomic_rejects_whole_batch(self):
+        url = reverse('appointment-bulk')
+        payload = self.appointment_payload(3)
+        payload[2]["pet"] = str(uuid.uuid4())
+
+        resp = self.client.post(f"{url}?atomic=true", payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.json()['created'], [])
+        self.assertEqual([e['index'] for e in resp.json()['errors']], [2])
+        self.assertFalse(Appointment.objects.exists())
+
+    def test_bulk_create_owners_checks_uniqueness(self):
+        url = reverse('owner-bulk')
+        payload = [self.owner_payload(1), self.owner_payload(2), self.owner_payload(1)]
+        payload[1]["cpf"] = self.owner.cpf
+
+        resp = self.client.post(url, payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([e['index'] for e in resp.json()['errors']], [1, 2])
+        self.assertIn('cpf', resp.json()['errors'][0]['errors'])
+        self.assertEqual(Owner.objects.count(), 2)
+
+    def test_bulk_create_pets_and_orders(self):
+        pets = [
+            {"name": f"Pet {i}", "gender": "F", "species": "c", "breed": "Siamese", "owner": str(self.owner.id)}
+            for i in range(3)
+        ]
+        resp = self.client.post(reverse('pet-bulk'), pets, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Pet.objects.count(), 5)
+
+        orders = [{"owner": str(self.owner.id), "items": [], "total": "10.00"} for _ in range(3)]
+        resp = self.client.post(reverse('order-bulk'), orders, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.filter(total=Decimal("10.00")).count(), 3)
+
+    def test_bulk_create_requires_a_list(self):
+        resp = self.client.post(reverse('appointment-bulk'), self.appointment_payload(1)[0], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_all_invalid(self):
+        resp = self.client.post(reverse('appointment-bulk'), [{"reason": "x"}], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.json()['created'], [])
@@ -0,0 +1,114 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from datetime import datetime, timezone
+from clinic.models import Owner, Pet, Appointment, Species
+
+class ResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy",
+            gender="M",
+            species=Species.DOG,
+            breed="Labrador",
+            owner=self.owner
+        )
+
+    def test_second_get_is_a_hit(self):
+        url = reverse('owner-list')
+
+        resp = self.client.get(url, {'search': 'test', 'ordering': 'name'})
+        self.assertEqual(resp['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, {'ordering': 'name', 'search': 'test'})
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(cached.json(), resp.json())
+
+        resp = self.client.get(url, {'search': 'other'})
+        self.assertEqual(resp['X-Cache'], 'MISS')
+
+    def test_retrieve_is_cached_per_object(self):
+        other = Pet.objects.create(name="Rex", gender="M", species=Species.DOG, breed="Poodle", owner=self.owner)
+
+        self.client.get(reverse('pet-detail', args=[self.pet.id]))
+        resp = self.client.get(reverse('pet-detail', args=[other.id]))
+        self.assertEqual(resp['X-Cache'], 'MISS')
+        self.assertEqual(resp.json()['name'], "Rex")
+
+    def test_new_pet_invalidates_owner_scoped_pet_list(self):
+        url = reverse('pet-list')
+        params = {'owner': str(self.owner.id)}
+        self.assertEqual(self.client.get(url, params).json()['count'], 1)
+
+        resp = self.client.post(url, {
+            "name": "Mittens", "gender": "F", "species": "c", "breed": "Siamese", "owner": str(self.owner.id)
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        resp = self.client.get(url, params)
+        self.assertEqual(resp['X-Cache'], 'MISS')
+        self.assertEqual(resp.json()['count'], 2)
+
+    def test_owner_update_invalidates_expanded_pets(self):
+        url = reverse('pet-detail', args=[self.pet.id])
+        self.client.get(url, {'expand': 'owner'})
+
+        self.owner.name = "Renamed Owner"
+        self.owner.save()
+
+        resp = self.client.get(url, {'expand': 'owner'})
+        self.assertEqual(resp['X-Cache'], 'MISS')
+        self.assertEqual(resp.json()['owner']['name'], "Renamed Owner")
+
+    def test_appointment_invalidates_owner_summary(self):
+        url = reverse('owner-summary', args=[self.owner.id])
+        self.assertEqual(self.client.get(url).json()['appointment_count'], 0)
+
+        Appointment.objects.create(
+            pet=self.pet,
+            appointment_date=datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
+            reason="Checkup",
+            price=Decimal("100.00")
+        )
+        self.assertEqual(self.client.get(url).json()['appointment_count'], 1)
+        self.assertEqual(self.client.get(reverse('owner-list'))['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(reverse('owner-list'))['X-Cache'], 'HIT')
+
+    def test_bulk_create_invalidates(self):
+        url = reverse('owner-list')
+        self.assertEqual(self.client.get(url).json()['count'], 1)
+
+        self.client.post(reverse('owner-bulk'), [{
+            "name": "Bulk Owner",
+            "cpf": "00000000001",
+            "phone": "11988887777",
+            "email": "bulk@example.com",
+            "address": "Rua Nova 10"
+        }], format='json')
+        self.assertEqual(self.client.get(url).json()['count'], 2)
+
+    def test_stats(self):
+        url = reverse('owner-list')
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(url)
+
+        stats = self.client.get(reverse('cache-stats')).json()
+        self.assertEqual(stats['owner'], {'hits': 2, 'misses': 1, 'hit_ratio': 0.6667})
+        self.assertEqual(stats['pet'], {'hits': 0, 'misses': 0, 'hit_ratio': None})
+
+    @override_settings(API_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.client.get(reverse('owner-list'))
+        resp = self.client.get(reverse('owner-list'))
+        self.assertNotIn('X-Cache', resp)
@@ -0,0 +1,130 @@
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from datetime import datetime, timezone
+from clinic.models import Owner, Pet, Appointment, Species
+from clinic.serializers import OwnerSerializer, PetSerializer
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class ConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy",
+            gender="M",
+            species=Species.DOG,
+            breed="Labrador",
+            owner=self.owner
+        )
+
+    def test_detail_not_modified(self):
+        url = reverse('owner-detail', args=[self.owner.id])
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', resp)
+
+        with mock.patch.object(OwnerSerializer, 'to_representation') as to_representation:
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+        resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_changes_after_update(self):
+        url = reverse('owner-detail', args=[self.owner.id])
+        etag = self.client.get(url)['ETag']
+
+        self.owner.phone = "11999990009"
+        self.owner.save()
+
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()['phone'], "11999990009")
+        self.assertNotEqual(resp['ETag'], etag)
+
+    def test_expanded_detail_tracks_related_row(self):
+        url = reverse('pet-detail', args=[self.pet.id])
+        plain = self.client.get(url)['ETag']
+        expanded = self.client.get(url, {'expand': 'owner'})['ETag']
+        self.assertNotEqual(plain, expanded)
+
+        self.owner.name = "Renamed Owner"
+        self.owner.save()
+
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=plain)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        resp = self.client.get(url, {'expand': 'owner'}, HTTP_IF_NONE_MATCH=expanded)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified(self):
+        url = reverse('pet-list')
+        etag = self.client.get(url, {'species': 'd'})['ETag']
+
+        with mock.patch.object(PetSerializer, 'to_representation') as to_representation:
+            with self.assertNumQueries(1):
+                resp = self.client.get(url, {'species': 'd'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+        resp = self.client.get(url, {'species': 'c'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_list_changes_on_delete(self):
+        other = Pet.objects.create(name="Rex", gender="M", species=Species.DOG, breed="Poodle", owner=self.owner)
+        url = reverse('pet-list')
+        etag = self.client.get(url)['ETag']
+
+        other.delete()
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()['count'], 1)
+
+    def test_nested_expand_paths(self):
+        appointment = Appointment.objects.create(
+            pet=self.pet, appointment_date=datetime(2025, 1, 1, 10, tzinfo=timezone.utc), reason="Checkup"
+        )
+        params = {'expand': 'pet,pet.owner'}
+        for url in (reverse('appointment-list'), reverse('appointment-detail', args=[appointment.id])):
+            resp = self.client.get(url, params)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            etag = resp['ETag']
+
+            resp = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            self.owner.save()
+            resp = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_keyset_lists_are_not_validated(self):
+        resp = self.client.get(reverse('appointment-list'), {'pagination': 'cursor'})
+        self.assertNotIn('ETag', resp)
+
+class CachedConditionalGetTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+
+    def test_cached_entry_answers_without_queries(self):
+        url = reverse('owner-detail', args=[self.owner.id])
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp['ETag'], etag)
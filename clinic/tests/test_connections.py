@@ -0,0 +1,71 @@
+from unittest import skipUnless
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+from clinic.db.pooled.base import DatabaseWrapper, close_pools, pool_stats, render_pool_metrics
+
+@skipUnless(connection.vendor == 'postgresql', 'The pooled backend is PostgreSQL only')
+class PooledBackendTestCase(TestCase):
+    def setUp(self):
+        self.addCleanup(close_pools)
+
+    def pooled(self, **settings):
+        settings_dict = {
+            **connection.settings_dict,
+            'ENGINE': 'clinic.db.pooled',
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {'pool': {'min_size': 1, 'max_size': 2}},
+            **settings,
+        }
+        wrapper = DatabaseWrapper(settings_dict, alias='pooled')
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def backend_pid(self, wrapper):
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            return cursor.fetchone()[0]
+
+    def test_close_returns_the_connection_to_the_pool(self):
+        wrapper = self.pooled(OPTIONS={'pool': {'min_size': 1, 'max_size': 1}})
+        pid = self.backend_pid(wrapper)
+        stats = pool_stats()['pooled']
+        self.assertEqual(stats['pool_size'] - stats['pool_available'], 1)
+
+        wrapper.close()
+        self.assertIsNone(wrapper.connection)
+        stats = pool_stats()['pooled']
+        self.assertEqual(stats['pool_size'], stats['pool_available'])
+        # The next request gets the same server session back.
+        self.assertEqual(self.backend_pid(wrapper), pid)
+        self.assertEqual(pool_stats()['pooled']['requests_num'], 2)
+
+    def test_close_returns_the_connection_to_its_own_pool(self):
+        wrapper = self.pooled()
+        self.backend_pid(wrapper)
+        lender = wrapper.connection_pool
+        close_pools()
+        wrapper.close()
+        self.assertIsNone(wrapper.connection_pool)
+        self.assertEqual(lender.get_stats()['requests_num'], 1)
+        self.assertNotIn('pooled', pool_stats())
+
+    def test_metrics(self):
+        # A single-connection pool, so it cannot be growing in the background.
+        wrapper = self.pooled(OPTIONS={'pool': {'min_size': 1, 'max_size': 1}})
+        self.backend_pid(wrapper)
+        metrics = render_pool_metrics()
+        self.assertIn('# TYPE clinic_db_pool_connections gauge', metrics)
+        self.assertIn('clinic_db_pool_connections{database="pooled",state="checked_out"} 1', metrics)
+        self.assertIn('clinic_db_pool_max_connections{database="pooled"} 1', metrics)
+
+    def test_rejects_persistent_connections(self):
+        wrapper = self.pooled(CONN_MAX_AGE=60)
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.ensure_connection()
+
+    def test_pool_is_optional(self):
+        wrapper = self.pooled(OPTIONS={})
+        self.backend_pid(wrapper)
+        self.assertNotIn('pooled', pool_stats())
@@ -0,0 +1,102 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from clinic.models import Owner, Pet, Appointment, Order, Species
+
+class ExpandTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy",
+            gender="M",
+            species=Species.DOG,
+            breed="Labrador",
+            owner=self.owner
+        )
+        self.appointment = Appointment.objects.create(
+            pet=self.pet,
+            appointment_date=datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
+            reason="Checkup",
+            price=Decimal("100.00")
+        )
+
+    def add_appointments(self, n):
+        for i in range(n):
+            owner = Owner.objects.create(
+                name=f"Owner {i}",
+                cpf=f"{i + 1:011d}",
+                phone="11988887777",
+                email=f"owner{i}@example.com",
+                address="Rua Nova 10"
+            )
+            pet = Pet.objects.create(name=f"Pet {i}", gender="F", species=Species.CAT, breed="Siamese", owner=owner)
+            Appointment.objects.create(
+                pet=pet,
+                appointment_date=datetime(2025, 2, 1, tzinfo=timezone.utc) + timedelta(days=i),
+                reason="Vaccine",
+                price=Decimal("80.00")
+            )
+
+    def test_appointment_expands_pet_and_owner(self):
+        url = reverse('appointment-detail', args=[self.appointment.id])
+
+        resp = self.client.get(url, {'expand': 'pet,pet.owner'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()['pet']['name'], "Buddy")
+        self.assertEqual(resp.json()['pet']['owner']['cpf'], "00011122233")
+
+        resp = self.client.get(url, {'expand': 'pet'})
+        self.assertEqual(resp.json()['pet']['owner'], str(self.owner.id))
+
+        resp = self.client.get(url)
+        self.assertEqual(resp.json()['pet'], str(self.pet.id))
+
+    def test_pet_and_order_expand_owner(self):
+        order = Order.objects.create(owner=self.owner, items=[], total=Decimal("10.00"))
+
+        resp = self.client.get(reverse('pet-detail', args=[self.pet.id]), {'expand': 'owner'})
+        self.assertEqual(resp.json()['owner']['name'], "Test Owner")
+
+        resp = self.client.get(reverse('order-detail', args=[order.id]), {'expand': 'owner'})
+        self.assertEqual(resp.json()['owner']['name'], "Test Owner")
+
+    def test_unknown_expand_path(self):
+        resp = self.client.get(reverse('appointment-list'), {'expand': 'pet.vet'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('expand', resp.json())
+
+    def test_expanded_list_query_count_does_not_grow_with_page(self):
+        url = reverse('appointment-list')
+        params = {'expand': 'pet,pet.owner', 'pagination': 'cursor'}
+
+        with CaptureQueriesContext(connection) as small:
+            resp = self.client.get(url, {**params, 'page_size': 1})
+        self.assertEqual(len(resp.json()['results']), 1)
+
+        self.add_appointments(20)
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(url, {**params, 'page_size': 21})
+        self.assertEqual(len(resp.json()['results']), 21)
+        self.assertTrue(all(isinstance(row['pet']['owner'], dict) for row in resp.json()['results']))
+
+        self.assertEqual(len(small.captured_queries), 1)
+        self.assertEqual(len(large.captured_queries), 1)
+
+    def test_expand_is_ignored_on_create(self):
+        resp = self.client.post(
+            f"{reverse('appointment-list')}?expand=pet",
+            {"pet": str(self.pet.id), "appointment_date": "2025-03-01T09:00:00Z", "reason": "Visit", "price": "50.00"},
+            format='json'
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.json()['pet'], str(self.pet.id))
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from clinic.models import Owner, Pet, Appointment, Order, OrderItem, Species
+
+class ExportTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.buddy = Pet.objects.create(name="Buddy", gender="M", species=Species.DOG, breed="Labrador", owner=self.owner)
+        self.mittens = Pet.objects.create(name="Mittens", gender="F", species=Species.CAT, breed="Siamese", owner=self.owner)
+        for i in range(5):
+            Appointment.objects.create(
+                pet=self.buddy if i % 2 else self.mittens,
+                appointment_date=datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(days=i),
+                reason=f"Visit {i}",
+                notes="Line one,\nline \"two\"" if i == 0 else None,
+                price=Decimal("80.00")
+            )
+
+    def content(self, resp):
+        self.assertFalse(hasattr(resp, 'content'))
+        return b''.join(resp.streaming_content).decode()
+
+    def test_csv_export(self):
+        resp = self.client.get(reverse('appointment-export'))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('appointments.csv', resp['Content-Disposition'])
+
+        rows = list(csv.DictReader(io.StringIO(self.content(resp))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['price'], "80.00")
+        self.assertIn('Line one,\nline "two"', [row['notes'] for row in rows])
+
+    def test_export_honors_filters_and_search(self):
+        url = reverse('appointment-export')
+
+        resp = self.client.get(url, {'format': 'ndjson', 'pet': str(self.buddy.id)})
+        self.assertEqual(resp['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in self.content(resp).splitlines()]
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(all(row['pet'] == str(self.buddy.id) for row in rows))
+
+        resp = self.client.get(url, {'format': 'ndjson', 'search': 'Mittens'})
+        self.assertEqual(len(self.content(resp).splitlines()), 3)
+
+    def test_export_queries_do_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.content(self.client.get(reverse('appointment-export'), {'format': 'ndjson'}))
+        selects = [q for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1)
+
+    def test_order_export_includes_items(self):
+        order = Order.objects.create(owner=self.owner, total=Decimal("20.00"))
+        OrderItem.objects.create(
+            order=order, name="Vacina", quantity=2, unit_price=Decimal("10.00"), line_total=Decimal("20.00"), date=order.date
+        )
+
+        resp = self.client.get(reverse('order-export'), HTTP_ACCEPT='application/x-ndjson')
+        row = json.loads(self.content(resp))
+        self.assertEqual(row['items'], [{"name": "Vacina", "quantity": 2, "unit_price": "10.00", "line_total": "20.00"}])
+
+        rows = list(csv.DictReader(io.StringIO(self.content(self.client.get(reverse('order-export'))))))
+        self.assertEqual(json.loads(rows[0]['items'])[0]['name'], "Vacina")
+
+    def test_unknown_format(self):
+        resp = self.client.get(reverse('appointment-export'), {'format': 'xml'})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from datetime import date, datetime, timedelta, timezone
+from clinic.encoders import row_encoder
+from clinic.models import Owner, Pet, Veterinarian, Appointment, Order, OrderItem, Species
+from clinic.serializers import OwnerSummarySerializer
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class FastListTestCase(APITestCase):
+    """The fast list path returns the serializers' bytes, for every kind of list request."""
+
+    @classmethod
+    def setUpTestData(cls):
+        start = datetime(2025, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc)
+        names = ["Ana", "José Álvares", "Zoë   line", 'Quote " and \\ slash', "\U0001F436 Rex"]
+        owners = [
+            Owner.objects.create(
+                name=name, cpf=f"{i:011d}", phone="11999990000", email=f"o{i}@example.com", address="Rua\n1",
+            )
+            for i, name in enumerate(names)
+        ]
+        vet = Veterinarian.objects.create(name="Dra. Ana")
+        for i, owner in enumerate(owners):
+            pet = Pet.objects.create(
+                name=f"Pet {i}", gender="MF"[i % 2], species=[Species.DOG, Species.CAT][i % 2], breed="SRD",
+                birth_date=date(2020, 1, i + 1) if i % 2 else None, owner=owner,
+            )
+            for j in range(3):
+                Appointment.objects.create(
+                    pet=pet, appointment_date=start + timedelta(days=i, hours=j), duration_minutes=15 * (j + 1),
+                    reason="Visit ✓", notes=None if j else "n", veterinarian=vet if j == 1 else None,
+                    doctor=vet.name if j == 1 else None, price=[Decimal("0"), Decimal("12.5"), Decimal("99999.99")][j],
+                )
+            order = Order.objects.create(owner=owner, total=Decimal("3.30") if i % 2 else Decimal("0"), notes="½")
+            if i % 2:
+                OrderItem.objects.bulk_create([
+                    OrderItem(order=order, position=position, name=f"Item {position}", quantity=position + 1,
+                              unit_price=Decimal("1.10"), line_total=Decimal("1.10") * (position + 1), date=order.date)
+                    for position in (1, 0)
+                ])
+
+    def get_both(self, name, params=None, **headers):
+        url = reverse(name)
+        with override_settings(API_FAST_LIST=False):
+            slow = self.client.get(url, params or {}, **headers)
+        to_representation = serializers.ModelSerializer.to_representation
+        with mock.patch.object(
+            serializers.ModelSerializer, 'to_representation', autospec=True, side_effect=to_representation,
+        ) as to_representation:
+            fast = self.client.get(url, params or {}, **headers)
+        return slow, fast, to_representation.called
+
+    def assertSameBody(self, name, params=None):
+        slow, fast, serialized = self.get_both(name, params)
+        self.assertEqual(slow.status_code, 200, slow.content)
+        self.assertEqual(fast.content, slow.content, f"{name} {params}")
+        self.assertFalse(serialized, f"{name} {params} did not take the fast path")
+
+    def test_lists_match_the_serializers_byte_for_byte(self):
+        self.assertSameBody('owner-list')
+        self.assertSameBody('owner-list', {'search': 'jos', 'ordering': 'created_at'})
+        self.assertSameBody('pet-list', {'ordering': '-birth_date'})
+        self.assertSameBody('pet-list', {'species': Species.CAT})
+        self.assertSameBody('appointment-list', {'page': 2})
+        self.assertSameBody('appointment-list', {'pagination': 'cursor', 'page_size': 4, 'ordering': 'created_at'})
+        self.assertSameBody('order-list')
+        self.assertSameBody('order-list', {'pagination': 'cursor', 'page_size': 2})
+        with mock.patch.object(PageNumberPagination, 'page_size', 100):
+            self.assertSameBody('appointment-list')
+            self.assertSameBody('order-list', {'ordering': '-date'})
+
+    def test_cursor_links_lead_to_the_same_pages(self):
+        slow, fast, _ = self.get_both('appointment-list', {'pagination': 'cursor', 'page_size': 4})
+        following = fast.json()['next']
+        with override_settings(API_FAST_LIST=False):
+            slow = self.client.get(following)
+        self.assertEqual(self.client.get(following).content, slow.content)
+
+    def test_other_requests_take_the_regular_path(self):
+        for name, params in (('appointment-list', {'expand': 'pet'}), ('owner-summaries', {})):
+            slow, fast, serialized = self.get_both(name, params)
+            self.assertEqual(fast.content, slow.content)
+            self.assertTrue(serialized, name)
+        self.assertIsNone(row_encoder(OwnerSummarySerializer))
+
+    def test_indented_json(self):
+        slow, fast, _ = self.get_both('order-list', HTTP_ACCEPT='application/json; indent=2')
+        self.assertEqual(fast.content, slow.content)
+        self.assertIn(b'\n  "count"', fast.content)
@@ -0,0 +1,63 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic.models import Owner, Pet, Appointment, Order, Species
+
+class RangeFilterTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.other_owner = Owner.objects.create(
+            name="Other Owner",
+            cpf="99988877766",
+            phone="11988887777",
+            email="other@example.com",
+            address="Rua Teste 2"
+        )
+        self.pet = Pet.objects.create(name="Buddy", gender="M", species=Species.DOG, breed="Labrador", owner=self.owner)
+        other_pet = Pet.objects.create(name="Mittens", gender="F", species=Species.CAT, breed="Siamese", owner=self.other_owner)
+        self.january = Appointment.objects.create(
+            pet=self.pet, appointment_date="2025-01-10T10:00:00Z", reason="Checkup", doctor="Dra. Ana", price=Decimal("80.00")
+        )
+        self.february = Appointment.objects.create(
+            pet=self.pet, appointment_date="2025-02-10T10:00:00Z", reason="Vaccine", doctor="Dr. Paulo", price=Decimal("150.00")
+        )
+        self.march = Appointment.objects.create(
+            pet=other_pet, appointment_date="2025-03-10T10:00:00Z", reason="Surgery", doctor="Dra. Ana", price=Decimal("900.00")
+        )
+
+    def appointment_ids(self, params):
+        resp = self.client.get(reverse('appointment-list'), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        return {row['id'] for row in resp.json()['results']}
+
+    def test_appointment_date_range(self):
+        ids = self.appointment_ids({'appointment_date__gte': '2025-02-01T00:00:00Z', 'appointment_date__lt': '2025-03-10T10:00:00Z'})
+        self.assertEqual(ids, {str(self.february.id)})
+
+    def test_appointment_doctor_price_and_owner(self):
+        self.assertEqual(self.appointment_ids({'doctor': 'Dra. Ana'}), {str(self.january.id), str(self.march.id)})
+        self.assertEqual(self.appointment_ids({'price__gte': '100', 'price__lte': '500'}), {str(self.february.id)})
+        self.assertEqual(
+            self.appointment_ids({'owner': str(self.owner.id), 'doctor': 'Dra. Ana'}), {str(self.january.id)}
+        )
+
+    def test_invalid_filter_value(self):
+        resp = self.client.get(reverse('appointment-list'), {'owner': 'not-a-uuid'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('owner', resp.json())
+
+    def test_order_date_and_total_range(self):
+        cheap = Order.objects.create(owner=self.owner, total=Decimal("20.00"))
+        Order.objects.create(owner=self.owner, total=Decimal("300.00"))
+        Order.objects.filter(pk=cheap.pk).update(date="2025-01-15T12:00:00Z")
+
+        resp = self.client.get(reverse('order-list'), {'total__lte': '50', 'date__lt': '2025-02-01T00:00:00Z'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in resp.json()['results']], [str(cheap.id)])
@@ -0,0 +1,110 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic.models import Owner, Pet, Appointment, Order, Species
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN plans are only checked on PostgreSQL')
+class ListIndexPlanTestCase(APITestCase):
+    """
+    Every filter/ordering path exposed by the list endpoints must be served
+    by an index. Sequential scans and explicit sorts are disabled for the
+    EXPLAIN, so the planner only falls back to them when no index matches.
+    """
+
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy",
+            gender="M",
+            species=Species.DOG,
+            breed="Labrador",
+            owner=self.owner
+        )
+        Appointment.objects.create(
+            pet=self.pet,
+            appointment_date="2025-01-01T10:00:00Z",
+            reason="Checkup",
+            doctor="Dra. Ana",
+            price=Decimal("120.00")
+        )
+        Order.objects.create(owner=self.owner, total=Decimal("50.00"))
+        Order.objects.update(date="2025-01-15T12:00:00Z")
+
+    def list_plan(self, url, params):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+
+        # The page query is the only one with an ORDER BY; COUNT(*) is not.
+        sql = next(q['sql'] for q in ctx.captured_queries if 'ORDER BY' in q['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_sort = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def assertIndexPlan(self, url, params=None, sorted_by_index=True):
+        plan = self.list_plan(url, params or {})
+        self.assertNotIn('Seq Scan', plan, msg=f"{url} {params}:\n{plan}")
+        if sorted_by_index:
+            self.assertNotIn('Sort', plan, msg=f"{url} {params}:\n{plan}")
+
+    def test_owner_list_plans(self):
+        url = reverse('owner-list')
+        self.assertIndexPlan(url)
+        self.assertIndexPlan(url, {'ordering': '-created_at'})
+        self.assertIndexPlan(url, {'name': 'Test Owner'})
+
+    def test_pet_list_plans(self):
+        url = reverse('pet-list')
+        self.assertIndexPlan(url)
+        self.assertIndexPlan(url, {'owner': self.owner.id})
+        self.assertIndexPlan(url, {'species': Species.DOG})
+        self.assertIndexPlan(url, {'gender': 'M'})
+        self.assertIndexPlan(url, {'ordering': 'birth_date'})
+        self.assertIndexPlan(url, {'ordering': '-created_at'})
+
+    def test_appointment_list_plans(self):
+        url = reverse('appointment-list')
+        self.assertIndexPlan(url)
+        self.assertIndexPlan(url, {'ordering': '-appointment_date'})
+        self.assertIndexPlan(url, {'pet': self.pet.id})
+        self.assertIndexPlan(url, {'pet': self.pet.id, 'ordering': '-appointment_date'})
+        self.assertIndexPlan(url, {'pagination': 'cursor'})
+        self.assertIndexPlan(url, {'pagination': 'cursor', 'pet': self.pet.id})
+        self.assertIndexPlan(url, {'ordering': '-created_at'})
+
+    def test_appointment_range_filter_plans(self):
+        url = reverse('appointment-list')
+        week = {'appointment_date__gte': '2025-01-01T00:00:00Z', 'appointment_date__lt': '2025-01-08T00:00:00Z'}
+        self.assertIndexPlan(url, week)
+        self.assertIndexPlan(url, {**week, 'pet': self.pet.id})
+        self.assertIndexPlan(url, {**week, 'doctor': 'Dra. Ana', 'ordering': '-appointment_date'})
+        self.assertIndexPlan(url, {'doctor': 'Dra. Ana', 'pagination': 'cursor'})
+        # The owner's appointments come from several pets' index ranges and
+        # are merged with a (small) sort.
+        self.assertIndexPlan(url, {**week, 'owner': self.owner.id}, sorted_by_index=False)
+        self.assertIndexPlan(url, {'price__gte': '100', 'price__lte': '120'}, sorted_by_index=False)
+
+    def test_order_list_plans(self):
+        url = reverse('order-list')
+        self.assertIndexPlan(url)
+        self.assertIndexPlan(url, {'ordering': '-date'})
+        self.assertIndexPlan(url, {'owner': self.owner.id})
+        self.assertIndexPlan(url, {'owner': self.owner.id, 'ordering': '-date'})
+        self.assertIndexPlan(url, {'pagination': 'cursor'})
+        self.assertIndexPlan(url, {'pagination': 'cursor', 'owner': self.owner.id})
+        self.assertIndexPlan(url, {'ordering': '-created_at'})
+        self.assertIndexPlan(url, {'date__gte': '2025-01-01T00:00:00Z', 'date__lt': '2025-02-01T00:00:00Z'})
+        self.assertIndexPlan(url, {'owner': self.owner.id, 'date__gte': '2025-01-01T00:00:00Z'})
+        self.assertIndexPlan(url, {'total__gte': '40', 'total__lte': '60'}, sorted_by_index=False)
@@ -0,0 +1,79 @@
+import json
+import re
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic.instrumentation import metrics
+from clinic.models import Owner, Pet, Appointment, Species
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class InstrumentationTestCase(APITestCase):
+    def setUp(self):
+        metrics.reset()
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        pet = Pet.objects.create(name="Buddy", gender="M", species=Species.DOG, breed="Labrador", owner=self.owner)
+        Appointment.objects.create(
+            pet=pet, appointment_date="2025-01-06T10:00:00Z", reason="Visit", doctor="Dra. Ana", price=Decimal("100.00"),
+        )
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        resp = self.client.get(reverse('appointment-list'), {'expand': 'pet.owner'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        timings = dict(re.findall(r'(\w+);dur=([\d.]+)', resp['Server-Timing']))
+        self.assertEqual(set(timings), {'db', 'serialize', 'render', 'app', 'total'})
+        self.assertGreater(float(timings['serialize']), 0)
+        self.assertGreater(float(timings['render']), 0)
+        self.assertAlmostEqual(
+            sum(float(timings[name]) for name in ('db', 'serialize', 'render', 'app')), float(timings['total']), delta=0.1,
+        )
+        self.assertRegex(resp['Server-Timing'], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_can_be_disabled(self):
+        resp = self.client.get(reverse('owner-list'))
+        self.assertNotIn('Server-Timing', resp)
+
+    def test_structured_log_line(self):
+        with self.assertLogs('clinic.requests', 'INFO') as logs:
+            self.client.get(reverse('owner-detail', args=[self.owner.pk]))
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(line['route'], 'owner-detail')
+        self.assertEqual(line['status'], 200)
+        self.assertEqual(line['queries'], 1)
+        self.assertEqual({'db_ms', 'serialize_ms', 'render_ms', 'app_ms', 'total_ms'} - set(line), set())
+
+    def test_metrics_endpoint(self):
+        for _ in range(2):
+            self.client.get(reverse('owner-list'))
+        self.client.get('/api/nowhere/')
+
+        with override_settings(METRICS_ALLOWED_IPS=['127.0.0.1']):
+            resp = self.client.get(reverse('metrics'))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp['Content-Type'].startswith('text/plain'))
+        body = resp.content.decode()
+        self.assertIn('# TYPE clinic_request_duration_seconds histogram', body)
+        self.assertIn('clinic_request_duration_seconds_count{method="GET",route="owner-list",status="200"} 2', body)
+        self.assertIn('clinic_request_duration_seconds_bucket{method="GET",route="owner-list",status="200",le="+Inf"} 2', body)
+        self.assertIn('clinic_request_queries_count{method="GET",route="unmatched",status="404"} 1', body)
+
+    def test_metrics_endpoint_is_restricted(self):
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(METRICS_ALLOWED_IPS=['10.0.0.5']):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+            self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.5').status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(User.objects.create_user('ops', is_staff=True))
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
@@ -0,0 +1,122 @@
+import importlib
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from datetime import datetime, timezone
+from clinic.models import Owner, Order, OrderItem
+
+backfill = importlib.import_module('clinic.migrations.0005_orderitem')
+
+class OrderItemTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+
+    def order_payload(self, *items):
+        return {
+            "owner": str(self.owner.id),
+            "items": [
+                {"name": name, "quantity": quantity, "unit_price": price, "line_total": str(Decimal(price) * quantity)}
+                for name, quantity, price in items
+            ]
+        }
+
+    def test_create_order_with_items(self):
+        resp = self.client.post(
+            reverse('order-list'), self.order_payload(("Vacina", 2, "100.00"), ("Ração", 1, "50.00")), format='json'
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['name'] for item in resp.json()['items']], ["Vacina", "Ração"])
+
+        order = Order.objects.get(pk=resp.json()['id'])
+        items = list(order.order_items.all())
+        self.assertEqual([(item.position, item.quantity) for item in items], [(0, 2), (1, 1)])
+        self.assertEqual(items[0].date, order.date)
+
+        resp = self.client.get(reverse('order-detail', args=[order.id]))
+        self.assertEqual(resp.json()['items'][0], {
+            "name": "Vacina", "quantity": 2, "unit_price": "100.00", "line_total": "200.00"
+        })
+
+    def test_items_are_fetched_without_joining_orders(self):
+        self.client.post(reverse('order-list'), self.order_payload(("Vacina", 1, "10.00")), format='json')
+        for fast in (True, False):
+            with self.settings(API_FAST_LIST=fast, API_CACHE_TIMEOUT=0), CaptureQueriesContext(connection) as queries:
+                resp = self.client.get(reverse('order-list'))
+            self.assertEqual(resp.json()['results'][0]['items'][0]['name'], "Vacina")
+            item_queries = [query['sql'] for query in queries if 'FROM "clinic_orderitem"' in query['sql']]
+            self.assertEqual(len(item_queries), 1)
+            self.assertNotIn('JOIN', item_queries[0])
+
+    def test_invalid_item(self):
+        payload = self.order_payload(("Vacina", 1, "10.00"))
+        del payload["items"][0]["name"]
+        resp = self.client.post(reverse('order-list'), payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('items', resp.json())
+
+    def test_bulk_orders_write_items_in_one_insert(self):
+        url = reverse('order-bulk')
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(url, [self.order_payload(("Vacina", 1, "10.00"))], format='json')
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.post(
+                url, [self.order_payload(("Vacina", 1, "10.00"), ("Coleira", 3, "5.00")) for _ in range(20)], format='json'
+            )
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(resp.json()['created'][5]['items']), 2)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(OrderItem.objects.count(), 41)
+
+    def test_product_sales(self):
+        orders = [
+            (datetime(2025, 1, 10, tzinfo=timezone.utc), [("Vacina", 2, "100.00"), ("Ração", 1, "50.00")]),
+            (datetime(2025, 2, 10, tzinfo=timezone.utc), [("Vacina", 1, "100.00")]),
+            (datetime(2025, 2, 11, tzinfo=timezone.utc), [("Ração", 4, "50.00")]),
+        ]
+        for date, items in orders:
+            order = Order.objects.create(owner=self.owner, total=Decimal("0.00"))
+            OrderItem.objects.bulk_create([
+                OrderItem(
+                    order=order, position=position, name=name, quantity=quantity,
+                    unit_price=Decimal(price), line_total=Decimal(price) * quantity, date=date
+                )
+                for position, (name, quantity, price) in enumerate(items)
+            ])
+        url = reverse('product-sales')
+
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()['results'], [
+            {"name": "Ração", "quantity": 5, "revenue": "250.00", "orders": 2},
+            {"name": "Vacina", "quantity": 3, "revenue": "300.00", "orders": 2},
+        ])
+
+        resp = self.client.get(url, {
+            'name': 'Vacina', 'date__gte': '2025-02-01T00:00:00Z', 'date__lt': '2025-03-01T00:00:00Z'
+        })
+        self.assertEqual(resp.json()['results'], [{"name": "Vacina", "quantity": 1, "revenue": "100.00", "orders": 1}])
+
+    def test_backfill_rows(self):
+        order = SimpleNamespace(pk="o1", date="d", items=[
+            {"name": "Ração", "quantity": 2, "unit_price": 50.005, "line_total": 100.01},
+            "not an item",
+            {"name": "Vacina", "quantity": "x", "unit_price": 10},
+            {"quantity": 1},
+        ])
+        rows = list(backfill.item_rows(order))
+        self.assertEqual([(row["position"], row["name"], row["quantity"]) for row in rows], [(0, "Ração", 2), (2, "Vacina", 1)])
+        self.assertEqual(rows[0]["unit_price"], Decimal("50.01"))
+        self.assertEqual(rows[1]["line_total"], Decimal("10.00"))
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic.models import Owner, Pet, Appointment, Order, Species
+
+class KeysetPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy",
+            gender="M",
+            species=Species.DOG,
+            breed="Labrador",
+            owner=self.owner
+        )
+
+        # Three appointments per timestamp so pages split inside a tie.
+        start = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+        Appointment.objects.bulk_create([
+            Appointment(
+                pet=self.pet,
+                appointment_date=start + timedelta(days=i // 3),
+                reason=f"Visit {i}",
+                price=Decimal("100.00")
+            )
+            for i in range(20)
+        ])
+        for i in range(7):
+            Order.objects.create(owner=self.owner, total=Decimal(i))
+
+    def walk(self, url, params):
+        ids, pages = [], 0
+        resp = self.client.get(url, params)
+        while True:
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            body = resp.json()
+            self.assertNotIn('count', body)
+            ids.extend(obj['id'] for obj in body['results'])
+            pages += 1
+            if body['next'] is None:
+                return ids, pages, body
+            resp = self.client.get(body['next'])
+
+    def test_default_pagination_is_unchanged(self):
+        resp = self.client.get(reverse('appointment-list'))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()['count'], 20)
+
+    def test_cursor_walks_every_appointment_once(self):
+        ids, pages, _ = self.walk(reverse('appointment-list'), {'pagination': 'cursor', 'page_size': 4})
+
+        expected = [
+            str(pk) for pk in Appointment.objects.order_by('appointment_date', 'id').values_list('id', flat=True)
+        ]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 5)
+
+    def test_cursor_follows_ordering_filter(self):
+        ids, _, _ = self.walk(
+            reverse('appointment-list'),
+            {'pagination': 'cursor', 'page_size': 6, 'ordering': '-appointment_date'}
+        )
+
+        expected = [
+            str(pk) for pk in Appointment.objects.order_by('-appointment_date', '-id').values_list('id', flat=True)
+        ]
+        self.assertEqual(ids, expected)
+
+    def test_cursor_previous_link(self):
+        url = reverse('order-list')
+        first = self.client.get(url, {'pagination': 'cursor', 'page_size': 3}).json()
+        second = self.client.get(first['next']).json()
+        back = self.client.get(second['previous']).json()
+
+        self.assertEqual(
+            [obj['id'] for obj in back['results']],
+            [obj['id'] for obj in first['results']]
+        )
+        self.assertIsNone(back['previous'])
+
+    def test_cursor_page_skips_count_and_offset(self):
+        first = self.client.get(reverse('appointment-list'), {'pagination': 'cursor', 'page_size': 4}).json()
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(first['next'])
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]['sql']
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_invalid_cursor(self):
+        resp = self.client.get(reverse('appointment-list'), {'cursor': 'cD0yMDI1LTAxLTAxfG5vdC1hLXV1aWQ='})
+
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
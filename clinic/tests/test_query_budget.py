@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic import rollups
+from clinic.models import Owner, Pet, Veterinarian, Appointment, Order, OrderItem, Species
+from clinic.querybudget import QueryRecorder
+from clinic.urls import QUERY_BUDGETS
+
+ROWS = 100
+PAGE_SIZES = (1, 10, 100)
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class QueryBudgetTestCase(APITestCase):
+    """
+    Every GET endpoint stays within its `QUERY_BUDGETS` entry, and a list
+    runs the same number of queries for 1-, 10- and 100-row pages, so an
+    N+1 fails here instead of in production.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        owners = Owner.objects.bulk_create([
+            Owner(name=f"Owner {i}", cpf=f"{i:011d}", phone="11999990000", email=f"owner{i}@example.com", address="-")
+            for i in range(ROWS)
+        ])
+        pets = Pet.objects.bulk_create([
+            Pet(name=f"Pet {i}", gender="M", species=Species.DOG, breed="Beagle", owner=owner)
+            for i, owner in enumerate(owners)
+        ])
+        vets = Veterinarian.objects.bulk_create([Veterinarian(name=f"Vet {i}") for i in range(ROWS)])
+        Appointment.objects.bulk_create([
+            Appointment(
+                pet=pet, appointment_date=f"2025-01-{i % 28 + 1:02d}T10:00:00Z", reason="Visit",
+                doctor=vet.name, veterinarian=vet, price=Decimal("100.00"),
+            )
+            for i, (pet, vet) in enumerate(zip(pets, vets))
+        ])
+        orders = Order.objects.bulk_create([Order(owner=owner, total=Decimal("20.00")) for owner in owners])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, position=position, name=f"Product {i}", unit_price=Decimal("10.00"),
+                      line_total=Decimal("10.00"), date=order.date)
+            for i, order in enumerate(orders)
+            for position in range(2)
+        ])
+        rollups.rebuild()
+        cls.owner, cls.pet, cls.vet = owners[0], pets[0], vets[0]
+        cls.appointment, cls.order = Appointment.objects.first(), orders[0]
+
+    def count_queries(self, url, params):
+        with QueryRecorder() as recorder:
+            resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return len(recorder)
+
+    def assertListBudget(self, name, params=None, cursor=False):
+        params = dict(params or {})
+        counts = {}
+        for size in PAGE_SIZES:
+            if cursor:
+                counts[size] = self.count_queries(reverse(name), {**params, 'pagination': 'cursor', 'page_size': size})
+            else:
+                with mock.patch.object(PageNumberPagination, 'page_size', size):
+                    counts[size] = self.count_queries(reverse(name), params)
+        self.assertEqual(len(set(counts.values())), 1, f"{name} {params}: queries grow with the page size: {counts}")
+        self.assertLessEqual(counts[PAGE_SIZES[0]], QUERY_BUDGETS[name], f"{name} {params}: over budget")
+
+    def assertDetailBudget(self, name, pk, params=None):
+        count = self.count_queries(reverse(name, args=[pk]), params or {})
+        self.assertLessEqual(count, QUERY_BUDGETS[name], f"{name} {params}: over budget")
+
+    def test_list_budgets(self):
+        self.assertListBudget('owner-list')
+        self.assertListBudget('owner-summaries')
+        self.assertListBudget('pet-list')
+        self.assertListBudget('pet-list', {'expand': 'owner'})
+        self.assertListBudget('veterinarian-list')
+        self.assertListBudget('appointment-list')
+        self.assertListBudget('appointment-list', {'expand': 'pet,pet.owner,veterinarian'})
+        self.assertListBudget('appointment-list', {'expand': 'pet.owner'}, cursor=True)
+        self.assertListBudget('order-list')
+        self.assertListBudget('order-list', {'expand': 'owner'}, cursor=True)
+        self.assertListBudget('product-sales')
+        self.assertListBudget('revenue-report', {'from': '2025-01-01', 'to': '2026-01-01', 'group_by': 'doctor'})
+
+    def test_detail_budgets(self):
+        self.assertDetailBudget('owner-detail', self.owner.pk)
+        self.assertDetailBudget('owner-summary', self.owner.pk)
+        self.assertDetailBudget('pet-detail', self.pet.pk, {'expand': 'owner'})
+        self.assertDetailBudget('veterinarian-detail', self.vet.pk)
+        self.assertDetailBudget('appointment-detail', self.appointment.pk, {'expand': 'pet,pet.owner,veterinarian'})
+        self.assertDetailBudget('order-detail', self.order.pk, {'expand': 'owner'})
+        Appointment.objects.filter(pk=self.appointment.pk).update(veterinarian=None)
+        self.assertDetailBudget('appointment-detail', self.appointment.pk, {'expand': 'veterinarian'})
+
+    def test_middleware_logs_requests_over_budget(self):
+        with mock.patch.dict(QUERY_BUDGETS, {'owner-list': 1}), self.assertLogs('clinic.querybudget', 'WARNING') as logs:
+            self.client.get(reverse('owner-list'))
+        self.assertIn("over its budget of 1", logs.output[0])
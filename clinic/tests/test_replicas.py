@@ -0,0 +1,62 @@
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from clinic import cache, routers
+from clinic.models import Owner
+
+@override_settings(DATABASE_REPLICAS=['replica'], DB_REPLICA_STICKY_SECONDS=10)
+class ReplicaRoutingTestCase(SimpleTestCase):
+    def route(self, method, path, status=200, cookies=None):
+        """The alias owners would be read from while serving the request, and the response."""
+        seen = []
+
+        def view(request):
+            seen.append(routers.ReplicaRouter().db_for_read(Owner))
+            return HttpResponse(status=status)
+
+        request = getattr(RequestFactory(), method)(path)
+        request.COOKIES.update(cookies or {})
+        response = routers.ReplicaMiddleware(view)(request)
+        return seen[0], response
+
+    def test_safe_api_requests_read_a_replica(self):
+        self.assertEqual(self.route('get', reverse('owner-list') + '?search=ana')[0], 'replica')
+        self.assertEqual(self.route('head', reverse('revenue-report'))[0], 'replica')
+        self.assertEqual(self.route('get', reverse('async-pet-list'))[0], 'replica')
+        self.assertIsNone(self.route('get', '/admin/')[0])
+        self.assertIsNone(self.route('get', '/api/nowhere/')[0])
+        self.assertIsNone(routers.ReplicaRouter().db_for_read(Owner))
+
+    def test_writes_stick_the_client_to_the_primary(self):
+        alias, response = self.route('post', reverse('owner-list'), status=201)
+        self.assertIsNone(alias)
+        self.assertEqual(response.cookies[routers.STICKY_COOKIE]['max-age'], 10)
+        self.assertEqual(routers.ReplicaRouter().db_for_write(Owner), DEFAULT_DB_ALIAS)
+
+        alias, _ = self.route('get', reverse('owner-list'), cookies={routers.STICKY_COOKIE: '1'})
+        self.assertIsNone(alias)
+
+        _, response = self.route('post', reverse('owner-list'), status=400)
+        self.assertNotIn(routers.STICKY_COOKIE, response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertIsNone(self.route('get', reverse('owner-list'))[0])
+        self.assertNotIn(routers.STICKY_COOKIE, self.route('post', reverse('owner-list'), status=201)[1].cookies)
+
+# The primary stands in for the replica, so the routed queries can run.
+@override_settings(DATABASE_REPLICAS=[DEFAULT_DB_ALIAS], API_CACHE_TIMEOUT=300)
+class ReplicaLagTestCase(APITestCase):
+    def test_responses_are_not_cached_while_a_replica_may_lag(self):
+        Owner.objects.create(name="Ana", cpf="00011122233", phone="11999990000", email="ana@example.com", address="-")
+        self.assertTrue(cache.recent_write())
+        url = reverse('owner-list')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+        caches['default'].delete("clinic:last-write")
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
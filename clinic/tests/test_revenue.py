@@ -0,0 +1,109 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic import rollups
+from clinic.models import Owner, Pet, Appointment, Order, RevenueDirtyDay, RevenueRollup, Species
+
+class RevenueReportTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.dog = Pet.objects.create(name="Buddy", gender="M", species=Species.DOG, breed="Labrador", owner=self.owner)
+        self.cat = Pet.objects.create(name="Mittens", gender="F", species=Species.CAT, breed="Siamese", owner=self.owner)
+        # Saves mark their days once the transaction commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.appointment(self.dog, "2025-01-06T10:00:00Z", "Dra. Ana", "100.00")
+            self.appointment(self.cat, "2025-01-06T15:00:00Z", "Dra. Ana", "50.00")
+            self.appointment(self.dog, "2025-01-08T10:00:00Z", "Dr. Paulo", "80.00")
+            self.appointment(self.cat, "2025-02-03T10:00:00Z", "Dr. Paulo", "70.00")
+            order = Order.objects.create(owner=self.owner, total=Decimal("30.00"))
+        # Backdate the order; the queryset update marks nothing, so move
+        # the mark made on save by hand.
+        Order.objects.filter(pk=order.pk).update(date="2025-01-07T12:00:00Z")
+        RevenueDirtyDay.objects.filter(day=timezone.localdate()).delete()
+        rollups.mark_days([date(2025, 1, 7)])
+        self.url = reverse('revenue-report')
+
+    def appointment(self, pet, when, doctor, price):
+        return Appointment.objects.create(pet=pet, appointment_date=when, reason="Visit", doctor=doctor, price=Decimal(price))
+
+    def report(self, **params):
+        resp = self.client.get(self.url, {'from': '2025-01-01', 'to': '2025-03-01', **params})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        return resp.json()['results']
+
+    def test_writes_mark_days_and_refresh_clears_them(self):
+        self.assertEqual(
+            set(RevenueDirtyDay.objects.values_list('day', flat=True)),
+            {date(2025, 1, 6), date(2025, 1, 7), date(2025, 1, 8), date(2025, 2, 3)},
+        )
+        self.assertEqual(rollups.refresh(), (4, 5))
+        self.assertFalse(RevenueDirtyDay.objects.exists())
+        self.assertEqual(rollups.refresh(), (0, 0))
+
+    def test_report_reads_rollups(self):
+        self.assertEqual(self.report(), [])
+        call_command('refresh_revenue', stdout=StringIO())
+
+        rows = self.report(bucket='month')
+        self.assertEqual([(row['bucket'], row['revenue']) for row in rows], [("2025-01-01", "260.00"), ("2025-02-01", "70.00")])
+        self.assertEqual(rows[0]['appointments'], 3)
+        self.assertEqual(rows[0]['orders'], 1)
+        self.assertNotIn('doctor', rows[0])
+
+        rows = self.report(bucket='week', group_by='doctor')
+        self.assertEqual(
+            [(row['bucket'], row['doctor'], row['revenue']) for row in rows],
+            [
+                ("2025-01-06", None, "30.00"),
+                ("2025-01-06", "Dr. Paulo", "80.00"),
+                ("2025-01-06", "Dra. Ana", "150.00"),
+                ("2025-02-03", "Dr. Paulo", "70.00"),
+            ],
+        )
+
+        rows = self.report(to='2025-01-07', group_by='species')
+        self.assertEqual([(row['species'], row['appointment_revenue']) for row in rows], [("c", "50.00"), ("d", "100.00")])
+
+    def test_moves_and_deletes_are_refreshed(self):
+        rollups.refresh()
+        moved = Appointment.objects.get(price=Decimal("80.00"))
+        moved.appointment_date = "2025-02-03T14:00:00Z"
+        with self.captureOnCommitCallbacks() as callbacks:
+            moved.save()
+            Appointment.objects.get(price=Decimal("50.00")).delete()
+        self.assertFalse(RevenueDirtyDay.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(
+            set(RevenueDirtyDay.objects.values_list('day', flat=True)),
+            {date(2025, 1, 6), date(2025, 1, 8), date(2025, 2, 3)},
+        )
+
+        rollups.refresh()
+        self.assertFalse(RevenueRollup.objects.filter(day=date(2025, 1, 8)).exists())
+        self.assertEqual([row['revenue'] for row in self.report(bucket='month')], ["130.00", "150.00"])
+
+    def test_saves_of_other_fields_keep_the_day(self):
+        rollups.refresh()
+        appointment = Appointment.objects.get(price=Decimal("80.00"))
+        appointment.reason = "Follow-up"
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(1):
+            appointment.save(update_fields=['reason'])
+        self.assertEqual(list(RevenueDirtyDay.objects.values_list('day', flat=True)), [date(2025, 1, 8)])
+
+    def test_invalid_parameters(self):
+        resp = self.client.get(self.url, {'from': '2025-02-01', 'to': '2025-01-01', 'bucket': 'year'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('bucket', resp.json())
@@ -0,0 +1,125 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from clinic.models import Owner, Pet, Veterinarian, Appointment, Species
+from clinic.schedule import BusyIntervals
+from clinic.serializers import AppointmentSerializer
+
+def at(hour, minute=0, day=6):
+    return datetime(2025, 1, day, hour, minute, tzinfo=dt_timezone.utc)
+
+@override_settings(CLINIC_OPENING_HOUR=8, CLINIC_CLOSING_HOUR=12)
+class ScheduleTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy",
+            gender="M",
+            species=Species.DOG,
+            breed="Labrador",
+            owner=self.owner
+        )
+        self.vet = Veterinarian.objects.create(name="Dra. Ana Souza")
+        self.other_vet = Veterinarian.objects.create(name="Dr. Paulo Lima")
+        Appointment.objects.create(
+            pet=self.pet, appointment_date=at(9), duration_minutes=60, reason="Checkup", veterinarian=self.vet
+        )
+
+    def payload(self, start, duration=30, vet=None):
+        return {
+            "pet": str(self.pet.id),
+            "appointment_date": start,
+            "duration_minutes": duration,
+            "reason": "Visit",
+            "veterinarian": str((vet or self.vet).id),
+        }
+
+    def test_ends_at_is_derived(self):
+        appointment = Appointment.objects.get()
+        self.assertEqual(appointment.ends_at, at(10))
+
+        Appointment.objects.bulk_create([Appointment(pet=self.pet, appointment_date=at(14), reason="Bulk")])
+        self.assertEqual(Appointment.objects.get(reason="Bulk").ends_at, at(14, 30))
+
+    def test_create_fills_doctor(self):
+        resp = self.client.post(reverse('appointment-list'), self.payload("2025-01-06T10:00:00Z"), format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.json()['doctor'], "Dra. Ana Souza")
+        self.assertEqual(resp.json()['ends_at'], "2025-01-06T10:30:00Z")
+
+    def test_overlapping_appointment_is_rejected(self):
+        resp = self.client.post(reverse('appointment-list'), self.payload("2025-01-06T08:45:00Z"), format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.json()['appointment_date'], ["Dra. Ana Souza already has an appointment at this time."])
+
+        resp = self.client.post(
+            reverse('appointment-list'), self.payload("2025-01-06T08:45:00Z", vet=self.other_vet), format='json'
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_rejects_conflicts_within_batch_and_with_database(self):
+        resp = self.client.post(reverse('appointment-bulk'), [
+            self.payload("2025-01-06T10:00:00Z"),
+            self.payload("2025-01-06T10:15:00Z"),
+            self.payload("2025-01-06T09:30:00Z"),
+            self.payload("2025-01-06T10:30:00Z"),
+        ], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([error['index'] for error in resp.json()['errors']], [1, 2])
+        self.assertEqual(Appointment.objects.filter(veterinarian=self.vet).count(), 3)
+
+    def test_bulk_rechecks_conflicts_under_lock(self):
+        serializer = AppointmentSerializer(data=[
+            self.payload("2025-01-06T10:00:00Z"),
+            self.payload("2025-01-06T11:00:00Z"),
+            self.payload("2025-01-06T10:00:00Z", vet=self.other_vet),
+        ], many=True)
+        self.assertTrue(serializer.is_valid())
+        # Another request books the vet between validation and insert.
+        Appointment.objects.create(
+            pet=self.pet, appointment_date=at(11, 15), duration_minutes=30, reason="Walk-in", veterinarian=self.vet
+        )
+        created = serializer.save()
+        self.assertEqual(len(created), 2)
+        self.assertEqual(serializer.rejected, [
+            {'index': 1, 'errors': {'appointment_date': ["Dra. Ana Souza already has an appointment at this time."]}},
+        ])
+        self.assertFalse(Appointment.objects.filter(veterinarian=self.vet, appointment_date=at(11)).exists())
+
+    def test_availability(self):
+        resp = self.client.get(reverse('appointment-availability'), {
+            "doctor": str(self.vet.id), "from": "2025-01-06T00:00:00Z", "to": "2025-01-07T00:00:00Z", "slot": 60,
+        })
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()['slots'], [
+            {"start": "2025-01-06T08:00:00Z", "end": "2025-01-06T09:00:00Z"},
+            {"start": "2025-01-06T10:00:00Z", "end": "2025-01-06T11:00:00Z"},
+            {"start": "2025-01-06T11:00:00Z", "end": "2025-01-06T12:00:00Z"},
+        ])
+
+    def test_availability_validates_parameters(self):
+        url = reverse('appointment-availability')
+        resp = self.client.get(url, {"doctor": str(self.vet.id), "from": "2025-01-07T00:00:00Z", "to": "2025-01-06T00:00:00Z"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('to', resp.json())
+
+        resp = self.client.get(url, {"from": "2025-01-06T00:00:00Z", "to": "2025-03-06T00:00:00Z"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('doctor', resp.json())
+
+    def test_busy_intervals(self):
+        busy = BusyIntervals([(at(9), at(10)), (at(11), at(12)), (at(9, 30), at(10, 30))])
+        self.assertTrue(busy.overlaps(at(10, 15), at(10, 45)))
+        self.assertFalse(busy.overlaps(at(10, 30), at(11)))
+        busy.add(at(10, 30), at(11))
+        self.assertTrue(busy.overlaps(at(10, 45), at(10, 50)))
+        self.assertFalse(busy.overlaps(at(12), at(13)))
@@ -0,0 +1,93 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic.models import Owner, Pet, Appointment, Order, Species
+
+class SearchFixtureMixin:
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Maria Silva",
+            cpf="00011122233",
+            phone="11999990000",
+            email="maria@example.com",
+            address="Rua Teste 1"
+        )
+        self.other = Owner.objects.create(
+            name="João Souza",
+            cpf="99988877766",
+            phone="11988887777",
+            email="joao@example.com",
+            address="Rua Nova 10"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy",
+            gender="M",
+            species=Species.DOG,
+            breed="Golden Retriever",
+            owner=self.owner
+        )
+        Pet.objects.create(name="Mittens", gender="F", species=Species.CAT, breed="Siamese", owner=self.other)
+        Appointment.objects.create(
+            pet=self.pet,
+            appointment_date="2025-01-01T10:00:00Z",
+            reason="Checkup",
+            price=Decimal("120.00")
+        )
+        Order.objects.create(owner=self.other, total=Decimal("50.00"))
+
+    def search(self, name, term):
+        resp = self.client.get(reverse(name), {'search': term})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.json()['results']
+
+class SearchTestCase(SearchFixtureMixin, APITestCase):
+    def test_owner_search_is_case_insensitive_substring(self):
+        self.assertEqual([o['id'] for o in self.search('owner-list', 'SILV')], [str(self.owner.id)])
+        self.assertEqual([o['id'] for o in self.search('owner-list', '8887')], [str(self.other.id)])
+        self.assertEqual([o['id'] for o in self.search('owner-list', 'joao@')], [str(self.other.id)])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(len(self.search('owner-list', 'maria silva')), 1)
+        self.assertEqual(len(self.search('owner-list', 'maria souza')), 0)
+
+    def test_like_wildcards_are_literal(self):
+        self.assertEqual(self.search('owner-list', '%'), [])
+        self.assertEqual(self.search('owner-list', '_'), [])
+
+    def test_pet_search(self):
+        self.assertEqual([p['name'] for p in self.search('pet-list', 'retriev')], ['Buddy'])
+
+    def test_related_search(self):
+        self.assertEqual(len(self.search('appointment-list', 'bud')), 1)
+        self.assertEqual(len(self.search('order-list', 'souza')), 1)
+        self.assertEqual(len(self.search('order-list', 'silva')), 0)
+
+@skipUnless(connection.vendor == 'postgresql', 'pg_trgm indexes only exist on PostgreSQL')
+class TrigramSearchPlanTestCase(SearchFixtureMixin, APITestCase):
+    def explain_search(self, name, term):
+        with CaptureQueriesContext(connection) as ctx:
+            self.search(name, term)
+        sql = next(q['sql'] for q in ctx.captured_queries if 'ORDER BY' in q['sql'])
+        self.assertIn('ILIKE', sql)
+        with connection.cursor() as cursor:
+            # Trigram GIN indexes are bitmap-only; rule out the ordered
+            # B-tree walk the planner prefers on a two-row table.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_indexscan = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def test_owner_search_uses_trigram_indexes(self):
+        plan = self.explain_search('owner-list', 'silva')
+        for index in ('clinic_owner_name_trgm', 'clinic_owner_cpf_trgm', 'clinic_owner_email_trgm'):
+            self.assertIn(index, plan)
+
+    def test_pet_search_uses_trigram_indexes(self):
+        plan = self.explain_search('pet-list', 'retriever')
+        self.assertIn('clinic_pet_name_trgm', plan)
+        self.assertIn('clinic_pet_breed_trgm', plan)
@@ -0,0 +1,99 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from clinic.models import Owner, Pet, Species
+from clinic.slowqueries import fingerprint, slow_queries
+
+@override_settings(API_CACHE_TIMEOUT=0, SLOW_QUERY_MS=0.000001, SLOW_QUERY_EXPLAIN_RATE=0)
+class SlowQueryTestCase(APITestCase):
+    def setUp(self):
+        slow_queries.clear()
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        Pet.objects.create(name="Buddy", gender="M", species=Species.DOG, breed="Labrador", owner=self.owner)
+
+    def test_fingerprint_ignores_values(self):
+        first = fingerprint("SELECT * FROM pet WHERE name = 'Rex' AND id IN (%s, %s) LIMIT 10")
+        second = fingerprint("SELECT *  FROM pet WHERE name = 'Bob''s' AND id IN (%s) LIMIT 21")
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], "SELECT * FROM pet WHERE name = ? AND id IN (...) LIMIT ?")
+        self.assertNotEqual(first[1], fingerprint("SELECT * FROM owner WHERE name = 'Rex'")[1])
+
+    def test_records_queries_of_the_request(self):
+        resp = self.client.get(reverse('pet-list'), {'species': 'd'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        entries = slow_queries.entries()
+        self.assertTrue(entries)
+        entry = entries[0]
+        self.assertEqual(entry['route'], 'pet-list')
+        self.assertEqual(entry['query_params'], 'species=d')
+        self.assertIn('clinic_pet', entry['sql'])
+        self.assertEqual(entry['fingerprint'], fingerprint(entry['sql'])[1])
+        self.assertIsNone(entry['plan'])
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_disabled_by_default(self):
+        self.client.get(reverse('pet-list'))
+        self.assertEqual(slow_queries.entries(), [])
+
+    @override_settings(SLOW_QUERY_BUFFER=2)
+    def test_buffer_is_bounded(self):
+        for _ in range(3):
+            self.client.get(reverse('pet-list'))
+        self.assertEqual(len(slow_queries.entries()), 2)
+
+    @skipUnless(connection.vendor == 'postgresql', 'EXPLAIN is only sampled on PostgreSQL')
+    @override_settings(SLOW_QUERY_EXPLAIN_RATE=1)
+    def test_samples_explain_plans(self):
+        resp = self.client.get(reverse('owner-list'), {'name': 'Test Owner'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        plans = [entry['plan'] for entry in slow_queries.entries() if entry['sql'].startswith('SELECT')]
+        self.assertTrue(plans)
+        self.assertTrue(all('Execution Time' in plan for plan in plans))
+        # The EXPLAINs ran in the test transaction without breaking it.
+        self.assertTrue(Owner.objects.filter(pk=self.owner.pk).exists())
+
+    def test_admin_lists_and_clears_the_log(self):
+        self.client.get(reverse('pet-list'))
+        entry = slow_queries.entries()[0]
+        User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.login(username='admin', password='secret')
+
+        url = reverse('admin:clinic_slowquery_changelist')
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertContains(resp, entry['fingerprint'])
+        self.assertContains(resp, 'pet-list')
+
+        self.client.post(url, {'clear': '1'})
+        self.assertEqual(slow_queries.entries(), [])
+
+    def test_admin_needs_permissions(self):
+        self.client.get(reverse('pet-list'))
+        url = reverse('admin:clinic_slowquery_changelist')
+        staff = User.objects.create_user('staff', password='secret', is_staff=True)
+        self.client.login(username='staff', password='secret')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.post(url, {'clear': '1'}).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(slow_queries.entries())
+
+        staff.user_permissions.add(Permission.objects.get(codename='view_slowquery'))
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotContains(resp, 'Clear log')
+        self.assertEqual(self.client.post(url, {'clear': '1'}).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(slow_queries.entries())
+
+        staff.user_permissions.add(Permission.objects.get(codename='clear_slowquery'))
+        self.client.post(url, {'clear': '1'})
+        self.assertEqual(slow_queries.entries(), [])
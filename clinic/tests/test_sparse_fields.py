@@ -0,0 +1,101 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from clinic.encoders import row_encoder
+from clinic.models import Owner, Pet, Appointment, Order, OrderItem, Species
+from clinic.serializers import OwnerSerializer
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class SparseFieldsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = Owner.objects.create(
+            name="Ana", cpf="00011122233", phone="11999990000", email="ana@example.com", address="Rua Longa 1",
+        )
+        cls.pet = Pet.objects.create(name="Rex", gender="M", species=Species.DOG, breed="SRD", owner=cls.owner)
+        start = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+        for i in range(3):
+            Appointment.objects.create(
+                pet=cls.pet, appointment_date=start + timedelta(hours=i), reason="Checkup", notes="Long notes",
+                price=Decimal("80.00"),
+            )
+        cls.order = Order.objects.create(owner=cls.owner, total=Decimal("10.00"))
+        OrderItem.objects.create(
+            order=cls.order, name="Food", unit_price=Decimal("10.00"), line_total=Decimal("10.00"), date=cls.order.date,
+        )
+
+    def get(self, name, params, *args):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(reverse(name, args=args), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        return resp, [query['sql'] for query in queries]
+
+    def test_fields_trim_the_response_and_the_select_list(self):
+        for fast in (True, False):
+            with override_settings(API_FAST_LIST=fast):
+                resp, sql = self.get('owner-list', {'fields': 'id,name'})
+            self.assertEqual(list(resp.json()['results'][0]), ['id', 'name'])
+            page_query = [query for query in sql if 'LIMIT' in query][0]
+            self.assertNotIn('"address"', page_query)
+            self.assertNotIn('"email"', page_query)
+
+    def test_omit_drops_fields(self):
+        resp, sql = self.get('appointment-list', {'omit': 'notes,reason'})
+        row = resp.json()['results'][0]
+        self.assertNotIn('notes', row)
+        self.assertNotIn('reason', row)
+        self.assertIn('price', row)
+        self.assertFalse([query for query in sql if '"notes"' in query or '"reason"' in query])
+
+        appointment = Appointment.objects.first()
+        resp, sql = self.get('appointment-detail', {'fields': 'id,price'}, appointment.pk)
+        self.assertEqual(resp.json(), {'id': str(appointment.pk), 'price': '80.00'})
+        self.assertFalse([query for query in sql if '"notes"' in query])
+
+    def test_fast_and_regular_paths_agree(self):
+        for name, params in (
+            ('pet-list', {'fields': 'name,owner'}),
+            ('order-list', {'fields': 'id,items,total'}),
+            ('order-list', {'omit': 'items'}),
+            ('appointment-list', {'fields': 'id', 'pagination': 'cursor', 'page_size': 2}),
+        ):
+            with override_settings(API_FAST_LIST=False):
+                slow, _ = self.get(name, params)
+            fast, _ = self.get(name, params)
+            self.assertEqual(fast.content, slow.content, f"{name} {params}")
+
+        resp, _ = self.get('appointment-list', {'fields': 'id', 'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(len(self.client.get(resp.json()['next']).json()['results']), 1)
+
+    def test_left_out_relations_are_not_loaded(self):
+        resp, sql = self.get('order-list', {'fields': 'id,total'})
+        self.assertEqual(resp.json()['results'], [{'id': str(self.order.pk), 'total': '10.00'}])
+        self.assertFalse([query for query in sql if 'clinic_orderitem' in query])
+
+        for fast in (True, False):
+            with override_settings(API_FAST_LIST=fast):
+                resp, _ = self.get('appointment-list', {'fields': 'id', 'expand': 'pet'})
+            self.assertEqual(list(resp.json()['results'][0]), ['id'])
+
+    def test_encoders_are_shared_by_equal_fieldsets(self):
+        encoder = row_encoder(OwnerSerializer, ['id', 'name'])
+        self.assertIs(row_encoder(OwnerSerializer, ['name', 'id', 'email'], ['email']), encoder)
+        self.assertEqual(encoder.columns, ['id', 'name'])
+        self.assertIs(row_encoder(OwnerSerializer, omit=[]), row_encoder(OwnerSerializer, fields=list(OwnerSerializer.Meta.fields)))
+
+    def test_unknown_fields_are_rejected(self):
+        resp = self.client.get(reverse('owner-list'), {'fields': 'id,password'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Unknown field(s): password", resp.json()['fields'][0])
+
+    def test_writes_return_every_field(self):
+        resp = self.client.post(reverse('owner-list') + '?fields=id', {
+            'name': "Bia", 'cpf': "99988877766", 'phone': "11988887777", 'email': "bia@example.com", 'address': "-",
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        self.assertIn('address', resp.json())
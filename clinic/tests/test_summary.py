@@ -0,0 +1,86 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from datetime import datetime, timezone
+from clinic.models import Owner, Pet, Appointment, Order, Species
+
+class OwnerSummaryTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Ana",
+            cpf="00011122233",
+            phone="11999990000",
+            email="ana@example.com",
+            address="Rua Teste 1"
+        )
+        self.other = Owner.objects.create(
+            name="Bruno",
+            cpf="00011122244",
+            phone="11999990001",
+            email="bruno@example.com",
+            address="Rua Teste 2"
+        )
+        self.idle = Owner.objects.create(
+            name="Carla",
+            cpf="00011122255",
+            phone="11999990002",
+            email="carla@example.com",
+            address="Rua Teste 3"
+        )
+        buddy = Pet.objects.create(name="Buddy", gender="M", species=Species.DOG, breed="Labrador", owner=self.owner)
+        mittens = Pet.objects.create(name="Mittens", gender="F", species=Species.CAT, breed="Siamese", owner=self.owner)
+        rex = Pet.objects.create(name="Rex", gender="M", species=Species.DOG, breed="Poodle", owner=self.other)
+
+        for pet, day, price in [(buddy, 1, "100.00"), (mittens, 5, "50.50"), (rex, 9, "30.00")]:
+            Appointment.objects.create(
+                pet=pet,
+                appointment_date=datetime(2025, 1, day, 10, tzinfo=timezone.utc),
+                reason="Checkup",
+                price=Decimal(price)
+            )
+        Order.objects.create(owner=self.owner, items=[], total=Decimal("20.00"))
+        Order.objects.create(owner=self.other, items=[], total=Decimal("500.00"))
+
+    def test_owner_summary(self):
+        resp = self.client.get(reverse('owner-summary', args=[self.owner.id]))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = resp.json()
+        self.assertEqual(data['pet_count'], 2)
+        self.assertEqual(data['appointment_count'], 2)
+        self.assertEqual(data['last_visit'], "2025-01-05T10:00:00Z")
+        self.assertEqual(data['appointment_spend'], "150.50")
+        self.assertEqual(data['order_spend'], "20.00")
+        self.assertEqual(data['total_spend'], "170.50")
+
+    def test_owner_without_activity(self):
+        data = self.client.get(reverse('owner-summary', args=[self.idle.id])).json()
+        self.assertEqual(data['pet_count'], 0)
+        self.assertEqual(data['appointment_count'], 0)
+        self.assertIsNone(data['last_visit'])
+        self.assertEqual(data['total_spend'], "0.00")
+
+    def test_summaries_sorting(self):
+        url = reverse('owner-summaries')
+
+        resp = self.client.get(url, {'ordering': '-total_spend'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['name'] for row in resp.json()['results']], ["Bruno", "Ana", "Carla"])
+
+        resp = self.client.get(url, {'ordering': 'last_visit'})
+        self.assertEqual([row['name'] for row in resp.json()['results']], ["Ana", "Bruno", "Carla"])
+
+        resp = self.client.get(url, {'ordering': '-last_visit'})
+        self.assertEqual([row['name'] for row in resp.json()['results']], ["Bruno", "Ana", "Carla"])
+
+        resp = self.client.get(url)
+        self.assertEqual(resp.json()['count'], 3)
+        self.assertEqual([row['name'] for row in resp.json()['results']], ["Ana", "Bruno", "Carla"])
+
+    def test_summaries_page_is_one_statement(self):
+        # One COUNT for the paginator plus one SELECT for the page.
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('owner-summaries'), {'ordering': '-total_spend'})
+        self.assertEqual(len(ctx.captured_queries), 2)
@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from decimal import Decimal
+from clinic.models import Owner, Order, OrderItem
+
+class OrderTotalsTestCase(APITestCase):
+    def setUp(self):
+        self.owner = Owner.objects.create(
+            name="Test Owner",
+            cpf="00011122233",
+            phone="11999990000",
+            email="testowner@example.com",
+            address="Rua Teste 1"
+        )
+        self.url = reverse('order-list')
+
+    def post(self, items, **extra):
+        return self.client.post(self.url, {"owner": str(self.owner.id), "items": items, **extra}, format='json')
+
+    def test_totals_are_derived(self):
+        resp = self.post([
+            {"name": "Vacina", "quantity": 3, "unit_price": 0.1},
+            {"name": "Ração", "quantity": 1, "unit_price": "19.999"},
+        ])
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['line_total'] for item in resp.json()['items']], ["0.30", "20.00"])
+        self.assertEqual(resp.json()['total'], "20.30")
+        self.assertEqual(Order.objects.get().total, Decimal("20.30"))
+
+    def test_float_rounding_is_accepted(self):
+        resp = self.post([{"name": "Vacina", "quantity": 3, "unit_price": 0.1, "line_total": 0.30000000000000004}], total=0.3)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_mismatching_amounts_are_rejected(self):
+        resp = self.post([{"name": "Vacina", "quantity": 2, "unit_price": "10.00", "line_total": "25.00"}])
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.json()['items'][0]['line_total'], ["Expected 20.00 (quantity * unit_price)."])
+
+        resp = self.post([{"name": "Vacina", "quantity": 2, "unit_price": "10.00"}], total="21.00")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('total', resp.json())
+        self.assertFalse(Order.objects.exists())
+
+    def test_amounts_over_the_digit_limit_are_rejected(self):
+        for price in ("99999999999", "1e30"):
+            resp = self.post([{"name": "Vacina", "quantity": 1, "unit_price": price}])
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST, price)
+            self.assertEqual(
+                resp.json()['items'][0]['unit_price'], ["Ensure that there are no more than 10 digits in total."],
+            )
+
+    def test_order_without_items_keeps_total(self):
+        resp = self.post([], total="15.50")
+        self.assertEqual(resp.json()['total'], "15.50")
+
+    def test_reconcile_orders(self):
+        good = Order.objects.create(owner=self.owner, total=Decimal("20.00"))
+        OrderItem.objects.create(order=good, name="Vacina", quantity=2, unit_price=Decimal("10.00"), line_total=Decimal("20.00"), date=good.date)
+        bad = Order.objects.create(owner=self.owner, total=Decimal("99.00"))
+        OrderItem.objects.create(order=bad, name="Ração", quantity=3, unit_price=Decimal("84.08"), line_total=Decimal("252.23"), date=bad.date)
+        OrderItem.objects.create(order=bad, name="Vacina", quantity=1, unit_price=Decimal("0.10"), line_total=Decimal("0.10"), position=1, date=bad.date)
+
+        out = StringIO()
+        call_command('reconcile_orders', stdout=out)
+        self.assertIn("Found 1 mismatching line items and 1 mismatching order totals.", out.getvalue())
+        self.assertEqual(Order.objects.get(pk=bad.pk).total, Decimal("99.00"))
+
+        call_command('reconcile_orders', '--fix', '--chunk-size', '1', stdout=StringIO())
+        self.assertEqual(Order.objects.get(pk=bad.pk).total, Decimal("252.34"))
+        self.assertEqual(OrderItem.objects.get(order=bad, position=0).line_total, Decimal("252.24"))
+
+        out = StringIO()
+        call_command('reconcile_orders', stdout=out)
+        self.assertIn("Found 0 mismatching line items and 0 mismatching order totals.", out.getvalue())
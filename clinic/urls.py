@@ -1,14 +1,66 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
 
-from .views import OwnerViewSet, PetViewSet, AppointmentViewSet, OrderViewSet
+from .async_views import AsyncOwnerView, AsyncPetView, AsyncAppointmentView, AsyncOrderView
+from .views import (
+    CacheStatsView, MetricsView, OwnerViewSet, PetViewSet, VeterinarianViewSet, AppointmentViewSet, OrderViewSet, ProductSalesView,
+    RevenueReportView,
+)
+
+# Maximum SQL queries per GET, by URL name. A list's budget must not
+# depend on its page size; clinic.tests.test_query_budget checks both and
+# QueryBudgetMiddleware logs requests that go over.
+QUERY_BUDGETS = {
+    'owner-list': 3,
+    'owner-detail': 1,
+    'owner-summaries': 2,
+    'owner-summary': 1,
+    'pet-list': 3,
+    'pet-detail': 1,
+    'veterinarian-list': 3,
+    'veterinarian-detail': 1,
+    'appointment-list': 3,
+    'appointment-detail': 1,
+    'appointment-availability': 2,
+    'order-list': 4,
+    'order-detail': 2,
+    'cache-stats': 0,
+    'metrics': 0,
+    'product-sales': 2,
+    'revenue-report': 2,
+    'async-owner-list': 2,
+    'async-owner-detail': 1,
+    'async-pet-list': 2,
+    'async-pet-detail': 1,
+    'async-appointment-list': 2,
+    'async-appointment-detail': 1,
+    'async-order-list': 3,
+    'async-order-detail': 2,
+}
 
 router = DefaultRouter()
 router.register(r'owners', OwnerViewSet, basename='owner')
 router.register(r'pets', PetViewSet, basename='pet')
+router.register(r'veterinarians', VeterinarianViewSet, basename='veterinarian')
 router.register(r'appointments', AppointmentViewSet, basename='appointment')
 router.register(r'orders', OrderViewSet, basename='order')
 
 urlpatterns = [
     path('', include(router.urls)),
-]
\ No newline at end of file
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('reports/product-sales/', ProductSalesView.as_view(), name='product-sales'),
+    path('reports/revenue/', RevenueReportView.as_view(), name='revenue-report'),
+]
+
+# Async read path, for ASGI deployments (see clinic.async_views).
+for prefix, basename, view in (
+    ('owners', 'owner', AsyncOwnerView),
+    ('pets', 'pet', AsyncPetView),
+    ('appointments', 'appointment', AsyncAppointmentView),
+    ('orders', 'order', AsyncOrderView),
+):
+    urlpatterns += [
+        path(f'async/{prefix}/', view.as_view(), name=f'async-{basename}-list'),
+        path(f'async/{prefix}/<str:pk>/', view.as_view(), name=f'async-{basename}-detail'),
+    ]
\ No newline at end of file
@@ -1,19 +1,466 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Count, DateField, F, Max, Sum
+from django.db.models.functions import Trunc
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import mixins, viewsets, filters
-from rest_framework.permissions import AllowAny
+from rest_framework import generics, mixins, viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS, AllowAny, BasePermission, IsAdminUser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from .models import Owner, Pet, Appointment, Order
-from .serializers import OwnerSerializer, PetSerializer, AppointmentSerializer, OrderSerializer
+from . import cache, encoders, instrumentation
+from .db.pooled.base import render_pool_metrics
+from .conditional import conditional_response, make_etag, validator_headers
+from .filters import (
+    AppointmentFilter, NullsLastOrderingFilter, OrderFilter, ProductSalesFilter, TrigramSearchFilter,
+)
+from . import rollups, routers
+from .models import Owner, Pet, Veterinarian, Appointment, Order, OrderItem, RevenueRollup
+from .pagination import AppointmentKeysetPagination, KeysetPagination, OrderKeysetPagination
+from .renderers import CSVRenderer, NDJSONRenderer, PrometheusRenderer
+from .schedule import free_slots
+from .serializers import (
+    OwnerSerializer, OwnerSummarySerializer, PetSerializer, VeterinarianSerializer, AppointmentSerializer,
+    AvailabilityQuerySerializer, OrderSerializer, ProductSalesSerializer, RevenueQuerySerializer, RevenueSerializer,
+    SparseFieldsetMixin,
+)
+
+class TimingMixin:
+    """
+    Reports serializer and render time to `PerformanceMiddleware`, for the
+    request's Server-Timing header and metrics.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        # Only the outermost call is timed: nested and list children are
+        # other serializer instances.
+        serializer.to_representation = instrumentation.timed('serialize')(serializer.to_representation)
+        return serializer
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if hasattr(response, 'add_post_render_callback') and not response.is_rendered:
+            instrumentation.start('render')
+            response.add_post_render_callback(lambda rendered: instrumentation.stop('render'))
+        return response
+
+class KeysetPaginationMixin:
+    """
+    Uses `keyset_pagination_class` instead of the default page-number
+    paginator when the client opts in with `?pagination=cursor` (or follows
+    a `cursor` link). Plain requests keep the `count`/`page` response.
+    """
+    keyset_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            keyset = self.keyset_pagination_class
+            if keyset is not None and keyset.is_requested(getattr(self, 'request', None)):
+                self._paginator = keyset()
+            else:
+                return super().paginator
+        return self._paginator
+
+class BulkCreateMixin:
+    """
+    Adds `POST <list url>/bulk/`, which takes a JSON array of objects.
+
+    Valid rows are created and invalid ones are reported by input index
+    (201 when everything was created, 207 when only some rows were, 400
+    when none were). With `?atomic=true` any invalid row rejects the whole
+    batch.
+    """
+    bulk_max_items = 5000
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        atomic = request.query_params.get('atomic', '').lower() in ('1', 'true', 'yes')
+        serializer = self.get_serializer(data=request.data, many=True, max_length=self.bulk_max_items)
+        serializer.is_valid(raise_exception=True)
+
+        if atomic:
+            with transaction.atomic():
+                if not serializer.rejected:
+                    self.perform_bulk_create(serializer)
+                if serializer.rejected:
+                    transaction.set_rollback(True)
+                    return Response({'created': [], 'errors': serializer.rejected}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            self.perform_bulk_create(serializer)
+
+        if not serializer.rejected:
+            code = status.HTTP_201_CREATED
+        elif serializer.instance:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response({'created': serializer.data, 'errors': serializer.rejected}, status=code)
+
+    def perform_bulk_create(self, serializer):
+        serializer.save()
+        # bulk_create sends no post_save signals.
+        cache.invalidate(serializer.child.Meta.model)
+        rollups.mark_instances(serializer.instance)
+
+class ExportMixin:
+    """
+    Adds `GET <list url>/export/?format=csv|ndjson` (CSV by default). Every
+    row matching the list's filters and search is streamed from a
+    server-side cursor, so memory stays flat whatever the row count.
+    """
+    export_chunk_size = 2000
+
+    @action(detail=False, renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        fields = [name for name, field in serializer.fields.items() if not field.write_only]
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(fields, self.export_rows(serializer, queryset)),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}s.{renderer.format}"'
+        return response
+
+    def export_rows(self, serializer, queryset):
+        # Inside a transaction the server-side cursor is declared without
+        # WITH HOLD, so PostgreSQL streams it rather than materializing the
+        # whole result when the declaring statement commits.
+        with transaction.atomic():
+            for instance in queryset.iterator(chunk_size=self.export_chunk_size):
+                yield serializer.to_representation(instance)
+
+class ExpandMixin:
+    """
+    `?expand=pet,pet.owner` embeds related objects in read responses. The
+    same paths are joined with `select_related`, so a page costs the same
+    number of queries whatever its size.
+    """
+    expand_query_param = 'expand'
+
+    def get_expand(self):
+        if not hasattr(self, '_expand'):
+            request = getattr(self, 'request', None)
+            raw = ''
+            if request is not None and request.method in SAFE_METHODS:
+                raw = request.query_params.get(self.expand_query_param, '')
+            requested = {path.strip() for path in raw.split(',') if path.strip()}
+
+            allowed = self.get_serializer_class().expandable_paths()
+            unknown = requested - allowed
+            if unknown:
+                raise ValidationError({
+                    self.expand_query_param: [
+                        f"Unknown path(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(sorted(allowed))}."
+                    ]
+                })
+            self._expand = requested
+        return self._expand
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        related = [path.replace('.', '__') for path in self.get_expand()]
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
+
+class SparseFieldsMixin:
+    """
+    `?fields=id,name` keeps only the named fields of read responses and
+    `?omit=address,notes` drops the named ones. The queryset then loads
+    only the columns those fields need with `.only()`, plus the primary
+    key and what ordering, `?expand=` and conditional GET read.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fields(self):
+        """`(fields, omit)` of the request; `fields` is None when not restricted."""
+        if not hasattr(self, '_sparse_fields'):
+            request = getattr(self, 'request', None)
+            serializer_class = self.get_serializer_class()
+            fields, omit = None, set()
+            if (
+                request is not None and request.method in SAFE_METHODS
+                and issubclass(serializer_class, SparseFieldsetMixin)
+            ):
+                fields = self.parse_field_names(request, self.fields_query_param, serializer_class)
+                omit = self.parse_field_names(request, self.omit_query_param, serializer_class) or set()
+            self._sparse_fields = (fields, omit)
+        return self._sparse_fields
+
+    def parse_field_names(self, request, param, serializer_class):
+        raw = request.query_params.get(param, '')
+        names = {name.strip() for name in raw.split(',') if name.strip()}
+        if not names:
+            return None
+        allowed = serializer_class.Meta.fields
+        unknown = names - set(allowed)
+        if unknown:
+            raise ValidationError({
+                param: [f"Unknown field(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(allowed)}."]
+            })
+        return names
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, omit = self.get_sparse_fields()
+        if fields is None and not omit:
+            return queryset
+
+        model = queryset.model
+        serializer_class = self.get_serializer_class()
+        sources = set()
+        for name in serializer_class.Meta.fields:
+            if (fields is None or name in fields) and name not in omit:
+                declared = serializer_class._declared_fields.get(name)
+                sources.add(getattr(declared, 'source', None) or name)
+
+        columns = {model._meta.pk.name}
+        columns.update(name.lstrip('-') for name in getattr(self, 'ordering_fields', None) or ())
+        columns.update(name.lstrip('-') for name in getattr(self, 'ordering', None) or ())
+        # A relation joined by select_related() cannot be deferred.
+        if hasattr(self, 'get_expand'):
+            columns.update(path.split('.')[0] for path in self.get_expand())
+        if getattr(self, 'conditional_get', False):
+            columns.add('updated_at')
+        for source in sources:
+            try:
+                field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                columns.add(source)
+
+        # Skip prefetches of the relations left out, e.g. order items.
+        prefetches = [lookup for lookup in queryset._prefetch_related_lookups if lookup.split('__')[0] in sources]
+        return queryset.prefetch_related(None).prefetch_related(*prefetches).only(*columns)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['omit'] = self.get_sparse_fields()
+        return context
+
+class FastListMixin:
+    """
+    Serves JSON list pages from `.values()` rows, converted by the
+    serializer's precompiled `RowEncoder`, instead of building model
+    instances and running every serializer field. The body is byte for
+    byte the serializer's. Expanded lists, other renderers and serializers
+    the encoder cannot reproduce take the regular path; `API_FAST_LIST`
+    turns it off.
+    """
+
+    def list(self, request, *args, **kwargs):
+        encoder = self.get_row_encoder(request)
+        if encoder is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        positions = ()
+        if isinstance(self.paginator, KeysetPagination):
+            # Cursors are read from the ordering fields of the last row.
+            positions = [name.lstrip('-') for name in self.paginator.get_ordering(request, queryset, self)]
+        queryset = encoder.values(queryset, *positions)
+        page = self.paginate_queryset(queryset)
+        with instrumentation.timed('serialize'):
+            data = encoder.encode(queryset if page is None else page)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    def get_row_encoder(self, request):
+        if not settings.API_FAST_LIST or self.action != 'list':
+            return None
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return None
+        if hasattr(self, 'get_expand') and self.get_expand():
+            return None
+        fields, omit = self.get_sparse_fields() if hasattr(self, 'get_sparse_fields') else (None, ())
+        return encoders.row_encoder(self.get_serializer_class(), fields, omit)
+
+class ResponseCacheMixin:
+    """
+    Caches the data of successful GET list/retrieve responses.
+
+    Keys are built from the action, the lookup value, the normalized query
+    string and the generation of every model in `cache_models`; saving or
+    deleting any of those models starts a new generation, so e.g. a new
+    `Pet` also retires cached owner-scoped pet lists. Responses carry an
+    `X-Cache: HIT|MISS` header.
+    """
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        timeout = settings.API_CACHE_TIMEOUT
+        if not timeout or request.method != 'GET':
+            return handler(request, *args, **kwargs)
+
+        key = cache.response_key(
+            self.basename,
+            self.cache_models,
+            request.query_params,
+            self.action,
+            kwargs.get(self.lookup_url_kwarg or self.lookup_field),
+            request.accepted_media_type,
+            request.build_absolute_uri('/'),
+        )
+        entry = cache.get_cache().get(key)
+        if entry is not None:
+            cache.record(self.basename, 'hits')
+            # The entry is only reachable while its data is current, so its
+            # validators can answer conditional requests without a query.
+            response = None
+            if entry['headers']:
+                response = conditional_response(request._request, entry['headers'])
+            if response is None:
+                response = Response(entry['data'], headers=entry['headers'])
+            response['X-Cache'] = 'HIT'
+            return response
+
+        cache.record(self.basename, 'misses')
+        response = handler(request, *args, **kwargs)
+        # A lagging replica could store pre-write data under the new
+        # generation.
+        if response.status_code == status.HTTP_200_OK and not routers.replica_may_lag():
+            headers = {name: response[name] for name in ('ETag', 'Last-Modified') if name in response}
+            cache.get_cache().set(key, {'data': response.data, 'headers': headers}, timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+class ConditionalGetMixin:
+    """
+    Conditional GET (`If-None-Match`/`If-Modified-Since`) for list and
+    retrieve.
+
+    A detail is validated by its row's `updated_at`, and those of expanded
+    relations; a list by `Max(updated_at)` and the count of the filtered
+    queryset. Unchanged resources get a 304 before the serializer runs.
+    Keyset-paginated lists are left out, as the aggregate would scan the
+    whole filtered set they are meant to avoid.
+    """
+    conditional_get = True
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(self.list_validators, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(self.detail_validators, super().retrieve, request, *args, **kwargs)
+
+    def get_object(self):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def conditional(self, validators, handler, request, *args, **kwargs):
+        headers = None
+        if self.conditional_get and request.method in ('GET', 'HEAD'):
+            headers = validators(request)
+        if headers is None:
+            return handler(request, *args, **kwargs)
+
+        response = conditional_response(request._request, headers)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                for name, value in headers.items():
+                    response[name] = value
+        return response
+
+    def list_validators(self, request):
+        if isinstance(self.paginator, KeysetPagination):
+            return None
+        aggregates = {'count': Count('pk'), 'updated_at': Max('updated_at')}
+        for index, path in enumerate(self.related_paths()):
+            # Named after the index: an alias equal to a path ("pet") would
+            # shadow the relation in the next one ("pet__owner").
+            aggregates[f"related_{index}"] = Max(f"{path}__updated_at")
+        values = self.filter_queryset(self.get_queryset()).aggregate(**aggregates)
+        return validator_headers(make_etag(sorted(values.items()), *self.representation(request)))
+
+    def detail_validators(self, request):
+        instance = self.get_object()
+        stamps = [instance.updated_at]
+        for path in self.related_paths():
+            related = instance
+            for name in path.split('__'):
+                related = getattr(related, name, None)
+            if related is not None:
+                stamps.append(related.updated_at)
+        return validator_headers(make_etag(instance.pk, stamps, *self.representation(request)), max(stamps))
+
+    def related_paths(self):
+        expand = self.get_expand() if hasattr(self, 'get_expand') else ()
+        return [path.replace('.', '__') for path in sorted(expand)]
+
+    def representation(self, request):
+        return request.accepted_media_type, sorted(request.query_params.lists())
+
+class CacheStatsView(TimingMixin, APIView):
+    """
+    Response cache hit/miss counters per resource.
+    """
+    permission_classes = [AllowAny]
+    scopes = ['owner', 'pet', 'appointment', 'order']
+
+    def get(self, request):
+        return Response(cache.stats(self.scopes))
+
+class MetricsScraper(BasePermission):
+    """
+    Requests from an address in `METRICS_ALLOWED_IPS`.
+    """
+
+    def has_permission(self, request, view):
+        return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+class MetricsView(TimingMixin, APIView):
+    """
+    Per-route request histograms and connection pool stats of this
+    process, in the Prometheus text format, for staff users and the
+    scraper's addresses. Internal: keep it off the public ingress too.
+    """
+    permission_classes = [IsAdminUser | MetricsScraper]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        return Response(instrumentation.metrics.render() + render_pool_metrics())
 
 # Create your views here.
 class OwnerViewSet(
+    TimingMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    BulkCreateMixin,
+    FastListMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
 ):
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, filters.OrderingFilter]
     filterset_fields = ['name', 'cpf', 'email']
     search_fields = ['name', 'cpf', 'email']
     ordering_fields = ['name', 'created_at']
@@ -21,13 +468,50 @@ class OwnerViewSet(
     queryset = Owner.objects.all().order_by('-created_at')
     serializer_class = OwnerSerializer
     permission_classes = [AllowAny]
+    cache_models = (Owner,)
+
+    summary_ordering_fields = ['name', 'total_spend', 'appointment_spend', 'order_spend', 'last_visit']
+    # Summaries aggregate the other tables, which the owner's updated_at
+    # cannot validate; they rely on the response cache alone.
+    summary_cache_models = (Owner, Pet, Appointment, Order)
+
+    @action(
+        detail=True,
+        queryset=Owner.objects.with_summary(),
+        serializer_class=OwnerSummarySerializer,
+        cache_models=summary_cache_models,
+        conditional_get=False,
+    )
+    def summary(self, request, pk=None):
+        return self.retrieve(request, pk=pk)
+
+    @action(
+        detail=False,
+        queryset=Owner.objects.with_summary(),
+        serializer_class=OwnerSummarySerializer,
+        cache_models=summary_cache_models,
+        conditional_get=False,
+        filter_backends=[DjangoFilterBackend, TrigramSearchFilter, NullsLastOrderingFilter],
+        ordering_fields=summary_ordering_fields,
+        ordering=['name'],
+    )
+    def summaries(self, request):
+        return self.list(request)
 
-class PetViewSet(mixins.ListModelMixin,
+class PetViewSet(
+    TimingMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    ExpandMixin,
+    BulkCreateMixin,
+    FastListMixin,
+    mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
 ):
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, filters.OrderingFilter]
     filterset_fields = ['owner', 'species', 'gender']
     search_fields = ['name', 'breed']
     ordering_fields = ['name', 'birth_date', 'created_at']
@@ -35,31 +519,153 @@ class PetViewSet(mixins.ListModelMixin,
     queryset = Pet.objects.all().order_by('name')
     serializer_class = PetSerializer
     permission_classes = [AllowAny]
+    cache_models = (Pet, Owner)
+
+class VeterinarianViewSet(
+    TimingMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.CreateModelMixin,
+    viewsets.GenericViewSet
+):
+    filter_backends = [filters.SearchFilter]
+    search_fields = ['name']
+    queryset = Veterinarian.objects.all().order_by('name')
+    serializer_class = VeterinarianSerializer
+    permission_classes = [AllowAny]
+    cache_models = (Veterinarian,)
 
-class AppointmentViewSet(mixins.ListModelMixin,
+class AppointmentViewSet(
+    TimingMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    ExpandMixin,
+    KeysetPaginationMixin,
+    BulkCreateMixin,
+    ExportMixin,
+    FastListMixin,
+    mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
 ):
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['pet', 'appointment_date']
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, filters.OrderingFilter]
+    filterset_class = AppointmentFilter
     search_fields = ['pet__name']
     ordering_fields = ['appointment_date', 'created_at']
     ordering = ['appointment_date']
     queryset = Appointment.objects.all().order_by('-appointment_date')
     serializer_class = AppointmentSerializer
     permission_classes = [AllowAny]
+    cache_models = (Appointment, Pet, Owner, Veterinarian)
+    keyset_pagination_class = AppointmentKeysetPagination
+
+    @action(detail=False)
+    def availability(self, request):
+        """
+        Free slots of one veterinarian, e.g.
+        `?doctor=<veterinarian id>&from=2025-01-06T00:00Z&to=2025-01-07T00:00Z&slot=30`.
+        """
+        params = AvailabilityQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        veterinarian = params.validated_data['doctor']
+        start, end = params.validated_data['start'], params.validated_data['to']
+        slot_minutes = params.validated_data['slot']
 
-class OrderViewSet(mixins.ListModelMixin,
+        field = params.fields['from']
+        return Response({
+            'doctor': veterinarian.pk,
+            'from': field.to_representation(start),
+            'to': field.to_representation(end),
+            'slot_minutes': slot_minutes,
+            'slots': [
+                {'start': field.to_representation(slot_start), 'end': field.to_representation(slot_end)}
+                for slot_start, slot_end in free_slots(veterinarian, start, end, slot_minutes)
+            ],
+        })
+
+class OrderViewSet(
+    TimingMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    ExpandMixin,
+    KeysetPaginationMixin,
+    BulkCreateMixin,
+    ExportMixin,
+    FastListMixin,
+    mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
 ):
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['owner', 'date']
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, filters.OrderingFilter]
+    filterset_class = OrderFilter
     search_fields = ['owner__name']
     ordering_fields = ['date', 'created_at']
     ordering = ['date']
-    queryset = Order.objects.all().order_by('-date')
+    queryset = Order.objects.prefetch_related('order_items').order_by('-date')
     serializer_class = OrderSerializer
-    permission_classes = [AllowAny]
\ No newline at end of file
+    permission_classes = [AllowAny]
+    cache_models = (Order, Owner)
+    keyset_pagination_class = OrderKeysetPagination
+
+class ProductSalesView(TimingMixin, generics.ListAPIView):
+    """
+    Units sold, revenue and number of orders per product, aggregated over
+    OrderItem rows in SQL. Filter with `name`, `date__gte` and `date__lt`.
+    """
+    queryset = OrderItem.objects.all()
+    serializer_class = ProductSalesSerializer
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ProductSalesFilter
+
+    def filter_queryset(self, queryset):
+        return (
+            super().filter_queryset(queryset)
+            .values('name')
+            .annotate(quantity=Sum('quantity'), revenue=Sum('line_total'), orders=Count('order', distinct=True))
+            .order_by('-quantity', 'name')
+        )
+
+class RevenueReportView(TimingMixin, generics.ListAPIView):
+    """
+    Appointment and order revenue per `bucket` (day, week or month) for
+    days in [`from`, `to`), optionally split by `group_by` (doctor or
+    species). Reads the precomputed `RevenueRollup` rows; the
+    `refresh_revenue` command brings the days touched since its last run
+    up to date.
+    """
+    queryset = RevenueRollup.objects.all()
+    serializer_class = RevenueSerializer
+    permission_classes = [AllowAny]
+    filter_backends = []
+
+    def filter_queryset(self, queryset):
+        params = RevenueQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        bucket = params.validated_data['bucket']
+        group_by = params.validated_data.get('group_by')
+
+        queryset = queryset.filter(day__gte=params.validated_data['start'], day__lt=params.validated_data['to'])
+        if bucket == 'day':
+            queryset = queryset.annotate(bucket=F('day'))
+        else:
+            queryset = queryset.annotate(bucket=Trunc('day', bucket, output_field=DateField()))
+        groups = [group_by] if group_by else []
+        return (
+            queryset.values('bucket', *groups)
+            .annotate(
+                # First, while the names below still refer to the columns.
+                revenue=Sum('appointment_revenue') + Sum('order_revenue'),
+                appointments=Sum('appointments'),
+                appointment_revenue=Sum('appointment_revenue'),
+                orders=Sum('orders'),
+                order_revenue=Sum('order_revenue'),
+            )
+            .order_by('bucket', *groups)
+        )
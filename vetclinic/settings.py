@@ -47,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'clinic.instrumentation.PerformanceMiddleware',
+    'clinic.routers.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +56,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'clinic.querybudget.QueryBudgetMiddleware',
+    'clinic.slowqueries.SlowQueryMiddleware',
 ]
 
 ROOT_URLCONF = 'vetclinic.urls'
@@ -80,17 +84,131 @@ WSGI_APPLICATION = 'vetclinic.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Connections are kept for DB_CONN_MAX_AGE seconds and checked before
+# reuse when DB_CONN_HEALTH_CHECKS is on. The default, 0, closes them after
+# every request: under ASGI each request runs in its own thread, so kept
+# connections pile up. Raise it under WSGI only, or use the pool.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.postgresql'),
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() in ('1', 'true', 'yes'),
     }
 }
 
+# The covering indexes' INCLUDE columns (e.g. Appointment's
+# clinic_appt_vet_date_idx) are PostgreSQL only; SQLite, used for local
+# runs and tests, builds the index without them.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
+# DB_POOL serves PostgreSQL connections from a psycopg 3 pool of
+# DB_POOL_MIN_SIZE to DB_POOL_MAX_SIZE connections per process; a request
+# waits up to DB_POOL_TIMEOUT seconds for one. Stats are served at
+# /api/metrics/.
+if os.getenv('DB_POOL', 'False').lower() in ('1', 'true', 'yes'):
+    DATABASES['default'].update({
+        'ENGINE': 'clinic.db.pooled',
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+            },
+        },
+    })
+
+# Read replicas, listed in DB_REPLICA_HOSTS as comma separated `host` or
+# `host:port`; DB_REPLICA_NAME, DB_REPLICA_USER and DB_REPLICA_PASSWORD
+# default to the primary's. Safe requests to the API read from one of
+# them, except for clients that wrote in the last
+# DB_REPLICA_STICKY_SECONDS (see clinic.routers). Two local databases,
+# e.g. a `createdb -T` copy, are enough to try it.
+DATABASE_REPLICAS = []
+for index, address in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    host, _, port = address.strip().partition(':')
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'OPTIONS': dict(DATABASES['default'].get('OPTIONS', {})),
+        # Tests read the primary's test database through the replica.
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['clinic.routers.ReplicaRouter']
+DB_REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', '10'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Defaults to a per-process locmem cache; point CACHE_BACKEND/CACHE_LOCATION
+# at a shared backend (e.g. django.core.cache.backends.redis.RedisCache) so
+# invalidations reach every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+if CACHES['default']['BACKEND'].endswith('LocMemCache'):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000'))}
+
+# Seconds a cached API response is kept; 0 disables the response cache.
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', '300'))
+
+# Serve JSON list pages of owners, pets, appointments and orders from
+# `.values()` rows and precompiled row encoders instead of the serializers;
+# the body is the same.
+API_FAST_LIST = os.getenv('API_FAST_LIST', 'True').lower() in ('1', 'true', 'yes')
+
+# Opening hours (local time, whole hours) used to lay out free
+# appointment slots.
+CLINIC_OPENING_HOUR = int(os.getenv('CLINIC_OPENING_HOUR', '8'))
+CLINIC_CLOSING_HOUR = int(os.getenv('CLINIC_CLOSING_HOUR', '18'))
+
+# Send per-request db/serialize/render/app timings as a Server-Timing
+# header; off by default outside DEBUG, as it tells clients how the time
+# was spent. Every request is also logged as a JSON line on
+# `clinic.requests` and counted in the histograms served at /api/metrics/,
+# which only staff users and the METRICS_ALLOWED_IPS (the scraper) may read.
+SERVER_TIMING = os.getenv('SERVER_TIMING', str(DEBUG)).lower() in ('1', 'true', 'yes')
+METRICS_ALLOWED_IPS = [address for address in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if address]
+
+# Opt-in slow-query log, shown in the admin: queries of a request taking
+# SLOW_QUERY_MS or more (0 disables it) are kept in a per-process ring
+# buffer of SLOW_QUERY_BUFFER entries. On PostgreSQL, a fraction
+# SLOW_QUERY_EXPLAIN_RATE of the slow SELECTs is run again under
+# EXPLAIN (ANALYZE, BUFFERS) to keep its plan.
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '0'))
+SLOW_QUERY_BUFFER = int(os.getenv('SLOW_QUERY_BUFFER', '200'))
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_RATE', '0.1'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'clinic': {
+            'handlers': ['console'],
+            'level': os.getenv('CLINIC_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -136,9 +254,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
+        'clinic.filters.TrigramSearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'clinic.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'PAGE_SIZE': 10,
 }
\ No newline at end of file